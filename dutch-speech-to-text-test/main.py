@@ -1,5 +1,6 @@
 import os
 import subprocess
+from functools import lru_cache
 from google.cloud import speech
 from google.cloud import storage
 
@@ -12,13 +13,30 @@ GCS_BUCKET_NAME = "gcs-pj-speech-text-dev-audio-uploads" # 👈 Replace with you
 RECOGNIZER_ID = "dutch-recognizer-3" # 👈 Replace with your recognizer ID
 GCP_PROJECT_ID = "pj-speech-text-dev" # 👈 Replace with your GCP project ID
 
-def check_recognizer_exists(project_id: str, location: str, recognizer_id: str) -> bool:
-    """Check if a recognizer already exists."""
-    # Configure client to use regional endpoint
+@lru_cache(maxsize=None)
+def get_speech_client_v2(location: str) -> SpeechClient:
+    """Returns one v2 client per regional endpoint, so its gRPC channel is reused."""
     client_options_var = client_options.ClientOptions(
         api_endpoint=f"{location}-speech.googleapis.com"
     )
-    client = SpeechClient(client_options=client_options_var)
+    return SpeechClient(client_options=client_options_var)
+
+
+@lru_cache(maxsize=None)
+def get_speech_client_v1() -> speech.SpeechClient:
+    """Returns the shared v1 client."""
+    return speech.SpeechClient()
+
+
+@lru_cache(maxsize=None)
+def get_storage_client() -> storage.Client:
+    """Returns the shared GCS client."""
+    return storage.Client()
+
+def check_recognizer_exists(project_id: str, location: str, recognizer_id: str) -> bool:
+    """Check if a recognizer already exists."""
+    # Shared client for the regional endpoint
+    client = get_speech_client_v2(location)
     recognizer_name = f"projects/{project_id}/locations/{location}/recognizers/{recognizer_id}"
     
     try:
@@ -29,11 +47,8 @@ def check_recognizer_exists(project_id: str, location: str, recognizer_id: str)
 
 def create_chirp_recognizer(project_id: str, location: str, recognizer_id: str):
     """Creates a v2 recognizer with the Chirp 3 model for Dutch meeting transcription."""
-    # Configure client to use regional endpoint
-    client_options_var = client_options.ClientOptions(
-        api_endpoint=f"{location}-speech.googleapis.com"
-    )
-    client = SpeechClient(client_options=client_options_var)
+    # Shared client for the regional endpoint
+    client = get_speech_client_v2(location)
 
     # The full resource name of the recognizer parent
     parent = f"projects/{project_id}/locations/{location}"
@@ -66,11 +81,8 @@ def create_chirp_recognizer(project_id: str, location: str, recognizer_id: str):
 
 def transcribe_gcs_audio_v2(project_id: str, location: str, gcs_uri: str, recognizer_id: str) -> cloud_speech.BatchRecognizeResponse:
     """Transcribes Dutch audio from GCS using a v2 Recognizer with Chirp 3."""
-    # Configure client to use regional endpoint
-    client_options_var = client_options.ClientOptions(
-        api_endpoint=f"{location}-speech.googleapis.com"
-    )
-    client = SpeechClient(client_options=client_options_var)
+    # Shared client for the regional endpoint
+    client = get_speech_client_v2(location)
 
     # Use the actual recognizer_id parameter instead of hardcoded name
     recognizer_name = f"projects/{project_id}/locations/{location}/recognizers/{recognizer_id}"
@@ -137,7 +149,7 @@ def extract_audio(video_file_path: str) -> str:
 def upload_to_gcs(file_path: str, bucket_name: str) -> str:
     """Uploads a local file to a GCS bucket."""
     
-    storage_client = storage.Client()
+    storage_client = get_storage_client()
     bucket = storage_client.bucket(bucket_name)
     
     # The name of the object in the bucket will be the basename of the file
@@ -155,7 +167,7 @@ def upload_to_gcs(file_path: str, bucket_name: str) -> str:
 def transcribe_gcs_audio(gcs_uri: str) -> str:
     """Transcribes audio from GCS with Dutch speaker diarization."""
     
-    client = speech.SpeechClient()
+    client = get_speech_client_v1()
     audio = speech.RecognitionAudio(uri=gcs_uri)
 
     diarization_config = speech.SpeakerDiarizationConfig(
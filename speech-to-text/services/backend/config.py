@@ -61,25 +61,120 @@ class Settings(BaseSettings):
     redis_db: int = int(os.getenv("REDIS_DB", "0"))
     use_redis: bool = os.getenv("USE_REDIS", "false").lower() == "true"
     
+    # Startup Settings
+    # Google Cloud clients are created on first use unless warm-up is enabled
+    warm_up_on_startup: bool = os.getenv("WARM_UP_ON_STARTUP", "false").lower() == "true"
+    
+    # Shared Google API client connections
+    # 0 sizes the GCS connection pool from the job, chunk and composite upload concurrency
+    gcs_http_pool_size: int = int(os.getenv("GCS_HTTP_POOL_SIZE", "0"))
+    grpc_keepalive_seconds: int = int(os.getenv("GRPC_KEEPALIVE_SECONDS", "60"))
+    
+    # Job Store Settings
+    # memory: per-process dict, redis: shared Redis, fakeredis: in-process Redis stand-in
+    job_store_backend: str = os.getenv(
+        "JOB_STORE_BACKEND",
+        "redis" if os.getenv("USE_REDIS", "false").lower() == "true" else "memory"
+    ).lower()
+    job_ttl_hours: int = int(os.getenv("JOB_TTL_HOURS", "24"))
+    
+    # Progress Event Settings (events kept per job for WebSocket reconnects)
+    progress_history_size: int = int(os.getenv("PROGRESS_HISTORY_SIZE", "100"))
+    progress_retention_minutes: int = int(os.getenv("PROGRESS_RETENTION_MINUTES", "60"))
+    progress_update_interval_seconds: float = float(os.getenv("PROGRESS_UPDATE_INTERVAL_SECONDS", "2"))
+    
+    # Job Scheduling Settings
+    max_concurrent_jobs: int = int(os.getenv("MAX_CONCURRENT_JOBS", "8"))
+    max_concurrent_extractions: int = int(os.getenv("MAX_CONCURRENT_EXTRACTIONS", "2"))
+    max_concurrent_recognitions: int = int(os.getenv("MAX_CONCURRENT_RECOGNITIONS", "8"))
+    max_concurrent_speaker_identifications: int = int(os.getenv("MAX_CONCURRENT_SPEAKER_IDENTIFICATIONS", "2"))
+    max_queue_size: int = int(os.getenv("MAX_QUEUE_SIZE", "100"))
+    job_lease_minutes: int = int(os.getenv("JOB_LEASE_MINUTES", "60"))
+    
     # File Processing Settings
     max_file_size_mb: int = int(os.getenv("MAX_FILE_SIZE_MB", "5120"))
     allowed_audio_formats: List[str] = [".mp3", ".wav", ".m4a", ".flac", ".ogg", ".webm"]
     allowed_video_formats: List[str] = [".mp4", ".mov", ".avi", ".mkv", ".webm"]
+    max_inline_upload_mb: int = int(os.getenv("MAX_INLINE_UPLOAD_MB", "256"))
+    upload_chunk_size_mb: int = int(os.getenv("UPLOAD_CHUNK_SIZE_MB", "8"))
     
     # Signed URL Settings
     signed_url_expiration_hours: int = int(os.getenv("SIGNED_URL_EXPIRATION_HOURS", "1"))
+    signed_urls_max_batch: int = int(os.getenv("SIGNED_URLS_MAX_BATCH", "500"))
+    signing_token_refresh_margin_seconds: float = float(os.getenv("SIGNING_TOKEN_REFRESH_MARGIN_SECONDS", "300"))
+    
+    # Resumable upload sessions (GCS session URIs are valid for a week)
+    upload_session_ttl_hours: float = float(os.getenv("UPLOAD_SESSION_TTL_HOURS", "168"))
+    upload_chunk_target_seconds: float = float(os.getenv("UPLOAD_CHUNK_TARGET_SECONDS", "10"))
+    upload_chunk_min_mb: int = int(os.getenv("UPLOAD_CHUNK_MIN_MB", "8"))
+    upload_chunk_max_mb: int = int(os.getenv("UPLOAD_CHUNK_MAX_MB", "256"))
+    
+    # Parallel composite uploads (parts uploaded concurrently, then composed in GCS)
+    composite_upload_max_parts: int = int(os.getenv("COMPOSITE_UPLOAD_MAX_PARTS", "32"))
+    composite_upload_min_part_mb: int = int(os.getenv("COMPOSITE_UPLOAD_MIN_PART_MB", "32"))
+    composite_upload_concurrency: int = int(os.getenv("COMPOSITE_UPLOAD_CONCURRENCY", "8"))
+    composite_upload_threshold_mb: int = int(os.getenv("COMPOSITE_UPLOAD_THRESHOLD_MB", "128"))
+    # Composite upload records only need to outlive the signed part URLs and the final compose
+    composite_upload_ttl_hours: float = float(os.getenv("COMPOSITE_UPLOAD_TTL_HOURS", "24"))
+    
+    # Upload deduplication by content hash (only hashes verified by GCS or this service)
+    upload_dedup_enabled: bool = os.getenv("UPLOAD_DEDUP_ENABLED", "true").lower() == "true"
+    upload_dedup_algorithms: str = os.getenv("UPLOAD_DEDUP_ALGORITHMS", "sha256,md5")
+    upload_dedup_ttl_hours: float = float(os.getenv("UPLOAD_DEDUP_TTL_HOURS", "720"))
     
     # FFmpeg Settings
     ffmpeg_path: str = os.getenv("FFMPEG_PATH", "ffmpeg")
-    ffmpeg_audio_codec: str = os.getenv("FFMPEG_AUDIO_CODEC", "pcm_s16le")
+    ffmpeg_audio_codec: str = os.getenv("FFMPEG_AUDIO_CODEC", "pcm_s16le")  # codec of the wav format
+    intermediate_audio_format: str = os.getenv("INTERMEDIATE_AUDIO_FORMAT", "flac").lower()  # flac, opus or wav
+    intermediate_audio_format_overrides: str = os.getenv("INTERMEDIATE_AUDIO_FORMAT_OVERRIDES", "")
+    opus_bitrate_kbps: int = int(os.getenv("OPUS_BITRATE_KBPS", "32"))
     ffmpeg_sample_rate: int = int(os.getenv("FFMPEG_SAMPLE_RATE", "16000"))
     ffmpeg_channels: int = int(os.getenv("FFMPEG_CHANNELS", "1"))
+    streaming_audio_extraction: bool = os.getenv("STREAMING_AUDIO_EXTRACTION", "true").lower() == "true"
+    ffmpeg_stream_chunk_size_kb: int = int(os.getenv("FFMPEG_STREAM_CHUNK_SIZE_KB", "1024"))
     
     # Transcription Settings
     transcription_timeout_minutes: int = int(os.getenv("TRANSCRIPTION_TIMEOUT_MINUTES", "30"))
     enable_word_time_offsets: bool = os.getenv("ENABLE_WORD_TIME_OFFSETS", "false").lower() == "true"
     enable_word_confidence: bool = os.getenv("ENABLE_WORD_CONFIDENCE", "false").lower() == "true"
     
+    # Chunked Recognition Settings (split long audio at silences and recognise in parallel)
+    chunked_recognition: bool = os.getenv("CHUNKED_RECOGNITION", "false").lower() == "true"
+    chunk_minutes: int = int(os.getenv("CHUNK_MINUTES", "10"))
+    chunk_overlap_seconds: float = float(os.getenv("CHUNK_OVERLAP_SECONDS", "2.0"))
+    chunk_search_window_seconds: float = float(os.getenv("CHUNK_SEARCH_WINDOW_SECONDS", "60"))
+    chunk_silence_threshold_db: int = int(os.getenv("CHUNK_SILENCE_THRESHOLD_DB", "-35"))
+    chunk_min_silence_seconds: float = float(os.getenv("CHUNK_MIN_SILENCE_SECONDS", "0.5"))
+    chunk_concurrency: int = int(os.getenv("CHUNK_CONCURRENCY", "8"))
+    batch_recognize_max_files: int = int(os.getenv("BATCH_RECOGNIZE_MAX_FILES", "15"))
+    # Long-running Speech operations are polled with backoff from the initial to the max interval
+    operation_poll_initial_seconds: float = float(os.getenv("OPERATION_POLL_INITIAL_SECONDS", "1"))
+    operation_poll_interval_seconds: float = float(os.getenv("OPERATION_POLL_INTERVAL_SECONDS", "10"))
+    
+    # Silence Trimming Settings (voice activity detection before recognition)
+    silence_trimming_enabled: bool = os.getenv("SILENCE_TRIMMING_ENABLED", "false").lower() == "true"
+    silence_trimming_min_silence_seconds: float = float(os.getenv("SILENCE_TRIMMING_MIN_SILENCE_SECONDS", "1.0"))
+    silence_trimming_padding_seconds: float = float(os.getenv("SILENCE_TRIMMING_PADDING_SECONDS", "0.25"))
+    silence_trimming_gap_seconds: float = float(os.getenv("SILENCE_TRIMMING_GAP_SECONDS", "0.3"))
+    silence_trimming_min_saved_seconds: float = float(os.getenv("SILENCE_TRIMMING_MIN_SAVED_SECONDS", "10"))
+    vad_frame_ms: int = int(os.getenv("VAD_FRAME_MS", "30"))
+    vad_threshold_margin_db: float = float(os.getenv("VAD_THRESHOLD_MARGIN_DB", "12"))
+    
+    # Speaker Identification Settings
+    speaker_identification_parallel: bool = os.getenv("SPEAKER_IDENTIFICATION_PARALLEL", "false").lower() == "true"
+    speaker_identification_concurrency: int = int(os.getenv("SPEAKER_IDENTIFICATION_CONCURRENCY", "4"))
+    speaker_roster_sample_segments: int = int(os.getenv("SPEAKER_ROSTER_SAMPLE_SEGMENTS", "40"))
+    
+    # Result Cache Settings (keyed by audio checksum + recognition config)
+    result_cache_enabled: bool = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+    result_cache_memory_mb: int = int(os.getenv("RESULT_CACHE_MEMORY_MB", "256"))
+    result_cache_backing: str = os.getenv("RESULT_CACHE_BACKING", "none").lower()  # none, redis or gcs
+    result_cache_backing_mb: int = int(os.getenv("RESULT_CACHE_BACKING_MB", "10240"))
+    
+    # Transcript Search Settings (SQLite FTS5 index of completed transcripts)
+    search_enabled: bool = os.getenv("SEARCH_ENABLED", "true").lower() == "true"
+    search_index_path: str = os.getenv("SEARCH_INDEX_PATH", "data/search.sqlite3")
+    
     # Logging Settings
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
     log_format: str = os.getenv("LOG_FORMAT", "json")
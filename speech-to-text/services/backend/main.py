@@ -3,43 +3,200 @@
 FastAPI application providing speech transcription services using Google Cloud Speech-to-Text API.
 """
 
+import copy
 import os
+import time
 import uuid
-from typing import Optional, Dict, Any
-from datetime import datetime
+import hashlib
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, List
+from datetime import datetime, timedelta
 import asyncio
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, WebSocket
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect, Query, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 import uvicorn
 
 from models import (
     TranscriptionRequest,
     TranscriptionResponse,
+    BatchTranscriptionRequest,
+    BatchTranscriptionResponse,
+    BatchInfo,
     TranscriptionStatus,
     RecognizerRequest,
     RecognizerResponse,
     UploadResponse,
     JobStatus,
+    SignedUrlBatchRequest,
+    UploadSessionRequest,
+    CompositeUploadRequest,
     TranscriptSegment
 )
 from services.transcription import TranscriptionService
 from services.storage import StorageService
+from services.job_store import LARGE_FIELDS, create_job_store
+from services.word_store import WordStore, segment_views
+from services.serialization import compress, dumps, encoded_response
+from services.export import EXPORT_FORMATS, export_transcript, segment_speakers
+from services.search import create_search_index
+from services.composite_upload import missing_parts, plan_parts
+from services.upload_dedup import create_upload_dedup_index
+from services.upload_sessions import (
+    CHUNK_ALIGNMENT,
+    create_upload_session_store,
+    recommend_chunk_size,
+    smooth_throughput
+)
+from services.vad import OffsetMap, remap_segments
+from services.audio_format import choose_intermediate_format
+from services.cache import create_result_cache
+from services.progress_hub import TERMINAL_STATUSES, create_progress_hub
+from services.scheduler import (
+    JobScheduler,
+    QueueFullError,
+    StageLimiter,
+    STAGE_EXTRACTION,
+    STAGE_RECOGNITION,
+    create_job_queue
+)
+from services.lazy import get_init_report, timed_init
+from services.clients import registry as client_registry
+from services.progress import (
+    RECOGNITION_PROGRESS_RANGE,
+    RecognitionProgress,
+    ThroughputEstimator,
+    recognition_job_progress
+)
 from config import Settings
 
+# Start of application setup, for the startup report
+startup_started = time.perf_counter()
+startup_seconds: Optional[float] = None
+
 # Initialize settings
 settings = Settings()
 
-# Initialize services
-transcription_service = TranscriptionService(settings)
-storage_service = StorageService(settings)
+# Per-stage concurrency limits shared by all jobs in this process
+stage_limiter = StageLimiter.from_settings(settings)
+
+# Job storage (in-memory per process, or Redis when shared across instances)
+with timed_init("job_store"):
+    job_store = create_job_store(settings)
+redis_client = getattr(job_store, "client", None)
+
+# Progress events for WebSocket subscribers, fanned out via Redis when shared
+progress_hub = create_progress_hub(settings, redis_client=redis_client)
+
+# Initialize services; Google Cloud clients are created lazily on first use
+with timed_init("storage_service"):
+    storage_service = StorageService(settings)
+recognition_cache = create_result_cache(
+    "recognition",
+    settings,
+    redis_client=redis_client,
+    bucket_provider=lambda: storage_service.transcript_bucket_obj
+)
+speaker_cache = create_result_cache(
+    "speakers",
+    settings,
+    redis_client=redis_client,
+    bucket_provider=lambda: storage_service.transcript_bucket_obj
+)
+# Billed audio saved by silence trimming in this process
+silence_trimming_stats = {"jobs": 0, "trimmed_jobs": 0, "original_seconds": 0.0, "seconds_saved": 0.0}
+
+# Resumable upload sessions created for clients, shared via Redis when available
+upload_session_store = create_upload_session_store(settings, redis_client=redis_client)
+# Content-hash index of uploads, so identical files are not uploaded twice
+upload_dedup_index = create_upload_dedup_index(settings, storage_service, redis_client=redis_client)
+composite_upload_store = create_upload_session_store(
+    settings,
+    redis_client=redis_client,
+    key_prefix="composite-upload:",
+    ttl_hours=settings.composite_upload_ttl_hours
+)
+
+# Full-text index of completed transcripts, filled as jobs complete
+search_index = create_search_index(settings)
+
+with timed_init("transcription_service"):
+    transcription_service = TranscriptionService(
+        settings,
+        stage_limiter=stage_limiter,
+        storage_service=storage_service,
+        recognition_cache=recognition_cache,
+        speaker_cache=speaker_cache
+    )
+
+
+async def run_queued_transcription(job_id: str, payload: Dict[str, Any]):
+    """Run a transcription job or batch taken from the job queue."""
+    if "batch" in payload:
+        await process_batch_transcription(job_id, payload["batch"])
+    else:
+        await process_transcription(job_id, TranscriptionRequest(**payload))
+
+
+# Recognition speed observed in this process, used for ETA estimates
+recognition_throughput = ThroughputEstimator()
+
+
+# Job queue and worker pool; the queue is durable when Redis is used
+job_scheduler = JobScheduler(
+    queue=create_job_queue(settings, redis_client=redis_client),
+    handler=run_queued_transcription,
+    max_workers=settings.max_concurrent_jobs,
+    max_queue_size=settings.max_queue_size,
+    lease_seconds=settings.job_lease_minutes * 60
+)
+
+
+async def warm_up_services():
+    """Create all Google Cloud clients before the first request."""
+    loop = asyncio.get_event_loop()
+    await loop.run_in_executor(None, storage_service.warm_up)
+    await transcription_service.warm_up()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Manage resources that live for the duration of the application."""
+    global startup_seconds
+    
+    await progress_hub.start()
+    await job_scheduler.start()
+    
+    if settings.warm_up_on_startup:
+        try:
+            await warm_up_services()
+        except Exception as e:
+            # Clients are retried lazily on first use
+            print(f"Warm-up failed: {e}")
+    
+    startup_seconds = time.perf_counter() - startup_started
+    components = ", ".join(
+        f"{component}={entry['seconds']:.3f}s"
+        for component, entry in get_init_report().items()
+    )
+    print(f"Startup completed in {startup_seconds:.3f}s ({components})")
+    
+    yield
+    await job_scheduler.stop()
+    await progress_hub.stop()
+    await storage_service.credential_manager.stop()
+    await job_store.close()
+    if search_index is not None:
+        search_index.close()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Speech-to-Text API",
     description="Backend service for Dutch speech transcription using Google Cloud Speech-to-Text",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -50,15 +207,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
-# In-memory job storage (consider using Redis in production)
-jobs: Dict[str, JobStatus] = {}
-
-# WebSocket connections storage
-websocket_connections: Dict[str, WebSocket] = {}
-
-
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -69,6 +220,24 @@ async def root():
     }
 
 
+@app.get("/api/v1/startup")
+async def get_startup_report():
+    """
+    Report how long startup took and how long each component took to initialize.
+    
+    Lazily created clients appear once they have been used (or warmed up).
+    """
+    return {
+        "startup_seconds": round(startup_seconds, 4) if startup_seconds is not None else None,
+        "warm_up_on_startup": settings.warm_up_on_startup,
+        "components": get_init_report(),
+        "shared_clients": [
+            {"service": service, "region": region}
+            for service, region, _ in client_registry.keys()
+        ]
+    }
+
+
 @app.post("/api/v1/upload", response_model=UploadResponse)
 async def upload_file(
     file: UploadFile = File(...),
@@ -83,9 +252,9 @@ async def upload_file(
     Returns:
         Upload response with GCS URI and file metadata
     """
-    # This endpoint is now limited to small uploads (e.g., testing) and will
-    # reject large files. Production uploads should use the signed-URL flow.
-    max_inline_size = 25 * 1024 * 1024  # 25 MB safety limit
+    # The upload is streamed to GCS in chunks, so memory use does not depend on
+    # the file size. Very large files should still use the signed-URL flow.
+    max_inline_size = settings.max_inline_upload_mb * 1024 * 1024
 
     try:
         file.file.seek(0, os.SEEK_END)
@@ -97,7 +266,10 @@ async def upload_file(
     if file_size and file_size > max_inline_size:
         raise HTTPException(
             status_code=413,
-            detail="Inline uploads are limited to 25MB. Please use the direct upload flow."
+            detail=(
+                f"Inline uploads are limited to {settings.max_inline_upload_mb}MB. "
+                "Please use the direct upload flow."
+            )
         )
 
     if file_size and file_size > settings.get_max_file_size_bytes():
@@ -111,422 +283,1729 @@ async def upload_file(
         )
 
     try:
-        contents = await file.read()
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         unique_filename = f"{timestamp}_{uuid.uuid4().hex[:8]}_{file.filename}"
-        gcs_uri = await storage_service.upload_file(
-            file_content=contents,
+        # Large files go to GCS as parallel parts instead of one stream
+        use_parallel = bool(file_size and file_size >= settings.composite_upload_threshold_mb * 1024 * 1024)
+        upload = storage_service.upload_file_parallel if use_parallel else storage_service.upload_file_stream
+        upload_result = await upload(
+            file_obj=file.file,
             filename=unique_filename,
-            content_type=file.content_type
+            content_type=file.content_type,
+            size=file_size
         )
 
+        if upload_dedup_index is not None:
+            await upload_dedup_index.record(unique_filename, upload_result)
+
         return UploadResponse(
-            gcs_uri=gcs_uri,
+            gcs_uri=upload_result["gcs_uri"],
             filename=unique_filename,
             original_filename=file.filename,
-            size=file_size,
-            content_type=file.content_type
+            size=upload_result["size"],
+            content_type=file.content_type,
+            md5_hash=upload_result["md5_hash"],
+            crc32c=upload_result["crc32c"]
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/api/v1/transcribe", response_model=TranscriptionResponse)
-async def start_transcription(
-    request: TranscriptionRequest,
-    background_tasks: BackgroundTasks
-):
+async def start_transcription(request: TranscriptionRequest):
     """
-    Start a transcription job for a file in GCS.
+    Queue a transcription job for a file in GCS.
     
     Args:
         request: Transcription request with GCS URI and options
         
     Returns:
-        Transcription response with job ID
+        Transcription response with job ID and queue position.
+        Responds with 429 when the job queue is full.
     """
+    # A direct upload is complete once it is transcribed
+    await confirm_upload(request.gcs_uri)
+    
     try:
         # Generate job ID
         job_id = str(uuid.uuid4())
         
         # Initialize job status
-        jobs[job_id] = JobStatus(
+        await job_store.create(JobStatus(
             job_id=job_id,
             status="pending",
             created_at=datetime.now(),
             gcs_uri=request.gcs_uri
-        )
+        ))
         
-        # Start transcription in background
-        background_tasks.add_task(
-            process_transcription,
-            job_id,
-            request
-        )
+        # Hand the job to the worker pool
+        try:
+            queue_position = await job_scheduler.submit(
+                job_id,
+                request.model_dump(),
+                priority=request.priority
+            )
+        except QueueFullError as e:
+            await job_store.delete(job_id)
+            return JSONResponse(
+                status_code=429,
+                headers={"Retry-After": str(e.retry_after_seconds)},
+                content={
+                    "detail": str(e),
+                    "queue_size": e.queue_size,
+                    "estimated_wait_seconds": e.estimated_wait_seconds
+                }
+            )
         
         return TranscriptionResponse(
             job_id=job_id,
             status="pending",
-            message="Transcription job started successfully"
+            message="Transcription job queued successfully",
+            queue_position=queue_position,
+            estimated_wait_seconds=job_scheduler.estimate_wait_seconds(queue_position)
         )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def process_transcription(job_id: str, request: TranscriptionRequest):
+@app.post("/api/v1/transcribe/batch", response_model=BatchTranscriptionResponse)
+async def start_batch_transcription(request: BatchTranscriptionRequest):
     """
-    Process transcription job asynchronously.
+    Queue many transcription jobs at once.
+    
+    Jobs that share a recognizer and language are grouped and transcribed with
+    a single multi-file BatchRecognize operation. Each file keeps its own job
+    record and reports its own progress. BatchRecognize runs without speaker
+    diarization, so files requesting diarization are queued as separate jobs.
     
     Args:
-        job_id: Unique job identifier
-        request: Transcription request parameters
+        request: Batch request with one transcription request per file
+        
+    Returns:
+        Per-file job responses and the batches they were grouped into.
+        Responds with 429 when the job queue cannot take all batches.
     """
+    groups: Dict[tuple, List[TranscriptionRequest]] = {}
+    single_items: List[TranscriptionRequest] = []
+    for item in request.jobs:
+        if item.enable_diarization and not item.enable_speaker_identification:
+            # BatchRecognize runs without diarization, so these files get jobs of their own
+            single_items.append(item)
+            continue
+        key = (
+            item.recognizer_id or settings.default_recognizer_id,
+            item.language_code or settings.default_language_code
+        )
+        groups.setdefault(key, []).append(item)
+
+    batches: List[BatchInfo] = []
+    job_responses: List[TranscriptionResponse] = []
+    created_job_ids: List[str] = []
+    queued_ids: List[str] = []
+
     try:
-        # Update job status
-        jobs[job_id].status = "processing"
-        jobs[job_id].started_at = datetime.now()
-        
-        # Notify via WebSocket if connected
-        await notify_websocket(job_id, {"status": "processing", "message": "Transcription started"})
-        
-        # Extract audio if video file
-        if request.extract_audio:
-            jobs[job_id].status = "extracting_audio"
-            await notify_websocket(job_id, {"status": "extracting_audio", "message": "Extracting audio from video"})
+        for (recognizer_id, language_code), items in groups.items():
+            batch_id = str(uuid.uuid4())
+            batch_items: List[Dict[str, Any]] = []
             
-            audio_gcs_uri = await storage_service.extract_and_upload_audio(request.gcs_uri)
-        else:
-            audio_gcs_uri = request.gcs_uri
-        
-        # Perform transcription
-        jobs[job_id].status = "transcribing"
-        await notify_websocket(job_id, {"status": "transcribing", "message": "Transcribing audio"})
-        
-        transcript, transcript_segments, speaker_transcript, speaker_summary, refined_transcript = await transcription_service.transcribe_audio(
-            gcs_uri=audio_gcs_uri,
-            language_code=request.language_code or "nl-NL",
-            recognizer_id=request.recognizer_id,
-            enable_diarization=request.enable_diarization,
-            enable_speaker_identification=request.enable_speaker_identification,
-            min_speaker_count=request.min_speaker_count,
-            max_speaker_count=request.max_speaker_count
-        )
-        
-        # Apply speaker identification if enabled
-        if request.enable_speaker_identification and speaker_transcript:
-            jobs[job_id].status = "identifying_speakers"
-            await notify_websocket(job_id, {"status": "identifying_speakers", "message": "Identifying speakers"})
-        
-        # Update job with results
-        jobs[job_id].status = "completed"
-        jobs[job_id].completed_at = datetime.now()
-        jobs[job_id].transcript = transcript
-        jobs[job_id].transcript_segments = [TranscriptSegment(**segment) for segment in transcript_segments] if transcript_segments else None
-        jobs[job_id].speaker_identified_transcript = speaker_transcript
-        jobs[job_id].speaker_identification_summary = speaker_summary
-        jobs[job_id].refined_transcript = refined_transcript
+            for item in items:
+                await confirm_upload(item.gcs_uri)
+                job_id = str(uuid.uuid4())
+                await job_store.create(JobStatus(
+                    job_id=job_id,
+                    status="pending",
+                    created_at=datetime.now(),
+                    gcs_uri=item.gcs_uri,
+                    batch_id=batch_id
+                ))
+                created_job_ids.append(job_id)
+                batch_items.append({"job_id": job_id, "request": item.model_dump()})
 
-        # Save transcript to GCS
-        transcript_uri = await storage_service.save_transcript(transcript, job_id)
-        jobs[job_id].transcript_uri = transcript_uri
+            queue_position = await job_scheduler.submit(
+                batch_id,
+                {"batch": batch_items},
+                priority=request.priority
+            )
+            queued_ids.append(batch_id)
+            estimated_wait = job_scheduler.estimate_wait_seconds(queue_position)
 
-        # Notify completion
-        await notify_websocket(job_id, {
-            "status": "completed",
-            "message": "Transcription completed successfully",
-            "data": {
-                "transcript": transcript[:500],
-                "transcript_segments": transcript_segments[:5] if transcript_segments else None,
-                "refined_transcript": refined_transcript,
-                "speaker_identified_transcript": speaker_transcript,
-                "speaker_identification_summary": speaker_summary,
+            batches.append(BatchInfo(
+                batch_id=batch_id,
+                recognizer_id=recognizer_id,
+                language_code=language_code,
+                job_ids=[batch_item["job_id"] for batch_item in batch_items],
+                queue_position=queue_position
+            ))
+            job_responses.extend(
+                TranscriptionResponse(
+                    job_id=batch_item["job_id"],
+                    status="pending",
+                    message="Transcription job queued in batch",
+                    queue_position=queue_position,
+                    estimated_wait_seconds=estimated_wait
+                )
+                for batch_item in batch_items
+            )
+
+        for item in single_items:
+            await confirm_upload(item.gcs_uri)
+            job_id = str(uuid.uuid4())
+            await job_store.create(JobStatus(
+                job_id=job_id,
+                status="pending",
+                created_at=datetime.now(),
+                gcs_uri=item.gcs_uri
+            ))
+            created_job_ids.append(job_id)
+
+            queue_position = await job_scheduler.submit(job_id, item.model_dump(), priority=request.priority)
+            queued_ids.append(job_id)
+            job_responses.append(TranscriptionResponse(
+                job_id=job_id,
+                status="pending",
+                message="Transcription job queued on its own (diarization is not batched)",
+                queue_position=queue_position,
+                estimated_wait_seconds=job_scheduler.estimate_wait_seconds(queue_position)
+            ))
+
+    except QueueFullError as e:
+        for queued_id in queued_ids:
+            await job_scheduler.queue.remove(queued_id)
+        for job_id in created_job_ids:
+            await job_store.delete(job_id)
+        return JSONResponse(
+            status_code=429,
+            headers={"Retry-After": str(e.retry_after_seconds)},
+            content={
+                "detail": str(e),
+                "queue_size": e.queue_size,
+                "estimated_wait_seconds": e.estimated_wait_seconds
             }
-        })
-        
+        )
     except Exception as e:
-        jobs[job_id].status = "failed"
-        jobs[job_id].error = str(e)
-        jobs[job_id].completed_at = datetime.now()
-        
-        await notify_websocket(job_id, {
-            "status": "failed",
-            "message": f"Transcription failed: {str(e)}"
-        })
+        raise HTTPException(status_code=500, detail=str(e)) from e
 
+    return BatchTranscriptionResponse(jobs=job_responses, batches=batches)
 
-@app.get("/api/v1/transcription/{job_id}")
-async def get_transcription_status(job_id: str):
+
+async def prepare_audio(job_id: str, request: TranscriptionRequest) -> str:
     """
-    Get the status and results of a transcription job.
+    Mark a job as started and extract its audio if requested.
     
     Args:
         job_id: Unique job identifier
+        request: Transcription request parameters
         
     Returns:
-        Job status and transcript if completed
+        GCS URI of the audio to transcribe
     """
-    if job_id not in jobs:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
-    job = jobs[job_id]
-    
-    response = {
-        "job_id": job_id,
-        "status": job.status,
-        "created_at": job.created_at.isoformat(),
-        "started_at": job.started_at.isoformat() if job.started_at else None,
-        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
-        "gcs_uri": job.gcs_uri
-    }
+    # Update job status
+    await job_store.update(job_id, status="processing", started_at=datetime.now())
     
-    if job.status == "completed":
-        response["transcript"] = job.transcript
-        response["transcript_uri"] = job.transcript_uri
-        response["transcript_segments"] = [segment.model_dump() if hasattr(segment, "model_dump") else segment for segment in job.transcript_segments] if job.transcript_segments else None
-        response["speaker_identified_transcript"] = job.speaker_identified_transcript
-        response["speaker_identification_summary"] = job.speaker_identification_summary
-        response["refined_transcript"] = job.refined_transcript
-    elif job.status == "failed":
-        response["error"] = job.error
+    # Notify via WebSocket if connected
+    await notify_websocket(job_id, {"status": "processing", "message": "Transcription started"})
     
-    # Calculate progress percentage
-    if job.status == "pending":
-        response["progress"] = 0
-    elif job.status == "extracting_audio":
-        response["progress"] = 20
-    elif job.status == "transcribing":
-        response["progress"] = 50
-    elif job.status == "identifying_speakers":
-        response["progress"] = 80
-    elif job.status == "completed":
-        response["progress"] = 100
+    # Extract audio if video file
+    if request.extract_audio:
+        await job_store.update(job_id, status="extracting_audio")
+        await notify_websocket(job_id, {"status": "extracting_audio", "message": "Extracting audio from video"})
+        
+        async with stage_limiter.stage(STAGE_EXTRACTION):
+            audio_gcs_uri = await storage_service.extract_and_upload_audio(
+                request.gcs_uri,
+                audio_format=choose_intermediate_format(settings, request.language_code),
+                job_id=job_id
+            )
     else:
-        response["progress"] = 0
+        audio_gcs_uri = request.gcs_uri
     
-    return response
+    if settings.silence_trimming_enabled:
+        audio_gcs_uri = await trim_silence(job_id, audio_gcs_uri, request.language_code)
+    
+    return audio_gcs_uri
 
 
-@app.post("/api/v1/recognizer", response_model=RecognizerResponse)
-async def create_or_get_recognizer(request: RecognizerRequest):
+async def trim_silence(job_id: str, audio_gcs_uri: str, language_code: Optional[str] = None) -> str:
     """
-    Create a new recognizer or get an existing one.
+    Cut non-speech stretches out of a job's audio to reduce billed audio.
+    
+    The offset map is stored on the job so ``complete_job`` can translate the
+    recognised times back to the original media. Failures fall back to the
+    untrimmed audio.
     
     Args:
-        request: Recognizer configuration request
+        job_id: Unique job identifier
+        audio_gcs_uri: GCS URI of the audio to transcribe
+        language_code: Language of the recording, which selects the audio format
         
     Returns:
-        Recognizer response with ID and status
+        GCS URI of the trimmed audio, or ``audio_gcs_uri`` when nothing was cut
     """
     try:
-        recognizer_id = request.recognizer_id or f"recognizer-{uuid.uuid4().hex[:8]}"
-        
-        # Check if recognizer exists
-        exists = await transcription_service.check_recognizer_exists(recognizer_id)
-        
-        if exists:
-            return RecognizerResponse(
-                recognizer_id=recognizer_id,
-                created=False,
-                message=f"Using existing recognizer: {recognizer_id}"
+        async with stage_limiter.stage(STAGE_EXTRACTION):
+            trimmed = await storage_service.trim_silence(
+                audio_gcs_uri,
+                job_id,
+                audio_format=choose_intermediate_format(settings, language_code)
             )
-        
-        # Create new recognizer
-        await transcription_service.create_recognizer(
-            recognizer_id=recognizer_id,
-            language_codes=request.language_codes,
-            model=request.model
-        )
-        
-        return RecognizerResponse(
-            recognizer_id=recognizer_id,
-            created=True,
-            message=f"Created new recognizer: {recognizer_id}"
-        )
-        
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        print(f"Silence trimming failed for job {job_id}, using the full audio: {e}")
+        return audio_gcs_uri
+    
+    silence_trimming_stats["jobs"] += 1
+    if trimmed is None:
+        return audio_gcs_uri
+    
+    removed = round(trimmed["removed_seconds"], 2)
+    silence_trimming_stats["trimmed_jobs"] += 1
+    silence_trimming_stats["original_seconds"] += trimmed["original_seconds"]
+    silence_trimming_stats["seconds_saved"] += removed
+    print(
+        f"Silence trimming for job {job_id}: removed {removed:.1f}s of "
+        f"{trimmed['original_seconds']:.1f}s ({removed / trimmed['original_seconds']:.0%})"
+    )
+    
+    await job_store.update(
+        job_id,
+        audio_offset_map=trimmed["offset_map"].to_list(),
+        silence_trimmed_seconds=removed
+    )
+    return str(trimmed["gcs_uri"])
 
 
-@app.websocket("/ws/{job_id}")
-async def websocket_endpoint(websocket: WebSocket, job_id: str):
+async def delete_trimmed_audio(job_id: str, audio_gcs_uri: str):
     """
-    WebSocket endpoint for real-time transcription updates.
+    Delete a job's silence-trimmed audio once recognition is done.
     
     Args:
-        websocket: WebSocket connection
-        job_id: Job ID to monitor
+        job_id: Unique job identifier
+        audio_gcs_uri: GCS URI of the audio that was recognised
     """
-    await websocket.accept()
-    websocket_connections[job_id] = websocket
-    
     try:
-        # Send initial status
-        if job_id in jobs:
-            await websocket.send_json({
-                "status": jobs[job_id].status,
-                "message": "Connected to transcription updates"
-            })
-        
-        # Keep connection alive
-        while True:
-            await asyncio.sleep(1)
-            
-            # Check if job is completed
-            if job_id in jobs and jobs[job_id].status in ["completed", "failed"]:
-                await asyncio.sleep(5)  # Give client time to receive final update
-                break
-                
+        await storage_service.delete_trimmed_audio(audio_gcs_uri, job_id)
     except Exception as e:
-        print(f"WebSocket error: {e}")
-    finally:
-        if job_id in websocket_connections:
-            del websocket_connections[job_id]
-        await websocket.close()
+        print(f"Failed to delete trimmed audio of job {job_id}: {e}")
 
 
-async def notify_websocket(job_id: str, data: Dict[str, Any]):
+async def start_recognition_progress(job_id: str, audio_gcs_uri: str) -> RecognitionProgress:
     """
-    Send notification to WebSocket client if connected.
+    Start tracking recognition progress and ETA for a job.
     
     Args:
-        job_id: Job ID
-        data: Data to send
+        job_id: Unique job identifier
+        audio_gcs_uri: GCS URI of the audio being recognised
+        
+    Returns:
+        Tracker whose ``update`` takes the recognition progress percent
     """
-    if job_id in websocket_connections:
-        try:
-            await websocket_connections[job_id].send_json(data)
-        except Exception as e:
-            print(f"Failed to send WebSocket notification: {e}")
+    audio_seconds = await storage_service.get_audio_duration(audio_gcs_uri)
+    
+    async def publish(fields: Dict[str, Any]):
+        await job_store.update(
+            job_id,
+            recognition_progress=fields["recognition_progress"],
+            estimated_completion_at=fields["estimated_completion_at"]
+        )
+        completion_at = fields["estimated_completion_at"]
+        await notify_websocket(job_id, {
+            **fields,
+            "status": "transcribing",
+            "message": f"Transcribing audio ({fields['recognition_progress']}%)",
+            "estimated_completion_at": completion_at.isoformat() if completion_at else None
+        })
+    
+    tracker = RecognitionProgress(
+        publish,
+        recognition_throughput,
+        audio_seconds=audio_seconds,
+        min_interval_seconds=settings.progress_update_interval_seconds
+    )
+    await tracker.start()
+    return tracker
 
 
-@app.get("/api/v1/signed-url")
-async def get_signed_upload_url(
-    filename: str,
-    file_size: Optional[int] = None,
-    content_type: Optional[str] = None,
-    resumable: bool = False
+async def complete_job(
+    job_id: str,
+    transcript: str,
+    transcript_segments: Optional[List[Dict[str, Any]]],
+    speaker_transcript: Optional[str],
+    speaker_summary: Optional[Dict[str, Any]],
+    refined_transcript: Optional[str]
 ):
     """
-    Get signed URL(s) for direct file upload to GCS.
-    
-    Supports both regular signed URLs and resumable upload sessions for large files.
+    Save a finished transcript and mark the job as completed.
     
     Args:
-        filename: Name of the file to upload
-        file_size: Size of the file in bytes (optional, used for upload method selection)
-        content_type: MIME type of the file (optional)
-        resumable: Force resumable upload regardless of file size
-        
-    Returns:
-        Upload options including signed URLs and resumable upload info
+        job_id: Unique job identifier
+        transcript: Transcript text
+        transcript_segments: Transcript segments with timing and confidence
+        speaker_transcript: Transcript with speaker labels
+        speaker_summary: Speaker identification summary
+        refined_transcript: Lightly improved transcript text
     """
-    try:
-        # Generate unique filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        unique_filename = f"{timestamp}_{uuid.uuid4().hex[:8]}_{filename}"
-        
-        print(f"DEBUG: Generating upload options - filename: {unique_filename}, size: {file_size}, type: {content_type}, resumable: {resumable}")
-        
-        # Validate file type if provided
-        if filename:
-            allowed_extensions = ['.mp3', '.mp4', '.wav', '.m4a', '.flac', '.ogg', '.webm', '.mov']
-            file_extension = os.path.splitext(filename)[1].lower()
-            
-            if file_extension not in allowed_extensions:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"File type {file_extension} not supported. Allowed types: {allowed_extensions}"
-                )
-        
-        # Check file size limits
-        if file_size and file_size > settings.get_max_file_size_bytes():
-            max_gb = settings.max_file_size_mb / 1024
-            raise HTTPException(
-                status_code=400,
-                detail=(
-                    f"File too large. Maximum size is {max_gb:.0f}GB "
-                    f"({settings.max_file_size_mb}MB)."
-                )
+    job = await job_store.get(job_id, include_results=False)
+
+    # Recognition ran on silence-trimmed audio; report times in the original media
+    if job is not None and job.audio_offset_map and transcript_segments:
+        remap_segments(transcript_segments, OffsetMap(job.audio_offset_map))
+
+    # Save transcript to GCS
+    transcript_uri = await storage_service.save_transcript(transcript, job_id)
+    completed_at = datetime.now()
+
+    # Persist the structured result so any instance can reload it later
+    if job is not None:
+        try:
+            await storage_service.save_transcript_result(
+                job_id,
+                {
+                    "job_id": job_id,
+                    "status": "completed",
+                    "created_at": job.created_at,
+                    "started_at": job.started_at,
+                    "completed_at": completed_at,
+                    "gcs_uri": job.gcs_uri,
+                    "batch_id": job.batch_id,
+                    "transcript": transcript,
+                    "transcript_uri": transcript_uri,
+                    "speaker_identified_transcript": speaker_transcript,
+                    "speaker_identification_summary": speaker_summary,
+                    "refined_transcript": refined_transcript,
+                    "silence_trimmed_seconds": job.silence_trimmed_seconds,
+                },
+                transcript_segments
             )
-        
-        # Get upload options from storage service
-        upload_options = await storage_service.generate_upload_options(
-            filename=unique_filename,
-            file_size=file_size,
-            content_type=content_type,
-            expiration_hours=settings.signed_url_expiration_hours
-        )
-        
-        # If resumable is forced, only return resumable option
-        if resumable and "resumable_upload" in upload_options:
-            return {
-                "resumable_upload": upload_options["resumable_upload"],
-                "filename": unique_filename,
-                "gcs_uri": upload_options["gcs_uri"],
-                "upload_method": "resumable"
-            }
-        
-        # Return comprehensive upload options
-        response = {
-            "filename": unique_filename,
-            "gcs_uri": upload_options["gcs_uri"],
-            "file_size": file_size,
-            "content_type": content_type,
-            "expires_in": settings.signed_url_expiration_hours * 3600,
-            "upload_options": {}
+        except Exception as e:
+            print(f"Failed to persist structured result for job {job_id}: {e}")
+
+    # Keep words in a compact columnar store instead of one model per word
+    transcript_words = None
+    stored_segments = None
+    if transcript_segments:
+        transcript_words, stripped_segments = WordStore.from_segments(transcript_segments)
+        stored_segments = [TranscriptSegment(**segment) for segment in stripped_segments]
+
+    # Update job with results
+    await job_store.update(
+        job_id,
+        status="completed",
+        completed_at=completed_at,
+        transcript=transcript,
+        transcript_uri=transcript_uri,
+        transcript_segments=stored_segments,
+        transcript_words=transcript_words,
+        speaker_identified_transcript=speaker_transcript,
+        speaker_identification_summary=speaker_summary,
+        refined_transcript=refined_transcript
+    )
+
+    # Make the transcript searchable
+    if search_index is not None and transcript_segments:
+        try:
+            await search_index.index_job(job_id, transcript_segments)
+        except Exception as e:
+            print(f"Failed to index transcript of job {job_id} for search: {e}")
+
+    # Notify completion
+    await notify_websocket(job_id, {
+        "status": "completed",
+        "message": "Transcription completed successfully",
+        "data": {
+            "transcript": transcript[:500],
+            "transcript_segments": transcript_segments[:5] if transcript_segments else None,
+            "refined_transcript": refined_transcript,
+            "speaker_identified_transcript": speaker_transcript,
+            "speaker_identification_summary": speaker_summary,
         }
-        
-        # Add signed URL option
-        if "signed_url" in upload_options:
-            response["upload_options"]["signed_url"] = upload_options["signed_url"]
-        
-        # Add resumable upload option if available
-        if "resumable_upload" in upload_options:
-            response["upload_options"]["resumable_upload"] = upload_options["resumable_upload"]
-        
-        # Recommend best upload method based on file size
-        if file_size:
-            if file_size < 100 * 1024 * 1024:  # < 100MB
-                response["recommended_method"] = "signed_url"
-            else:
-                response["recommended_method"] = "resumable_upload"
-        else:
-            response["recommended_method"] = "resumable_upload"  # Default for unknown size
-        
-        print(f"DEBUG: Generated upload options successfully")
-        return response
-        
-    except Exception as e:
-        print(f"ERROR: Failed to generate upload options - {type(e).__name__}: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
+    })
 
 
-@app.delete("/api/v1/transcription/{job_id}")
-async def delete_transcription(job_id: str):
+async def get_job(job_id: str, include_results=True) -> Optional[JobStatus]:
     """
-    Delete a transcription job and its associated files.
+    Load a job, restoring completed jobs from their persisted result.
+    
+    Jobs missing from the job store (expired, or created before a restart or
+    on another instance) are reloaded from GCS without re-transcribing.
     
     Args:
-        job_id: Job ID to delete
+        job_id: Unique job identifier
+        include_results: Passed on to the job store
+        
+    Returns:
+        Job status, or None if the job is unknown
+    """
+    job = await job_store.get(job_id, include_results=include_results)
+    if job is not None:
+        return job
+    
+    try:
+        result = await storage_service.load_transcript_result(job_id)
+    except Exception as e:
+        print(f"Failed to load persisted result for job {job_id}: {e}")
+        return None
+    if result is None:
+        return None
+    
+    segments = result.pop("transcript_segments", None)
+    if segments:
+        transcript_words, stripped_segments = WordStore.from_segments(segments)
+        result["transcript_segments"] = [TranscriptSegment(**segment) for segment in stripped_segments]
+        result["transcript_words"] = transcript_words
+    
+    await job_store.create(JobStatus(**result))
+    print(f"Restored job {job_id} from its persisted result")
+    return await job_store.get(job_id, include_results=include_results)
+
+
+async def fail_job(job_id: str, error: BaseException):
+    """
+    Mark a job as failed and notify listeners.
+    
+    Args:
+        job_id: Unique job identifier
+        error: Exception that made the job fail
+    """
+    await job_store.update(
+        job_id,
+        status="failed",
+        error=str(error),
+        completed_at=datetime.now()
+    )
+    
+    await notify_websocket(job_id, {
+        "status": "failed",
+        "message": f"Transcription failed: {str(error)}"
+    })
+
+
+async def process_transcription(job_id: str, request: TranscriptionRequest):
+    """
+    Process transcription job asynchronously.
+    
+    Args:
+        job_id: Unique job identifier
+        request: Transcription request parameters
+    """
+    audio_gcs_uri: Optional[str] = None
+    try:
+        audio_gcs_uri = await prepare_audio(job_id, request)
+        
+        # Perform transcription
+        await job_store.update(job_id, status="transcribing")
+        await notify_websocket(job_id, {"status": "transcribing", "message": "Transcribing audio"})
+        recognition_progress = await start_recognition_progress(job_id, audio_gcs_uri)
+        
+        transcript, transcript_segments, speaker_transcript, speaker_summary, refined_transcript = await transcription_service.transcribe_audio(
+            gcs_uri=audio_gcs_uri,
+            language_code=request.language_code or "nl-NL",
+            recognizer_id=request.recognizer_id,
+            enable_diarization=request.enable_diarization,
+            enable_speaker_identification=request.enable_speaker_identification,
+            min_speaker_count=request.min_speaker_count,
+            max_speaker_count=request.max_speaker_count,
+            on_progress=recognition_progress.update,
+            job_id=job_id
+        )
+        
+        # Apply speaker identification if enabled
+        if request.enable_speaker_identification and speaker_transcript:
+            await job_store.update(job_id, status="identifying_speakers")
+            await notify_websocket(job_id, {"status": "identifying_speakers", "message": "Identifying speakers"})
+        
+        await complete_job(
+            job_id,
+            transcript,
+            transcript_segments,
+            speaker_transcript,
+            speaker_summary,
+            refined_transcript
+        )
+        
+    except Exception as e:
+        await fail_job(job_id, e)
+    finally:
+        if audio_gcs_uri is not None:
+            await delete_trimmed_audio(job_id, audio_gcs_uri)
+
+
+async def process_batch_transcription(batch_id: str, items: List[Dict[str, Any]]):
+    """
+    Process jobs that share a recognizer and language with one BatchRecognize call.
+    
+    Args:
+        batch_id: Batch identifier
+        items: Jobs in the batch, as dicts with ``job_id`` and ``request``
+    """
+    jobs_by_id = {item["job_id"]: TranscriptionRequest(**item["request"]) for item in items}
+    first_request = next(iter(jobs_by_id.values()))
+
+    # Extract audio per job; failures only affect that job
+    audio_results = await asyncio.gather(
+        *(prepare_audio(job_id, request) for job_id, request in jobs_by_id.items()),
+        return_exceptions=True
+    )
+
+    # Jobs can share audio (the same file submitted twice, or deduplicated
+    # uploads); each distinct file is recognised once for all its jobs
+    jobs_by_uri: Dict[str, List[str]] = {}
+    trackers: Dict[str, RecognitionProgress] = {}
+    for job_id, audio_result in zip(jobs_by_id, audio_results, strict=True):
+        if isinstance(audio_result, BaseException):
+            await fail_job(job_id, audio_result)
+            continue
+        jobs_by_uri.setdefault(audio_result, []).append(job_id)
+        await job_store.update(job_id, status="transcribing")
+        await notify_websocket(job_id, {"status": "transcribing", "message": "Transcribing audio"})
+        trackers[job_id] = await start_recognition_progress(job_id, audio_result)
+
+    if not jobs_by_uri:
+        return
+
+    async def report_progress(gcs_uri: str, progress: int):
+        for job_id in jobs_by_uri.get(gcs_uri, []):
+            await trackers[job_id].update(progress)
+
+    print(f"Batch {batch_id}: recognising {len(jobs_by_uri)} files in one operation")
+
+    try:
+        async with stage_limiter.stage(STAGE_RECOGNITION):
+            results = await transcription_service.transcribe_batch(
+                list(jobs_by_uri),
+                recognizer_id=first_request.recognizer_id,
+                language_code=first_request.language_code or "nl-NL",
+                on_progress=report_progress
+            )
+    except Exception as e:
+        for job_ids in jobs_by_uri.values():
+            for job_id in job_ids:
+                await fail_job(job_id, e)
+        return
+    finally:
+        await asyncio.gather(*(
+            delete_trimmed_audio(job_id, gcs_uri)
+            for gcs_uri, job_ids in jobs_by_uri.items()
+            for job_id in job_ids
+        ))
+
+    async def finish(gcs_uri: str, job_id: str):
+        request = jobs_by_id[job_id]
+        try:
+            result = results.get(gcs_uri)
+            if result is None:
+                raise RuntimeError("No recognition result returned for file")
+            if isinstance(result, Exception):
+                raise result
+
+            transcript, transcript_segments = result
+            if len(jobs_by_uri[gcs_uri]) > 1:
+                # Completing a job rewrites its segments in place
+                transcript_segments = copy.deepcopy(transcript_segments)
+            await trackers[job_id].update(100)
+
+            if request.enable_speaker_identification:
+                await job_store.update(job_id, status="identifying_speakers")
+                await notify_websocket(job_id, {"status": "identifying_speakers", "message": "Identifying speakers"})
+
+            speaker_transcript, speaker_summary, refined_transcript = await transcription_service.apply_speaker_identification(
+                transcript,
+                transcript_segments,
+                request.enable_speaker_identification
+            )
+
+            await complete_job(
+                job_id,
+                transcript,
+                transcript_segments,
+                speaker_transcript,
+                speaker_summary,
+                refined_transcript
+            )
+        except Exception as e:
+            await fail_job(job_id, e)
+
+    await asyncio.gather(*(
+        finish(gcs_uri, job_id)
+        for gcs_uri, job_ids in jobs_by_uri.items()
+        for job_id in job_ids
+    ))
+
+
+# Progress percentage reported for each job status
+STATUS_PROGRESS = {
+    "pending": 0,
+    "extracting_audio": 20,
+    "transcribing": RECOGNITION_PROGRESS_RANGE[0],
+    "identifying_speakers": 80,
+    "completed": 100,
+}
+
+
+def job_progress(job: JobStatus) -> int:
+    """Overall progress percentage of a job, refined by recognition progress."""
+    if job.status == "transcribing" and job.recognition_progress is not None:
+        return recognition_job_progress(job.recognition_progress)
+    return STATUS_PROGRESS.get(job.status, 0)
+
+# Fields always present in a status response, whatever the projection
+STATUS_BASE_FIELDS = {"job_id", "status", "version"}
+
+# Fields that can be requested with ``fields=``
+STATUS_FIELDS = STATUS_BASE_FIELDS | {
+    "created_at", "started_at", "completed_at", "gcs_uri", "batch_id",
+    "recognition_progress", "estimated_completion_at", "progress", "queue_position", "estimated_wait_seconds",
+    "error", "transcript_uri", "silence_trimmed_seconds",
+    *(field for field in LARGE_FIELDS if field not in ("transcript_words", "result_payload"))
+}
+
+
+def status_etag(job: JobStatus, variant: str) -> str:
+    """
+    Build the ETag of a status response.
+    
+    Args:
+        job: Job status
+        variant: Projection, pagination and other inputs that shape the response
+        
+    Returns:
+        Quoted entity tag
+    """
+    digest = hashlib.sha1(variant.encode("utf-8")).hexdigest()[:12]
+    return f'"{job.job_id}-{job.version}-{digest}"'
+
+
+@app.get("/api/v1/transcription/{job_id}")
+async def get_transcription_status(
+    job_id: str,
+    fields: Optional[str] = None,
+    segments_offset: int = Query(0, ge=0),
+    segments_limit: Optional[int] = Query(None, ge=1),
+    include_words: bool = True,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
+    """
+    Get the status and results of a transcription job.
+    
+    The response carries an ETag derived from the job version; clients send
+    it back in ``If-None-Match`` and get a 304 while the job is unchanged.
+    Responses are compressed with brotli or gzip when the client accepts it,
+    and the full result of a completed job is serialized once and cached on
+    the job record.
+    
+    Args:
+        job_id: Unique job identifier
+        fields: Comma-separated fields to return (default: all)
+        segments_offset: Index of the first transcript segment to return
+        segments_limit: Maximum number of transcript segments to return
+        include_words: Whether to include word-level details in the segments
+        if_none_match: ETag of the response the client already has
+        accept_encoding: Content encodings the client accepts
+        
+    Returns:
+        Job status and transcript if completed
+    """
+    if fields:
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown = requested - STATUS_FIELDS
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+        requested |= STATUS_BASE_FIELDS
+    else:
+        requested = STATUS_FIELDS
+    
+    # Load the small status fields first so unchanged jobs cost one cheap read
+    job = await get_job(job_id, include_results=False)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    queue_position = None
+    if job.status == "pending":
+        queue_position = await job_scheduler.queue.position(job.batch_id or job_id)
+    
+    variant = f"{sorted(requested)}:{segments_offset}:{segments_limit}:{include_words}:{queue_position}"
+    etag = status_etag(job, variant)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    
+    # The complete result of a finished job never changes, so it is served
+    # from the serialized payload cached on the job record
+    full_result = (
+        job.status == "completed"
+        and not fields
+        and segments_offset == 0
+        and segments_limit is None
+        and include_words
+    )
+    if full_result:
+        cached = await job_store.get(job_id, include_results=["result_payload"])
+        if cached is not None and cached.result_payload:
+            return await encoded_response(b"", accept_encoding, headers, gzip_body=cached.result_payload)
+    
+    result_fields = [field for field in LARGE_FIELDS if field in requested]
+    if "transcript_segments" in requested and include_words:
+        result_fields.append("transcript_words")
+    if job.status == "completed" and result_fields:
+        job = await job_store.get(job_id, include_results=result_fields)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+    
+    response = {
+        "job_id": job_id,
+        "status": job.status,
+        "version": job.version,
+        "created_at": job.created_at.isoformat(),
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+        "gcs_uri": job.gcs_uri,
+        "progress": job_progress(job)
+    }
+    
+    if job.batch_id:
+        response["batch_id"] = job.batch_id
+    if job.recognition_progress is not None:
+        response["recognition_progress"] = job.recognition_progress
+    if job.silence_trimmed_seconds is not None:
+        response["silence_trimmed_seconds"] = job.silence_trimmed_seconds
+    if job.status == "transcribing" and job.estimated_completion_at is not None:
+        response["estimated_completion_at"] = job.estimated_completion_at.isoformat()
+    
+    if job.status == "completed":
+        response["transcript"] = job.transcript
+        response["transcript_uri"] = job.transcript_uri
+        response["speaker_identified_transcript"] = job.speaker_identified_transcript
+        response["speaker_identification_summary"] = job.speaker_identification_summary
+        response["refined_transcript"] = job.refined_transcript
+        
+        if "transcript_segments" in requested and job.transcript_segments:
+            segments = job.transcript_segments
+            end = len(segments) if segments_limit is None else segments_offset + segments_limit
+            response["transcript_segments"] = segment_views(
+                segments,
+                job.transcript_words,
+                start=segments_offset,
+                end=end,
+                include_words=include_words
+            )
+            response["segments_total"] = len(segments)
+            response["segments_offset"] = segments_offset
+            if end < len(segments):
+                response["next_segments_offset"] = end
+        else:
+            response["transcript_segments"] = None
+    elif job.status == "failed":
+        response["error"] = job.error
+    elif queue_position is not None:
+        response["queue_position"] = queue_position
+        response["estimated_wait_seconds"] = job_scheduler.estimate_wait_seconds(queue_position)
+    
+    # Pagination metadata is only set when segments were returned
+    pagination_fields = {"segments_total", "segments_offset", "next_segments_offset"}
+    response = {
+        key: value for key, value in response.items()
+        if key in requested or key in pagination_fields
+    }
+    
+    body = dumps(response)
+    if full_result:
+        loop = asyncio.get_event_loop()
+        gzip_body = await loop.run_in_executor(None, compress, body, "gzip")
+        await job_store.cache_result_payload(job_id, gzip_body, job.version)
+        return await encoded_response(body, accept_encoding, headers, gzip_body=gzip_body)
+    
+    return await encoded_response(body, accept_encoding, headers)
+
+
+@app.get("/api/v1/transcription/{job_id}/segments")
+async def get_transcript_segments(
+    job_id: str,
+    from_seconds: float = Query(0.0, alias="from", ge=0),
+    to_seconds: Optional[float] = Query(None, alias="to", ge=0),
+    include_words: bool = True,
+    accept_encoding: Optional[str] = Header(None)
+):
+    """
+    Get the transcript segments of a completed job within a time range.
+    
+    Only the part of the persisted segment file covering the range is read
+    from GCS, so this also works for jobs this instance never processed.
+    
+    Args:
+        job_id: Unique job identifier
+        from_seconds: Start of the range in seconds (``from`` query parameter)
+        to_seconds: End of the range in seconds (``to`` query parameter)
+        include_words: Whether to include word-level details
+        accept_encoding: Content encodings the client accepts
+        
+    Returns:
+        Segments overlapping the range
+    """
+    if to_seconds is not None and to_seconds < from_seconds:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    
+    try:
+        segments = await storage_service.read_transcript_range(job_id, from_seconds, to_seconds)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    
+    if segments is None:
+        raise HTTPException(status_code=404, detail="No persisted transcript for this job")
+    
+    if not include_words:
+        for segment in segments:
+            segment["words"] = None
+    
+    body = dumps({
+        "job_id": job_id,
+        "from": from_seconds,
+        "to": to_seconds,
+        "transcript_segments": segments
+    })
+    return await encoded_response(
+        body,
+        accept_encoding,
+        {"Cache-Control": "private, max-age=3600"}
+    )
+
+
+@app.get("/api/v1/transcription/{job_id}/export")
+async def export_transcription(
+    job_id: str,
+    export_format: str = Query("srt", alias="format", pattern="^(srt|vtt|txt|json)$"),
+    max_chars_per_line: int = Query(42, ge=10, le=200),
+    max_cue_seconds: float = Query(6.0, gt=0, le=60),
+    include_speakers: bool = False
+):
+    """
+    Export the transcript of a completed job as subtitles, text or JSON.
+    
+    The output is streamed from the stored segments and word timings, so
+    memory use does not grow with the length of the export.
+    
+    Args:
+        job_id: Unique job identifier
+        export_format: ``srt``, ``vtt``, ``txt`` or ``json`` (``format`` query parameter)
+        max_chars_per_line: Maximum characters per subtitle line
+        max_cue_seconds: Maximum subtitle cue duration in seconds
+        include_speakers: Whether to label cues with identified speakers
+        
+    Returns:
+        Streaming response with the exported transcript
+    """
+    job = await get_job(
+        job_id,
+        include_results=["transcript_segments", "transcript_words", "speaker_identified_transcript"]
+    )
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    if job.status != "completed" or not job.transcript_segments:
+        raise HTTPException(status_code=409, detail="Transcript is not available for export")
+    
+    segments = job.transcript_segments
+    words = job.transcript_words
+    
+    def words_for(index: int) -> List[Dict[str, Any]]:
+        stored = segments[index].words
+        if stored:
+            return [word.model_dump() for word in stored]
+        return words.words(index) if words is not None else []
+    
+    speakers = None
+    if include_speakers:
+        speakers = segment_speakers(segments, job.speaker_identified_transcript)
+    
+    media_type, extension = EXPORT_FORMATS[export_format]
+    return StreamingResponse(
+        export_transcript(
+            export_format,
+            job_id,
+            segments,
+            words_for,
+            speakers=speakers,
+            max_chars_per_line=max_chars_per_line,
+            max_cue_seconds=max_cue_seconds
+        ),
+        media_type=media_type if export_format == "json" else f"{media_type}; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{job_id}.{extension}"'}
+    )
+
+
+@app.get("/api/v1/search")
+async def search_transcripts(
+    q: str = Query(..., min_length=1, max_length=500),
+    job_id: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    order: str = Query("recent", pattern="^(recent|relevance)$")
+):
+    """
+    Search the segments of completed transcripts.
+    
+    Matching ignores case and diacritics and also finds terms inside compound
+    words. Quoted text is matched as a phrase; all terms must occur in a segment.
+    
+    Args:
+        q: Search query
+        job_id: Only search the transcript of this job
+        limit: Maximum number of hits
+        offset: Number of hits to skip
+        order: ``recent`` (newest transcripts first) or ``relevance``
+        
+    Returns:
+        Hits with job ID, segment ID, timestamp and snippet
+    """
+    if search_index is None:
+        raise HTTPException(status_code=404, detail="Transcript search is disabled")
+    
+    try:
+        result = await search_index.search(q, job_id=job_id, limit=limit, offset=offset, order=order)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    
+    return {"query": q, "limit": limit, "offset": offset, **result}
+
+
+@app.get("/api/v1/search/stats")
+async def get_search_stats():
+    """
+    Get the number of indexed transcripts and segments.
+    
+    Returns:
+        Search index statistics
+    """
+    if search_index is None:
+        return {"enabled": False}
+    return {"enabled": True, **await search_index.stats()}
+
+
+@app.post("/api/v1/recognizer", response_model=RecognizerResponse)
+async def create_or_get_recognizer(request: RecognizerRequest):
+    """
+    Create a new recognizer or get an existing one.
+    
+    Args:
+        request: Recognizer configuration request
+        
+    Returns:
+        Recognizer response with ID and status
+    """
+    try:
+        recognizer_id = request.recognizer_id or f"recognizer-{uuid.uuid4().hex[:8]}"
+        
+        # Check if recognizer exists
+        exists = await transcription_service.check_recognizer_exists(recognizer_id)
+        
+        if exists:
+            return RecognizerResponse(
+                recognizer_id=recognizer_id,
+                created=False,
+                message=f"Using existing recognizer: {recognizer_id}"
+            )
+        
+        # Create new recognizer
+        await transcription_service.create_recognizer(
+            recognizer_id=recognizer_id,
+            language_codes=request.language_codes,
+            model=request.model
+        )
+        
+        return RecognizerResponse(
+            recognizer_id=recognizer_id,
+            created=True,
+            message=f"Created new recognizer: {recognizer_id}"
+        )
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.websocket("/ws/{job_id}")
+async def websocket_endpoint(websocket: WebSocket, job_id: str, last_seq: Optional[int] = None):
+    """
+    WebSocket endpoint for real-time transcription updates.
+    
+    Events are pushed as they are published; the connection does not poll the
+    job store. Every event carries a ``seq`` number, and a reconnecting client
+    can pass the last one it received as ``?last_seq=`` to replay missed events.
+    
+    Args:
+        websocket: WebSocket connection
+        job_id: Job ID to monitor
+        last_seq: Last event sequence number seen by the client
+    """
+    await websocket.accept()
+    
+    try:
+        async with progress_hub.subscribe(job_id, last_seq) as subscription:
+            if last_seq is None:
+                # Send initial status
+                job = await job_store.get(job_id, include_results=False)
+                if job is None:
+                    return
+                await websocket.send_json({
+                    "job_id": job_id,
+                    "status": job.status,
+                    "progress": job_progress(job),
+                    "message": "Connected to transcription updates",
+                    "seq": subscription.last_seq
+                })
+                if job.status in TERMINAL_STATUSES:
+                    return
+            
+            # Wait for either the next event or the client going away
+            disconnected = asyncio.create_task(wait_for_disconnect(websocket))
+            try:
+                while True:
+                    next_event = asyncio.create_task(subscription.get())
+                    done, _ = await asyncio.wait(
+                        {next_event, disconnected},
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if next_event not in done:
+                        next_event.cancel()
+                        break
+                    
+                    event = next_event.result()
+                    await websocket.send_json(event)
+                    if event.get("status") in TERMINAL_STATUSES:
+                        break
+            finally:
+                disconnected.cancel()
+                
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        print(f"WebSocket error: {e}")
+    finally:
+        try:
+            await websocket.close()
+        except RuntimeError:
+            # Already closed by the client
+            pass
+
+
+async def wait_for_disconnect(websocket: WebSocket):
+    """
+    Consume incoming WebSocket messages until the client disconnects.
+    
+    Args:
+        websocket: WebSocket connection
+    """
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+async def notify_websocket(job_id: str, data: Dict[str, Any]):
+    """
+    Publish a progress event to all WebSocket subscribers of a job.
+    
+    Args:
+        job_id: Job ID
+        data: Data to send
+    """
+    try:
+        await progress_hub.publish(job_id, data)
+    except Exception as e:
+        print(f"Failed to publish progress event: {e}")
+
+
+def unique_upload_filename(filename: str) -> str:
+    """Prefix an upload filename with a timestamp and random suffix."""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"{timestamp}_{uuid.uuid4().hex[:8]}_{filename}"
+
+
+def validate_upload_file(filename: str, file_size: Optional[int] = None) -> None:
+    """
+    Check that a file may be uploaded.
+    
+    Args:
+        filename: Name of the file to upload
+        file_size: Size of the file in bytes, if known
+        
+    Raises:
+        HTTPException: If the file type or size is not allowed
+    """
+    # Validate file type if provided
+    if filename:
+        allowed_extensions = ['.mp3', '.mp4', '.wav', '.m4a', '.flac', '.ogg', '.webm', '.mov']
+        file_extension = os.path.splitext(filename)[1].lower()
+        
+        if file_extension not in allowed_extensions:
+            raise HTTPException(
+                status_code=400,
+                detail=f"File type {file_extension} not supported. Allowed types: {allowed_extensions}"
+            )
+    
+    # Check file size limits
+    if file_size and file_size > settings.get_max_file_size_bytes():
+        max_gb = settings.max_file_size_mb / 1024
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"File too large. Maximum size is {max_gb:.0f}GB "
+                f"({settings.max_file_size_mb}MB)."
+            )
+        )
+
+
+async def find_duplicate_upload(
+    file_size: Optional[int],
+    hash_algorithm: str,
+    content_hash: Optional[str]
+) -> Optional[Dict[str, Any]]:
+    """
+    Look up an earlier upload with the same content hash and size.
+    
+    Args:
+        file_size: Size of the file in bytes
+        hash_algorithm: Algorithm of ``content_hash``
+        content_hash: Content hash supplied by the client
+        
+    Returns:
+        Response for the existing upload, or None to upload the file
+        
+    Raises:
+        HTTPException: If the content hash is malformed
+    """
+    if upload_dedup_index is None or not content_hash or not file_size:
+        return None
+    try:
+        digest = upload_dedup_index.normalize(hash_algorithm, content_hash)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    
+    existing = await upload_dedup_index.lookup(hash_algorithm.lower(), digest, file_size)
+    if existing is None:
+        return None
+    
+    print(f"Skipping upload: identical content already uploaded as {existing['gcs_uri']}")
+    return {
+        "duplicate": True,
+        "filename": existing["filename"],
+        "gcs_uri": existing["gcs_uri"],
+        "file_size": existing["size"],
+        "upload_method": "none",
+    }
+
+
+async def claim_upload(
+    filename: str,
+    file_size: Optional[int],
+    hash_algorithm: str,
+    content_hash: Optional[str]
+) -> None:
+    """Remember the content hash of a new upload, to index it once it completes."""
+    if upload_dedup_index is None or not content_hash or not file_size:
+        return
+    digest = upload_dedup_index.normalize(hash_algorithm, content_hash)
+    await upload_dedup_index.claim(filename, hash_algorithm.lower(), digest, file_size)
+
+
+async def confirm_upload(gcs_uri: str) -> None:
+    """Index a completed direct upload under the content hash claimed for it."""
+    prefix = f"gs://{settings.gcs_bucket_name}/"
+    if upload_dedup_index is None or not gcs_uri.startswith(prefix):
+        return
+    try:
+        await upload_dedup_index.confirm(gcs_uri[len(prefix):])
+    except Exception as e:
+        print(f"Failed to index upload {gcs_uri} by content hash: {e}")
+
+
+async def build_upload_options(
+    filename: str,
+    file_size: Optional[int] = None,
+    content_type: Optional[str] = None,
+    resumable: bool = False,
+    content_hash: Optional[str] = None,
+    hash_algorithm: str = "sha256"
+) -> Dict[str, Any]:
+    """
+    Validate a file and sign the URLs to upload it directly to GCS.
+    
+    Args:
+        filename: Name of the file to upload
+        file_size: Size of the file in bytes (optional, used for upload method selection)
+        content_type: MIME type of the file (optional)
+        resumable: Only return the resumable upload option
+        content_hash: Content hash; an identical earlier upload is returned instead
+        hash_algorithm: Algorithm of ``content_hash``
+        
+    Returns:
+        Upload options including signed URLs and resumable upload info, or
+        the existing upload with ``duplicate`` set
+        
+    Raises:
+        HTTPException: If the file type or size is not allowed
+    """
+    unique_filename = unique_upload_filename(filename)
+    
+    print(f"DEBUG: Generating upload options - filename: {unique_filename}, size: {file_size}, type: {content_type}, resumable: {resumable}")
+    
+    validate_upload_file(filename, file_size)
+    
+    duplicate = await find_duplicate_upload(file_size, hash_algorithm, content_hash)
+    if duplicate:
+        return {**duplicate, "upload_options": {}, "recommended_method": "none"}
+    
+    # Get upload options from storage service
+    upload_options = await storage_service.generate_upload_options(
+        filename=unique_filename,
+        file_size=file_size,
+        content_type=content_type,
+        expiration_hours=settings.signed_url_expiration_hours
+    )
+    await claim_upload(unique_filename, file_size, hash_algorithm, content_hash)
+    
+    # If resumable is forced, only return resumable option
+    if resumable and "resumable_upload" in upload_options:
+        return {
+            "resumable_upload": upload_options["resumable_upload"],
+            "filename": unique_filename,
+            "gcs_uri": upload_options["gcs_uri"],
+            "upload_method": "resumable"
+        }
+    
+    # Return comprehensive upload options
+    response = {
+        "filename": unique_filename,
+        "gcs_uri": upload_options["gcs_uri"],
+        "file_size": file_size,
+        "content_type": content_type,
+        "expires_in": settings.signed_url_expiration_hours * 3600,
+        "upload_options": {}
+    }
+    
+    # Add signed URL option
+    if "signed_url" in upload_options:
+        response["upload_options"]["signed_url"] = upload_options["signed_url"]
+    
+    # Add resumable upload option if available
+    if "resumable_upload" in upload_options:
+        response["upload_options"]["resumable_upload"] = upload_options["resumable_upload"]
+    
+    # Recommend best upload method based on file size
+    if file_size:
+        if file_size < 100 * 1024 * 1024:  # < 100MB
+            response["recommended_method"] = "signed_url"
+        else:
+            response["recommended_method"] = "resumable_upload"
+    else:
+        response["recommended_method"] = "resumable_upload"  # Default for unknown size
+    
+    return response
+
+
+@app.get("/api/v1/signed-url")
+async def get_signed_upload_url(
+    filename: str,
+    file_size: Optional[int] = None,
+    content_type: Optional[str] = None,
+    resumable: bool = False,
+    content_hash: Optional[str] = None,
+    hash_algorithm: str = "sha256"
+):
+    """
+    Get signed URL(s) for direct file upload to GCS.
+    
+    Supports both regular signed URLs and resumable upload sessions for large files.
+    With ``content_hash`` and ``file_size``, a file that was uploaded before is
+    not uploaded again: the response has ``duplicate`` set and the existing
+    ``gcs_uri``.
+    
+    Args:
+        filename: Name of the file to upload
+        file_size: Size of the file in bytes (optional, used for upload method selection)
+        content_type: MIME type of the file (optional)
+        resumable: Force resumable upload regardless of file size
+        content_hash: Hex or base64 content hash of the file (optional)
+        hash_algorithm: Algorithm of ``content_hash``: sha256 or md5
+        
+    Returns:
+        Upload options including signed URLs and resumable upload info
+    """
+    try:
+        response = await build_upload_options(
+            filename, file_size, content_type, resumable, content_hash, hash_algorithm
+        )
+        print(f"DEBUG: Generated upload options successfully")
+        return response
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"ERROR: Failed to generate upload options - {type(e).__name__}: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/v1/signed-urls")
+async def get_signed_upload_urls(request: SignedUrlBatchRequest):
+    """
+    Get signed upload URLs for many files in one call (e.g. a folder upload).
+    
+    All files are signed concurrently with the cached signing credentials.
+    A file that fails validation or signing gets an ``error`` entry instead
+    of failing the whole request.
+    
+    Args:
+        request: Files to sign
+        
+    Returns:
+        Upload options per file, in request order
+    """
+    if len(request.files) > settings.signed_urls_max_batch:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.signed_urls_max_batch} files can be signed per request"
+        )
+    
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(
+            build_upload_options(
+                item.filename,
+                item.file_size,
+                item.content_type,
+                item.resumable,
+                item.content_hash,
+                item.hash_algorithm
+            )
+            for item in request.files
+        ),
+        return_exceptions=True
+    )
+    
+    files = []
+    for item, result in zip(request.files, results, strict=True):
+        if isinstance(result, HTTPException):
+            files.append({"filename": item.filename, "error": result.detail, "status_code": result.status_code})
+        elif isinstance(result, BaseException):
+            print(f"ERROR: Failed to sign upload URL for {item.filename} - {type(result).__name__}: {result}")
+            files.append({"filename": item.filename, "error": str(result), "status_code": 500})
+        else:
+            files.append({"original_filename": item.filename, **result})
+    
+    return {
+        "files": files,
+        "signed": sum(1 for entry in files if "error" not in entry),
+        "failed": sum(1 for entry in files if "error" in entry),
+        "signing_ms": round((time.perf_counter() - started) * 1000, 2)
+    }
+
+
+def chunk_size_for(file_size: Optional[int], throughput_bytes_per_second: Optional[float] = None) -> int:
+    """Recommended resumable upload chunk size with the configured limits."""
+    return recommend_chunk_size(
+        file_size,
+        throughput_bytes_per_second,
+        target_chunk_seconds=settings.upload_chunk_target_seconds,
+        min_chunk_bytes=settings.upload_chunk_min_mb * 1024 * 1024,
+        max_chunk_bytes=settings.upload_chunk_max_mb * 1024 * 1024
+    )
+
+
+@app.post("/api/v1/upload-session")
+async def create_upload_session(request: UploadSessionRequest, origin: Optional[str] = Header(None)):
+    """
+    Start a resumable upload session for a large file.
+    
+    The session is created server-side; the client sends chunks of
+    ``chunk_size`` bytes to ``session_uri`` with ``Content-Range`` headers.
+    After an interruption, ``GET /api/v1/upload-session/{session_id}``
+    returns the committed offset to resume from.
+    
+    Args:
+        request: File to upload and the client's measured throughput, if any
+        origin: Browser origin, allowed to send chunks to the session URI
+        
+    Returns:
+        Session ID, session URI and recommended chunk size
+    """
+    validate_upload_file(request.filename, request.file_size)
+    duplicate = await find_duplicate_upload(request.file_size, request.hash_algorithm, request.content_hash)
+    if duplicate:
+        return {**duplicate, "committed_bytes": request.file_size, "complete": True}
+    unique_filename = unique_upload_filename(request.filename)
+    
+    try:
+        session_uri = await storage_service.create_resumable_session(
+            unique_filename,
+            file_size=request.file_size,
+            content_type=request.content_type,
+            origin=origin
+        )
+    except Exception as e:
+        print(f"ERROR: Failed to create upload session - {type(e).__name__}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    
+    session_id = uuid.uuid4().hex
+    created_at = datetime.now()
+    session = {
+        "session_id": session_id,
+        "session_uri": session_uri,
+        "filename": unique_filename,
+        "gcs_uri": f"gs://{settings.gcs_bucket_name}/{unique_filename}",
+        "file_size": request.file_size,
+        "content_type": request.content_type,
+        "throughput_bytes_per_second": request.throughput_bytes_per_second,
+        "created_at": created_at.isoformat(),
+        "expires_at": (created_at + timedelta(hours=settings.upload_session_ttl_hours)).isoformat(),
+    }
+    await upload_session_store.save(session_id, session)
+    await claim_upload(unique_filename, request.file_size, request.hash_algorithm, request.content_hash)
+    
+    return {
+        **session,
+        "committed_bytes": 0,
+        "chunk_size": chunk_size_for(request.file_size, request.throughput_bytes_per_second),
+        "chunk_alignment": CHUNK_ALIGNMENT,
+    }
+
+
+@app.get("/api/v1/upload-session/{session_id}")
+async def get_upload_session(
+    session_id: str,
+    throughput_bytes_per_second: Optional[float] = Query(None, gt=0)
+):
+    """
+    Get the committed byte offset of a resumable upload.
+    
+    Resume by sending the bytes from ``committed_bytes`` on, in chunks of
+    ``chunk_size``. Reporting the throughput measured for the last chunks
+    adapts ``chunk_size`` to the connection.
+    
+    Args:
+        session_id: Upload session ID
+        throughput_bytes_per_second: Upload throughput measured by the client
+        
+    Returns:
+        Session info with committed offset, completion and next chunk size
+    """
+    session = await upload_session_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Upload session not found or expired")
+    
+    try:
+        state = await storage_service.query_resumable_session(session["session_uri"], session["file_size"])
+    except Exception as e:
+        print(f"ERROR: Failed to query upload session {session_id} - {type(e).__name__}: {str(e)}")
+        raise HTTPException(status_code=502, detail=str(e)) from e
+    
+    if state["expired"]:
+        await upload_session_store.delete(session_id)
+        raise HTTPException(status_code=410, detail="Upload session expired; start a new upload session")
+    
+    throughput = smooth_throughput(session.get("throughput_bytes_per_second"), throughput_bytes_per_second)
+    if throughput != session.get("throughput_bytes_per_second"):
+        session["throughput_bytes_per_second"] = throughput
+        await upload_session_store.save(session_id, session)
+    
+    return {
+        **session,
+        "committed_bytes": state["committed_bytes"],
+        "complete": state["complete"],
+        "chunk_size": chunk_size_for(session["file_size"], throughput),
+        "chunk_alignment": CHUNK_ALIGNMENT,
+    }
+
+
+@app.post("/api/v1/upload/composite")
+async def start_composite_upload(request: CompositeUploadRequest):
+    """
+    Start a parallel composite upload for a very large file.
+    
+    The file is split into byte ranges, each with its own signed PUT URL
+    for a temporary part object. Upload the parts concurrently, then call
+    ``POST /api/v1/upload/{upload_id}/complete`` to compose them into one
+    object.
+    
+    Args:
+        request: File to upload and optionally the number of parts
+        
+    Returns:
+        Upload ID, final GCS URI and a signed URL per part
+    """
+    validate_upload_file(request.filename, request.file_size)
+    duplicate = await find_duplicate_upload(request.file_size, request.hash_algorithm, request.content_hash)
+    if duplicate:
+        return {**duplicate, "parts": []}
+    unique_filename = unique_upload_filename(request.filename)
+    upload_id = uuid.uuid4().hex
+    
+    max_parts = request.parts or settings.composite_upload_max_parts
+    min_part_bytes = 1 if request.parts else settings.composite_upload_min_part_mb * 1024 * 1024
+    parts = plan_parts(request.file_size, max_parts, min_part_bytes)
+    
+    try:
+        part_urls = await storage_service.generate_composite_part_urls(
+            upload_id,
+            parts,
+            expiration_hours=settings.signed_url_expiration_hours
+        )
+    except Exception as e:
+        print(f"ERROR: Failed to sign composite upload parts - {type(e).__name__}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    
+    await composite_upload_store.save(upload_id, {
+        "upload_id": upload_id,
+        "filename": unique_filename,
+        "original_filename": request.filename,
+        "file_size": request.file_size,
+        "content_type": request.content_type,
+        "parts": parts,
+        "created_at": datetime.now().isoformat(),
+    })
+    await claim_upload(unique_filename, request.file_size, request.hash_algorithm, request.content_hash)
+    
+    content_type = request.content_type or "application/octet-stream"
+    return {
+        "upload_id": upload_id,
+        "filename": unique_filename,
+        "gcs_uri": f"gs://{settings.gcs_bucket_name}/{unique_filename}",
+        "file_size": request.file_size,
+        "expires_in": settings.signed_url_expiration_hours * 3600,
+        "max_concurrency": settings.composite_upload_concurrency,
+        "parts": [{**part, "headers": {"Content-Type": content_type}} for part in part_urls],
+    }
+
+
+@app.post("/api/v1/upload/{upload_id}/complete", response_model=UploadResponse)
+async def complete_composite_upload(upload_id: str):
+    """
+    Compose the uploaded parts of a composite upload into the final object.
+    
+    The temporary part objects are deleted afterwards. Responds with 409 and
+    the indexes of the parts to (re)upload when a part is missing or has the
+    wrong size.
+    
+    Args:
+        upload_id: Composite upload ID
+        
+    Returns:
+        Upload response for the composed object
+    """
+    upload = await composite_upload_store.get(upload_id)
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Composite upload not found or expired")
+    
+    uploaded = await storage_service.list_composite_parts(upload_id)
+    missing = missing_parts(upload["parts"], uploaded, upload_id)
+    if missing:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Not all parts were uploaded", "missing_parts": missing}
+        )
+    
+    try:
+        result = await storage_service.compose_upload(
+            upload_id,
+            len(upload["parts"]),
+            upload["filename"],
+            content_type=upload["content_type"]
+        )
+    except Exception as e:
+        print(f"ERROR: Failed to compose upload {upload_id} - {type(e).__name__}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e)) from e
+    
+    await composite_upload_store.delete(upload_id)
+    await confirm_upload(result["gcs_uri"])
+    
+    return UploadResponse(
+        gcs_uri=result["gcs_uri"],
+        filename=upload["filename"],
+        original_filename=upload["original_filename"],
+        size=result["size"],
+        content_type=upload["content_type"],
+        # Composed objects have no MD5
+        md5_hash=None,
+        crc32c=result["crc32c"]
+    )
+
+
+@app.delete("/api/v1/upload/{upload_id}")
+async def abort_composite_upload(upload_id: str):
+    """
+    Abort a composite upload and delete its uploaded parts.
+    
+    Args:
+        upload_id: Composite upload ID
+        
+    Returns:
+        Success message
+    """
+    if await composite_upload_store.get(upload_id) is None:
+        raise HTTPException(status_code=404, detail="Composite upload not found or expired")
+    
+    await storage_service.delete_composite_parts(upload_id)
+    await composite_upload_store.delete(upload_id)
+    return {"message": f"Composite upload {upload_id} aborted"}
+
+
+@app.get("/api/v1/cache/stats")
+async def get_cache_stats():
+    """
+    Get hit/miss metrics for the result caches.
+    
+    Returns:
+        Statistics per cache, or null for disabled caches
+    """
+    return {
+        "recognition": recognition_cache.get_stats() if recognition_cache else None,
+        "speaker_identification": speaker_cache.get_stats() if speaker_cache else None,
+        "signing_credentials": storage_service.credential_manager.get_stats(),
+        "upload_dedup": upload_dedup_index.get_stats() if upload_dedup_index else None,
+    }
+
+
+@app.get("/api/v1/silence-trimming/stats")
+async def get_silence_trimming_stats():
+    """
+    Get the audio removed by silence trimming since this process started.
+    
+    Returns:
+        Number of checked and trimmed jobs and seconds of audio saved
+    """
+    return {"enabled": settings.silence_trimming_enabled, **silence_trimming_stats}
+
+
+@app.delete("/api/v1/transcription/{job_id}")
+async def delete_transcription(job_id: str):
+    """
+    Delete a transcription job and its associated files.
+    
+    Args:
+        job_id: Job ID to delete
         
     Returns:
         Deletion status
     """
-    if job_id not in jobs:
+    job = await get_job(job_id, include_results=False)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = jobs[job_id]
-    
     try:
         # Delete files from GCS if they exist
         if job.transcript_uri:
             await storage_service.delete_file(job.transcript_uri)
+        if job.status == "completed":
+            await storage_service.delete_transcript_result(job_id)
         
-        # Remove from jobs
-        del jobs[job_id]
+        # Remove from queue (if not started yet) and job store
+        if not job.batch_id:
+            await job_scheduler.queue.remove(job_id)
+        await job_store.delete(job_id)
+        if search_index is not None:
+            await search_index.remove_job(job_id)
         
         return {"message": "Job deleted successfully", "job_id": job_id}
         
@@ -38,6 +38,7 @@ class TranscriptionRequest(BaseModel):
     enable_speaker_identification: bool = Field(False, description="Enable LLM-based speaker identification")
     min_speaker_count: Optional[int] = Field(2, description="Minimum number of speakers")
     max_speaker_count: Optional[int] = Field(10, description="Maximum number of speakers")
+    priority: int = Field(0, ge=0, le=9, description="Queue priority (higher is processed first)")
 
 
 class TranscriptionResponse(BaseModel):
@@ -46,6 +47,32 @@ class TranscriptionResponse(BaseModel):
     job_id: str = Field(..., description="Unique job identifier")
     status: str = Field(..., description="Job status")
     message: str = Field(..., description="Status message")
+    queue_position: Optional[int] = Field(None, description="Position in the job queue")
+    estimated_wait_seconds: Optional[int] = Field(None, description="Estimated time until the job starts")
+
+
+class BatchTranscriptionRequest(BaseModel):
+    """Request model for queuing many transcription jobs at once."""
+
+    jobs: List[TranscriptionRequest] = Field(..., min_length=1, description="One transcription request per file")
+    priority: int = Field(0, ge=0, le=9, description="Queue priority (higher is processed first)")
+
+
+class BatchInfo(BaseModel):
+    """Jobs grouped into a single multi-file recognition operation."""
+
+    batch_id: str = Field(..., description="Batch identifier")
+    recognizer_id: Optional[str] = Field(None, description="Recognizer shared by the batch")
+    language_code: str = Field(..., description="Language code shared by the batch")
+    job_ids: List[str] = Field(..., description="Jobs in the batch")
+    queue_position: Optional[int] = Field(None, description="Position of the batch in the job queue")
+
+
+class BatchTranscriptionResponse(BaseModel):
+    """Response model for batch transcription job creation."""
+
+    jobs: List[TranscriptionResponse] = Field(..., description="Per-file job responses, in request order per batch")
+    batches: List[BatchInfo] = Field(..., description="Batches the jobs were grouped into")
 
 
 class TranscriptionStatus(BaseModel):
@@ -91,6 +118,8 @@ class UploadResponse(BaseModel):
     original_filename: str = Field(..., description="Original uploaded filename")
     size: Optional[int] = Field(None, description="File size in bytes")
     content_type: Optional[str] = Field(None, description="MIME type of the file")
+    md5_hash: Optional[str] = Field(None, description="Base64-encoded MD5 of the uploaded file")
+    crc32c: Optional[str] = Field(None, description="Base64-encoded CRC32C of the uploaded file")
 
 
 class JobStatus(BaseModel):
@@ -104,11 +133,19 @@ class JobStatus(BaseModel):
     gcs_uri: str
     transcript: Optional[str] = None
     transcript_uri: Optional[str] = None
-    transcript_segments: Optional[List[TranscriptSegment]] = None
+    transcript_segments: Optional[List[TranscriptSegment]] = None  # words are kept in transcript_words
+    transcript_words: Optional[Any] = None  # services.word_store.WordStore
+    result_payload: Optional[bytes] = None  # gzip-compressed JSON of the completed status response
     speaker_identified_transcript: Optional[str] = None
     speaker_identification_summary: Optional[Dict[str, Any]] = None
     refined_transcript: Optional[str] = None
     error: Optional[str] = None
+    batch_id: Optional[str] = None
+    recognition_progress: Optional[int] = None
+    estimated_completion_at: Optional[datetime] = None
+    audio_offset_map: Optional[List[List[float]]] = None  # (trimmed start, original start, duration) per kept region
+    silence_trimmed_seconds: Optional[float] = None
+    version: int = 0  # incremented by every job store update
 
 
 class SignedUrlResponse(BaseModel):
@@ -120,6 +157,55 @@ class SignedUrlResponse(BaseModel):
     gcs_uri: str = Field(..., description="Final GCS URI after upload")
 
 
+class SignedUrlRequestItem(BaseModel):
+    """One file in a batch signed URL request."""
+    
+    filename: str = Field(..., description="Name of the file to upload")
+    file_size: Optional[int] = Field(None, description="File size in bytes")
+    content_type: Optional[str] = Field(None, description="MIME type of the file")
+    resumable: bool = Field(False, description="Only return the resumable upload option")
+    content_hash: Optional[str] = Field(
+        None, description="Hex or base64 content hash; an identical earlier upload is reused"
+    )
+    hash_algorithm: str = Field("sha256", description="Hash algorithm: sha256 or md5")
+
+
+class SignedUrlBatchRequest(BaseModel):
+    """Request model for signing upload URLs for many files."""
+    
+    files: List[SignedUrlRequestItem] = Field(..., min_length=1, description="Files to sign")
+
+
+class UploadSessionRequest(BaseModel):
+    """Request model for starting a resumable upload session."""
+    
+    filename: str = Field(..., description="Name of the file to upload")
+    file_size: int = Field(..., gt=0, description="File size in bytes")
+    content_type: Optional[str] = Field(None, description="MIME type of the file")
+    throughput_bytes_per_second: Optional[float] = Field(
+        None, gt=0, description="Upload throughput measured by the client, for chunk sizing"
+    )
+    content_hash: Optional[str] = Field(
+        None, description="Hex or base64 content hash; an identical earlier upload is reused"
+    )
+    hash_algorithm: str = Field("sha256", description="Hash algorithm: sha256 or md5")
+
+
+class CompositeUploadRequest(BaseModel):
+    """Request model for starting a parallel composite upload."""
+    
+    filename: str = Field(..., description="Name of the file to upload")
+    file_size: int = Field(..., gt=0, description="File size in bytes")
+    content_type: Optional[str] = Field(None, description="MIME type of the file")
+    parts: Optional[int] = Field(
+        None, ge=1, le=1024, description="Number of parts (default: by file size, at most COMPOSITE_UPLOAD_MAX_PARTS)"
+    )
+    content_hash: Optional[str] = Field(
+        None, description="Hex or base64 content hash; an identical earlier upload is reused"
+    )
+    hash_algorithm: str = Field("sha256", description="Hash algorithm: sha256 or md5")
+
+
 class WebSocketMessage(BaseModel):
     """WebSocket message format."""
     
@@ -0,0 +1,161 @@
+"""Compare intermediate audio formats on a sample recording.
+
+For every format the recording is encoded with the same FFmpeg options as
+audio extraction, uploaded to the upload bucket and (optionally) transcribed.
+The report lists encode time, upload time, stored bytes and, when a reference
+transcript is given, the word error rate (WER); without a reference the WAV
+transcript is used as reference.
+
+Usage:
+    uv run python scripts/benchmark_audio_formats.py sample_meeting.mp4 \\
+        --language nl-NL --recognize --reference sample_meeting.txt
+"""
+
+import argparse
+import asyncio
+import functools
+import os
+import re
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Settings  # noqa: E402
+from services.audio_format import get_formats  # noqa: E402
+from services.storage import StorageService  # noqa: E402
+from services.transcription import TranscriptionService  # noqa: E402
+
+
+def normalize_words(text: str) -> List[str]:
+    """Lowercase words without punctuation, for WER."""
+    return re.findall(r"\w+", text.lower())
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level Levenshtein distance divided by the reference length."""
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, start=1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, start=1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+async def encode(settings: Settings, input_path: str, audio_format, output_path: str) -> float:
+    """Encode the recording to one format; returns the encode time in seconds."""
+    command = [
+        settings.ffmpeg_path,
+        "-hide_banner",
+        "-nostats",
+        "-i", input_path,
+        *audio_format.ffmpeg_args(settings.ffmpeg_sample_rate, settings.ffmpeg_channels),
+        "-y",
+        output_path,
+    ]
+    started = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(f"FFmpeg error: {stderr.decode('utf-8', errors='replace')}")
+    return time.perf_counter() - started
+
+
+async def benchmark(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    settings = Settings()
+    storage_service = StorageService(settings)
+    transcription_service = TranscriptionService(settings, storage_service=storage_service)
+    formats = get_formats(settings)
+    stem = os.path.splitext(os.path.basename(args.input))[0]
+    loop = asyncio.get_event_loop()
+    rows: List[Dict[str, Any]] = []
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in args.formats:
+            audio_format = formats[name]
+            output_path = os.path.join(workdir, f"{stem}{audio_format.extension}")
+            row: Dict[str, Any] = {"format": name, "lossless": audio_format.lossless}
+
+            row["encode_seconds"] = await encode(settings, args.input, audio_format, output_path)
+            row["bytes"] = os.path.getsize(output_path)
+
+            blob = storage_service.bucket.blob(f"benchmarks/{stem}{audio_format.extension}")
+            started = time.perf_counter()
+            await loop.run_in_executor(
+                None,
+                functools.partial(blob.upload_from_filename, output_path, content_type=audio_format.content_type)
+            )
+            row["upload_seconds"] = time.perf_counter() - started
+            gcs_uri = f"gs://{settings.gcs_bucket_name}/{blob.name}"
+
+            if args.recognize:
+                started = time.perf_counter()
+                transcript, *_ = await transcription_service.transcribe_audio(
+                    gcs_uri,
+                    language_code=args.language
+                )
+                row["recognition_seconds"] = time.perf_counter() - started
+                row["transcript"] = transcript
+
+            if not args.keep:
+                await loop.run_in_executor(None, blob.delete)
+            rows.append(row)
+
+    if args.recognize:
+        reference = None
+        if args.reference:
+            with open(args.reference, encoding="utf-8") as reference_file:
+                reference = reference_file.read()
+        else:
+            reference = next((row["transcript"] for row in rows if row["format"] == "wav"), None)
+        if reference is not None:
+            for row in rows:
+                row["wer"] = word_error_rate(reference, row["transcript"])
+
+    return rows
+
+
+def print_report(rows: List[Dict[str, Any]]) -> None:
+    baseline = next((row["bytes"] for row in rows if row["format"] == "wav"), None)
+    print(f"{'format':<8}{'bytes':>14}{'vs wav':>9}{'encode s':>10}{'upload s':>10}{'recognize s':>13}{'WER':>8}")
+    for row in rows:
+        ratio = f"{row['bytes'] / baseline:.2f}" if baseline else "-"
+        recognition = f"{row['recognition_seconds']:.1f}" if "recognition_seconds" in row else "-"
+        wer = f"{row['wer']:.2%}" if "wer" in row else "-"
+        print(
+            f"{row['format']:<8}{row['bytes']:>14,}{ratio:>9}"
+            f"{row['encode_seconds']:>10.1f}{row['upload_seconds']:>10.1f}{recognition:>13}{wer:>8}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="Local sample recording (audio or video)")
+    parser.add_argument("--formats", nargs="+", default=["wav", "flac", "opus"], choices=["wav", "flac", "opus"])
+    parser.add_argument("--language", default="nl-NL", help="Language code for recognition")
+    parser.add_argument("--recognize", action="store_true", help="Also transcribe each format (billed)")
+    parser.add_argument("--reference", help="Reference transcript for WER (default: the WAV transcript)")
+    parser.add_argument("--keep", action="store_true", help="Keep the uploaded files under benchmarks/")
+    args = parser.parse_args(argv)
+
+    print_report(asyncio.run(benchmark(args)))
+
+
+if __name__ == "__main__":
+    main()
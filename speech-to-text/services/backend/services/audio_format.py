@@ -0,0 +1,140 @@
+"""Intermediate audio formats for extracted audio and the policy choosing one."""
+
+import struct
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    """An FFmpeg output format the Speech-to-Text API can read directly."""
+
+    name: str
+    extension: str
+    content_type: str
+    muxer: str
+    codec: str
+    lossless: bool
+    codec_args: Tuple[str, ...] = field(default_factory=tuple)
+
+    def ffmpeg_args(self, sample_rate: int, channels: int) -> List[str]:
+        """FFmpeg output options (without the output target)."""
+        return [
+            "-vn",  # No video
+            "-acodec", self.codec,
+            *self.codec_args,
+            "-ar", str(sample_rate),
+            "-ac", str(channels),
+            "-f", self.muxer,
+        ]
+
+
+def get_formats(settings) -> Dict[str, AudioFormat]:
+    """Intermediate formats by name, configured from settings."""
+    return {
+        "wav": AudioFormat(
+            name="wav",
+            extension=".wav",
+            content_type="audio/wav",
+            muxer="wav",
+            codec=settings.ffmpeg_audio_codec,
+            lossless=True,
+        ),
+        "flac": AudioFormat(
+            name="flac",
+            extension=".flac",
+            content_type="audio/flac",
+            muxer="flac",
+            codec="flac",
+            lossless=True,
+            codec_args=("-compression_level", "5"),
+        ),
+        "opus": AudioFormat(
+            name="opus",
+            extension=".ogg",
+            content_type="audio/ogg",
+            muxer="ogg",
+            codec="libopus",
+            lossless=False,
+            codec_args=(
+                "-b:a", f"{settings.opus_bitrate_kbps}k",
+                "-application", "voip",
+            ),
+        ),
+    }
+
+
+def parse_overrides(value: str) -> List[Tuple[str, str, str]]:
+    """Parse ``model:language=format`` rules; ``*`` matches any model or language.
+
+    Args:
+        value: Comma-separated rules, e.g. ``chirp_3:nl-NL=opus,*:en-US=flac``
+
+    Returns:
+        (model, language, format) tuples in the given order
+    """
+    rules: List[Tuple[str, str, str]] = []
+    for rule in (value or "").split(","):
+        target, _, format_name = rule.strip().partition("=")
+        if not target or not format_name:
+            continue
+        model, _, language = target.partition(":")
+        rules.append((model.strip() or "*", language.strip() or "*", format_name.strip().lower()))
+    return rules
+
+
+def choose_intermediate_format(
+    settings,
+    language_code: Optional[str] = None,
+    model: Optional[str] = None
+) -> AudioFormat:
+    """Pick the intermediate format for a recognition model and language.
+
+    The first matching ``intermediate_audio_format_overrides`` rule wins;
+    otherwise ``intermediate_audio_format`` (FLAC by default) is used. Opus
+    should only be enabled for models and languages whose accuracy was
+    checked with ``scripts/benchmark_audio_formats.py``.
+
+    Args:
+        settings: Application settings
+        language_code: Language of the recording
+        model: Speech-to-Text model (defaults to ``speech_model``)
+
+    Returns:
+        The audio format to extract to
+    """
+    formats = get_formats(settings)
+    model = model or settings.speech_model
+    language = (language_code or settings.default_language_code or "").lower()
+
+    for rule_model, rule_language, format_name in parse_overrides(settings.intermediate_audio_format_overrides):
+        if rule_model not in ("*", model) or rule_language.lower() not in ("*", language):
+            continue
+        if format_name in formats:
+            return formats[format_name]
+        print(f"Unknown intermediate audio format in override: {format_name}")
+
+    return formats.get(settings.intermediate_audio_format, formats["flac"])
+
+
+def parse_ffmpeg_duration(log: str) -> Optional[float]:
+    """Duration of FFmpeg's output from the last ``time=`` progress entry."""
+    position = log.rfind("time=")
+    if position < 0:
+        return None
+    value = log[position + 5:].split(None, 1)[0] if log[position + 5:].strip() else ""
+    try:
+        hours, minutes, seconds = value.split(":")
+        return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    except ValueError:
+        return None
+
+
+def wav_header(sample_rate: int, data_length: int) -> bytes:
+    """Header of a 16-bit mono PCM WAV file holding ``data_length`` bytes of samples."""
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_length, b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b"data", data_length
+    )
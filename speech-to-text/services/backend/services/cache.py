@@ -0,0 +1,271 @@
+"""Content-addressed result cache with an in-memory LRU tier and a Redis/GCS backing tier."""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from google.api_core.exceptions import NotFound
+
+
+def make_cache_key(**parts: Any) -> str:
+    """Build a stable cache key from JSON-serializable key parts."""
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CacheTier:
+    """Interface for a byte-oriented cache tier."""
+
+    name = "tier"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes) -> None:
+        raise NotImplementedError
+
+
+class MemoryCacheTier(CacheTier):
+    """Process-local LRU tier bounded by the total size of the stored values."""
+
+    name = "memory"
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.current_bytes -= len(previous)
+
+        self._entries[key] = value
+        self.current_bytes += len(value)
+
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= len(evicted)
+            self.evictions += 1
+
+
+class RedisCacheTier(CacheTier):
+    """Redis tier that evicts the least recently used entries above ``max_bytes``.
+
+    Values are stored under ``{prefix}{key}``; a sorted set tracks the last
+    access time of each key and a counter tracks the total stored bytes.
+    """
+
+    name = "redis"
+    EVICTION_BATCH = 32
+
+    def __init__(self, client, namespace: str, max_bytes: int):
+        self.client = client
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self.prefix = f"cache:{namespace}:"
+        self.lru_key = f"cache:{namespace}:__lru__"
+        self.bytes_key = f"cache:{namespace}:__bytes__"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.get(self.prefix + key)
+            pipe.zadd(self.lru_key, {key: time.time()}, xx=True)
+            value: Optional[bytes]
+            value, _ = await pipe.execute()
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.strlen(self.prefix + key)
+            pipe.set(self.prefix + key, value)
+            pipe.zadd(self.lru_key, {key: time.time()})
+            replies = await pipe.execute()
+
+        total = await self.client.incrby(self.bytes_key, len(value) - (replies[0] or 0))
+        if total > self.max_bytes:
+            await self._evict(total)
+
+    async def _evict(self, total: int) -> None:
+        while total > self.max_bytes:
+            oldest = await self.client.zrange(self.lru_key, 0, self.EVICTION_BATCH - 1)
+            if not oldest:
+                break
+
+            keys = [key.decode("utf-8") if isinstance(key, bytes) else key for key in oldest]
+            async with self.client.pipeline(transaction=True) as pipe:
+                for key in keys:
+                    pipe.strlen(self.prefix + key)
+                    pipe.delete(self.prefix + key)
+                pipe.zrem(self.lru_key, *keys)
+                replies = await pipe.execute()
+
+            freed = sum(replies[0:-1:2])
+            total = await self.client.decrby(self.bytes_key, freed)
+            self.evictions += len(keys)
+
+
+class GCSCacheTier(CacheTier):
+    """GCS tier storing one object per entry under ``cache/{namespace}/``.
+
+    Eviction lists the prefix at most every ``EVICTION_INTERVAL_SECONDS`` and
+    deletes the least recently written objects until the total size is below
+    ``max_bytes``.
+    """
+
+    name = "gcs"
+    EVICTION_INTERVAL_SECONDS = 300
+
+    def __init__(self, bucket_provider: Callable[[], Any], namespace: str, max_bytes: int):
+        self._bucket_provider = bucket_provider
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self.prefix = f"cache/{namespace}/"
+        self._next_eviction = 0.0
+
+    @property
+    def bucket(self):
+        # Resolved on use so the storage client is only created when needed
+        return self._bucket_provider()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        loop = asyncio.get_event_loop()
+        try:
+            return await loop.run_in_executor(
+                None, lambda: self.bucket.blob(self.prefix + key).download_as_bytes()
+            )
+        except NotFound:
+            return None
+
+    async def set(self, key: str, value: bytes) -> None:
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(
+            None, lambda: self.bucket.blob(self.prefix + key).upload_from_string(value, "application/json")
+        )
+
+        if time.monotonic() >= self._next_eviction:
+            self._next_eviction = time.monotonic() + self.EVICTION_INTERVAL_SECONDS
+            await loop.run_in_executor(None, self._evict)
+
+    def _evict(self) -> None:
+        blobs = list(self.bucket.list_blobs(prefix=self.prefix))
+        total = sum(blob.size or 0 for blob in blobs)
+        if total <= self.max_bytes:
+            return
+
+        for blob in sorted(blobs, key=lambda item: item.updated or item.time_created):
+            if total <= self.max_bytes:
+                break
+            try:
+                blob.delete()
+            except NotFound:
+                pass
+            total -= blob.size or 0
+            self.evictions += 1
+
+
+class ResultCache:
+    """Two-tier JSON result cache with hit/miss metrics.
+
+    Reads check the in-memory tier first and then the backing tier; backing
+    hits are promoted to memory. Writes go to both tiers. Cache failures are
+    logged and treated as misses so they never fail a job.
+    """
+
+    def __init__(self, name: str, memory_tier: MemoryCacheTier, backing_tier: Optional[CacheTier] = None):
+        self.name = name
+        self.memory_tier = memory_tier
+        self.backing_tier = backing_tier
+        self.stats = {"memory_hits": 0, "backing_hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key`` or None."""
+        try:
+            value = await self.memory_tier.get(key)
+            if value is not None:
+                self.stats["memory_hits"] += 1
+                return json.loads(value)
+
+            if self.backing_tier is not None:
+                value = await self.backing_tier.get(key)
+                if value is not None:
+                    self.stats["backing_hits"] += 1
+                    await self.memory_tier.set(key, value)
+                    return json.loads(value)
+        except Exception as exc:
+            self.stats["errors"] += 1
+            print(f"{self.name} cache read failed: {exc}")
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value under ``key``."""
+        try:
+            encoded = json.dumps(value, ensure_ascii=False).encode("utf-8")
+            await self.memory_tier.set(key, encoded)
+            if self.backing_tier is not None:
+                await self.backing_tier.set(key, encoded)
+            self.stats["writes"] += 1
+        except Exception as exc:
+            self.stats["errors"] += 1
+            print(f"{self.name} cache write failed: {exc}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes."""
+        lookups = self.stats["memory_hits"] + self.stats["backing_hits"] + self.stats["misses"]
+        hits = lookups - self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            "memory_bytes": self.memory_tier.current_bytes,
+            "memory_evictions": self.memory_tier.evictions,
+            "backing_tier": self.backing_tier.name if self.backing_tier else None,
+            "backing_evictions": getattr(self.backing_tier, "evictions", None),
+        }
+
+
+def create_result_cache(
+    name: str,
+    settings,
+    redis_client=None,
+    bucket_provider: Optional[Callable[[], Any]] = None
+) -> Optional[ResultCache]:
+    """Create a result cache from the settings.
+
+    Args:
+        name: Cache namespace, e.g. ``recognition`` or ``speakers``
+        settings: Application settings
+        redis_client: Redis client for the ``redis`` backing tier
+        bucket_provider: Callable returning the GCS bucket for the ``gcs``
+            backing tier
+
+    Returns:
+        Configured cache, or None when caching is disabled
+    """
+    if not settings.result_cache_enabled:
+        return None
+
+    memory_tier = MemoryCacheTier(settings.result_cache_memory_mb * 1024 * 1024)
+    backing_bytes = settings.result_cache_backing_mb * 1024 * 1024
+    backing_tier: Optional[CacheTier] = None
+
+    if settings.result_cache_backing == "redis" and redis_client is not None:
+        backing_tier = RedisCacheTier(redis_client, name, backing_bytes)
+    elif settings.result_cache_backing == "gcs" and bucket_provider is not None:
+        backing_tier = GCSCacheTier(bucket_provider, name, backing_bytes)
+
+    return ResultCache(name, memory_tier, backing_tier)
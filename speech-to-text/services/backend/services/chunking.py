@@ -0,0 +1,202 @@
+"""Helpers for splitting long audio into overlapping chunks and stitching the results."""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_SILENCE_START = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END = re.compile(r"silence_end:\s*(-?[\d.]+)")
+
+
+def parse_silences(lines: Iterable[str]) -> List[Tuple[float, float]]:
+    """Parse FFmpeg ``silencedetect`` log lines into (start, end) pairs.
+
+    Args:
+        lines: FFmpeg stderr lines
+
+    Returns:
+        Silent regions in seconds, in file order
+    """
+    silences: List[Tuple[float, float]] = []
+    current_start: Optional[float] = None
+
+    for line in lines:
+        start_match = _SILENCE_START.search(line)
+        if start_match:
+            current_start = max(0.0, float(start_match.group(1)))
+            continue
+
+        end_match = _SILENCE_END.search(line)
+        if end_match and current_start is not None:
+            silences.append((current_start, float(end_match.group(1))))
+            current_start = None
+
+    return silences
+
+
+def plan_chunks(
+    duration: float,
+    silences: List[Tuple[float, float]],
+    chunk_seconds: float,
+    overlap_seconds: float,
+    search_window_seconds: float
+) -> List[Dict[str, Any]]:
+    """Choose chunk boundaries at silences close to every ``chunk_seconds``.
+
+    Each chunk owns the "core" range between two cut points and extends
+    ``overlap_seconds`` past them on both sides so words at a cut are
+    recognised with context. When no silence lies within
+    ``search_window_seconds`` of the target, the chunk is cut at the target.
+
+    Args:
+        duration: Audio duration in seconds
+        silences: Silent regions as (start, end) pairs
+        chunk_seconds: Target chunk length
+        overlap_seconds: Extra audio added on each side of a cut
+        search_window_seconds: How far from the target a silence may be
+
+    Returns:
+        Chunk descriptions with ``start_seconds``/``end_seconds`` (audio to
+        recognise) and ``core_start_seconds``/``core_end_seconds`` (range the
+        chunk's words are kept for)
+    """
+    midpoints = [(start + end) / 2 for start, end in silences]
+    cuts: List[float] = []
+    position = 0.0
+
+    # Avoid a tiny trailing chunk by only cutting when enough audio remains
+    while duration - position > chunk_seconds * 1.25:
+        target = position + chunk_seconds
+        candidates = [
+            point for point in midpoints
+            if abs(point - target) <= search_window_seconds and point > position + 2 * overlap_seconds
+        ]
+        cut = min(candidates, key=lambda point: abs(point - target)) if candidates else target
+        cuts.append(cut)
+        position = cut
+
+    boundaries = [0.0] + cuts + [duration]
+    return [
+        {
+            "index": index,
+            "start_seconds": max(0.0, core_start - overlap_seconds),
+            "end_seconds": min(duration, core_end + overlap_seconds),
+            "core_start_seconds": core_start,
+            "core_end_seconds": core_end,
+        }
+        for index, (core_start, core_end) in enumerate(zip(boundaries[:-1], boundaries[1:], strict=True))
+    ]
+
+
+class PcmRangeSplitter:
+    """Routes a stream of bytes to byte ranges of it as the bytes arrive.
+
+    Ranges must be sorted by start and by end; they may overlap (neighbouring
+    chunks share their overlap), in which case a block is routed to every
+    range it intersects.
+    """
+
+    def __init__(self, ranges: List[Tuple[int, int]]):
+        self.ranges = ranges
+        self.position = 0
+        self.completed = 0  # ranges[:completed] have received all their bytes
+
+    def split(self, data: bytes) -> List[Tuple[int, bytes]]:
+        """Cut the next block of the stream into pieces per range.
+
+        Args:
+            data: Bytes following those passed in earlier calls
+
+        Returns:
+            (range index, bytes) pieces in range order
+        """
+        start, end = self.position, self.position + len(data)
+        self.position = end
+
+        pieces: List[Tuple[int, bytes]] = []
+        index = self.completed
+        while index < len(self.ranges) and self.ranges[index][0] < end:
+            range_start, range_end = self.ranges[index]
+            if range_end > start:
+                pieces.append((index, data[max(range_start, start) - start:min(range_end, end) - start]))
+            index += 1
+
+        while self.completed < len(self.ranges) and self.ranges[self.completed][1] <= end:
+            self.completed += 1
+        return pieces
+
+
+def _shift(value: Optional[float], offset: float) -> Optional[float]:
+    return None if value is None else value + offset
+
+
+def merge_chunk_segments(
+    chunks: List[Dict[str, Any]],
+    chunk_segments: List[List[Dict[str, Any]]]
+) -> Tuple[str, List[Dict[str, Any]]]:
+    """Merge per-chunk segments into one transcript on the original timeline.
+
+    Word and segment offsets are re-based by the chunk start. Words are kept
+    only when their midpoint falls in the chunk's core range, which removes the
+    duplicates recognised in the overlap of two neighbouring chunks. Segment ids
+    are renumbered sequentially.
+
+    Args:
+        chunks: Chunk descriptions from ``plan_chunks``
+        chunk_segments: Segments recognised for each chunk, in the same order
+
+    Returns:
+        Tuple of combined transcript text and merged segments
+    """
+    merged: List[Dict[str, Any]] = []
+    last_index = len(chunks) - 1
+
+    for index, (chunk, segments) in enumerate(zip(chunks, chunk_segments, strict=True)):
+        offset = chunk["start_seconds"]
+        core_start = chunk["core_start_seconds"] if index > 0 else float("-inf")
+        core_end = chunk["core_end_seconds"] if index < last_index else float("inf")
+
+        for segment in segments:
+            words = segment.get("words") or []
+
+            if not words:
+                # Without word timings fall back to the segment timing
+                start = _shift(segment.get("start_seconds"), offset)
+                end = _shift(segment.get("end_seconds"), offset)
+                if start is not None and end is not None and not core_start <= (start + end) / 2 < core_end:
+                    continue
+                merged.append({**segment, "start_seconds": start, "end_seconds": end})
+                continue
+
+            kept_words = []
+            for word in words:
+                word_start = _shift(word.get("start_seconds"), offset)
+                word_end = _shift(word.get("end_seconds"), offset)
+                anchor: Optional[float]
+                if word_start is not None and word_end is not None:
+                    anchor = (word_start + word_end) / 2
+                else:
+                    anchor = word_start if word_start is not None else word_end
+                if anchor is not None and not core_start <= anchor < core_end:
+                    continue
+                kept_words.append({**word, "start_seconds": word_start, "end_seconds": word_end})
+
+            if not kept_words:
+                continue
+
+            text = segment.get("text") or ""
+            if len(kept_words) != len(words):
+                text = " ".join(word.get("word", "") for word in kept_words).strip()
+
+            merged.append({
+                **segment,
+                "text": text,
+                "words": kept_words,
+                "start_seconds": kept_words[0].get("start_seconds"),
+                "end_seconds": kept_words[-1].get("end_seconds"),
+            })
+
+    for segment_id, segment in enumerate(merged, start=1):
+        segment["segment_id"] = segment_id
+
+    combined_text = " ".join(segment["text"] for segment in merged if segment.get("text")).strip()
+    return combined_text, merged
@@ -0,0 +1,158 @@
+"""Process-wide registry of Google API clients with tuned connection settings."""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from .lazy import Lazy
+
+
+def grpc_channel_options(settings) -> List[Tuple[str, Any]]:
+    """gRPC channel options for the Speech clients.
+
+    Keepalive pings keep idle channels open through load balancers and NAT
+    between jobs, so a new job does not pay for a new TLS handshake. Message
+    sizes are unlimited because inline ``BatchRecognize`` results of long
+    recordings exceed gRPC's 4 MB default.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Channel options as (name, value) pairs
+    """
+    return [
+        ("grpc.max_send_message_length", -1),
+        ("grpc.max_receive_message_length", -1),
+        ("grpc.keepalive_time_ms", settings.grpc_keepalive_seconds * 1000),
+        ("grpc.keepalive_timeout_ms", 20 * 1000),
+        ("grpc.keepalive_permit_without_calls", 1),
+        ("grpc.http2.max_pings_without_data", 0),
+    ]
+
+
+def gcs_pool_size(settings) -> int:
+    """HTTP connections kept per host for GCS, matched to the worker concurrency.
+
+    ``GCS_HTTP_POOL_SIZE=0`` sizes the pool for concurrent jobs, chunk
+    uploads and composite upload parts, so no thread waits for (or discards)
+    a connection; requests' default keeps only 10.
+    """
+    if settings.gcs_http_pool_size > 0:
+        return int(settings.gcs_http_pool_size)
+    return max(
+        10,
+        int(settings.max_concurrent_jobs + settings.chunk_concurrency + settings.composite_upload_concurrency)
+    )
+
+
+def credentials_key(credentials) -> Hashable:
+    """Registry key part identifying credentials (``default`` for ADC)."""
+    if credentials is None:
+        return "default"
+    return (type(credentials).__name__, getattr(credentials, "service_account_email", None) or "default")
+
+
+class ClientRegistry:
+    """Shares one client per (service, region, credentials) in the process.
+
+    Clients are created on first use (recorded in the startup report under
+    ``service``) and reused by every service afterwards, so gRPC channels and
+    HTTP connection pools, with their TLS sessions, are shared.
+    """
+
+    def __init__(self) -> None:
+        self._clients: Dict[Tuple[str, Optional[str], Hashable], Lazy] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        service: str,
+        factory: Callable[[], Any],
+        region: Optional[str] = None,
+        credentials: Hashable = "default"
+    ) -> Any:
+        """Return the shared client, creating it with ``factory`` on first use.
+
+        Args:
+            service: Service name, e.g. ``speech_v2`` or ``storage``
+            factory: Zero-argument callable creating the client
+            region: Region of a regional endpoint, if any
+            credentials: Key identifying the credentials (see ``credentials_key``)
+
+        Returns:
+            The shared client
+        """
+        key = (service, region, credentials)
+        with self._lock:
+            lazy = self._clients.get(key)
+            if lazy is None:
+                component = service if region is None else f"{service}:{region}"
+                lazy = self._clients[key] = Lazy(component, factory)
+        return lazy.get()
+
+    def keys(self) -> List[Tuple[str, Optional[str], Hashable]]:
+        """Keys of the clients created so far."""
+        with self._lock:
+            return [key for key, lazy in self._clients.items() if lazy.initialized]
+
+
+# Clients shared by all services of this process
+registry = ClientRegistry()
+
+
+def speech_v2_client(settings, location: str):
+    """Shared async Speech v2 client for a regional endpoint.
+
+    Must be called from the event loop thread, as the gRPC channel binds to it.
+    """
+    def create():
+        from google.cloud.speech_v2 import SpeechAsyncClient
+        from google.cloud.speech_v2.services.speech.transports.grpc_asyncio import (
+            SpeechGrpcAsyncIOTransport,
+        )
+
+        host = f"{location}-speech.googleapis.com"
+        channel = SpeechGrpcAsyncIOTransport.create_channel(f"{host}:443", options=grpc_channel_options(settings))
+        return SpeechAsyncClient(transport=SpeechGrpcAsyncIOTransport(host=host, channel=channel))
+
+    return registry.get("speech_v2", create, region=location)
+
+
+def speech_v1_client(settings):
+    """Shared async Speech v1 client (global endpoint), for the v1 fallback."""
+    def create():
+        from google.cloud import speech
+        from google.cloud.speech_v1.services.speech.transports.grpc_asyncio import (
+            SpeechGrpcAsyncIOTransport,
+        )
+
+        host = "speech.googleapis.com"
+        channel = SpeechGrpcAsyncIOTransport.create_channel(f"{host}:443", options=grpc_channel_options(settings))
+        return speech.SpeechAsyncClient(transport=SpeechGrpcAsyncIOTransport(host=host, channel=channel))
+
+    return registry.get("speech_v1", create)
+
+
+def storage_client(settings, project: Optional[str], credentials):
+    """Shared GCS client whose HTTP connection pool fits the worker concurrency.
+
+    Args:
+        settings: Application settings
+        project: GCP project ID
+        credentials: Credentials for the client
+
+    Returns:
+        Shared ``storage.Client``
+    """
+    def create():
+        import requests  # type: ignore[import-untyped]
+        from google.auth.transport.requests import AuthorizedSession
+        from google.cloud import storage
+
+        pool_size = gcs_pool_size(settings)
+        session = AuthorizedSession(credentials)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        return storage.Client(project=project, credentials=credentials, _http=session)
+
+    return registry.get("storage", create, credentials=credentials_key(credentials))
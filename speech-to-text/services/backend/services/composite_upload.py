@@ -0,0 +1,115 @@
+"""Parallel composite uploads: a file is uploaded as parts and composed in GCS."""
+
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# GCS composes at most 32 source objects per request
+MAX_COMPOSE_SOURCES = 32
+
+PARTS_PREFIX = "composite-parts/"
+
+
+def plan_parts(file_size: int, max_parts: int, min_part_bytes: int) -> List[Tuple[int, int]]:
+    """Split a file into parts of (almost) equal size.
+
+    Args:
+        file_size: File size in bytes
+        max_parts: Most parts to use
+        min_part_bytes: Smallest part size; small files get fewer parts
+
+    Returns:
+        (offset, size) per part, in file order
+    """
+    if file_size <= 0:
+        return [(0, 0)]
+    count = max(1, min(max_parts, file_size // max(1, min_part_bytes)))
+    part_size = -(-file_size // count)
+    return [
+        (offset, min(part_size, file_size - offset))
+        for offset in range(0, file_size, part_size)
+    ]
+
+
+def part_name(upload_id: str, index: int) -> str:
+    """Name of the temporary object holding one part."""
+    return f"{PARTS_PREFIX}{upload_id}/{index:05d}"
+
+
+def missing_parts(parts: Sequence[Sequence[int]], uploaded: Dict[str, int], upload_id: str) -> List[int]:
+    """Indexes of parts that were not uploaded or have the wrong size.
+
+    Args:
+        parts: Planned (offset, size) per part
+        uploaded: Size of each uploaded part object, by object name
+        upload_id: Composite upload ID
+
+    Returns:
+        Part indexes that still need to be uploaded
+    """
+    return [
+        index for index, (_, size) in enumerate(parts)
+        if uploaded.get(part_name(upload_id, index)) != size
+    ]
+
+
+def compose_objects(bucket, destination_name: str, source_names: Sequence[str], content_type: Optional[str] = None):
+    """Compose source objects into one object, in order (blocking).
+
+    More than 32 sources are composed in rounds, appending up to 31 sources
+    to the partial destination each round.
+
+    Args:
+        bucket: Bucket holding the sources and the destination
+        destination_name: Name of the composed object
+        source_names: Source object names in order
+        content_type: Content type of the composed object
+
+    Returns:
+        The composed blob
+    """
+    destination = bucket.blob(destination_name)
+    if content_type:
+        destination.content_type = content_type
+
+    names = list(source_names)
+    destination.compose([bucket.blob(name) for name in names[:MAX_COMPOSE_SOURCES]])
+    names = names[MAX_COMPOSE_SOURCES:]
+    while names:
+        batch, names = names[:MAX_COMPOSE_SOURCES - 1], names[MAX_COMPOSE_SOURCES - 1:]
+        destination.compose([destination] + [bucket.blob(name) for name in batch])
+    return destination
+
+
+class RangeReader:
+    """Read-only file view of one byte range of a file descriptor.
+
+    Reads use ``os.pread``, so several readers can upload different parts of
+    the same file from separate threads.
+    """
+
+    def __init__(self, fd: int, offset: int, size: int):
+        self._fd = fd
+        self._offset = offset
+        self._size = size
+        self._position = 0
+
+    def read(self, size: int = -1) -> bytes:
+        remaining = self._size - self._position
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        if size <= 0:
+            return b""
+        data = os.pread(self._fd, size, self._offset + self._position)
+        self._position += len(data)
+        return data
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self._size
+        self._position = min(max(offset, 0), self._size)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
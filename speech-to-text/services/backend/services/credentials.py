@@ -0,0 +1,131 @@
+"""Signing credentials with cached tokens refreshed in the background."""
+
+import asyncio
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from google.auth.transport.requests import Request
+
+
+class SigningCredentialManager:
+    """Keeps signing credentials valid without refreshing them per request.
+
+    The first use refreshes the credentials if they have no valid token and
+    starts a background task that refreshes them ``refresh_margin_seconds``
+    before they expire. Signing requests then use the cached credentials
+    directly, so a service-account key signs locally without any network
+    round-trip. Only when the background refresh has fallen behind does a
+    request refresh the credentials itself (once, shared by all waiters).
+    """
+
+    def __init__(
+        self,
+        credentials_provider: Callable[[], Any],
+        refresh_margin_seconds: float = 300.0,
+        retry_seconds: float = 30.0
+    ):
+        """Initialize the manager.
+
+        Args:
+            credentials_provider: Returns the signing credentials (may be lazy)
+            refresh_margin_seconds: Refresh this long before the token expires
+            retry_seconds: Delay before retrying a failed background refresh
+        """
+        self._provider = credentials_provider
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.retry_seconds = retry_seconds
+        self._request = Request()
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stopped = False
+        self.refresh_count = 0
+        self.last_refresh_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+
+    def _seconds_until_expiry(self, credentials) -> Optional[float]:
+        expiry: Optional[datetime] = getattr(credentials, "expiry", None)
+        if expiry is None:
+            return None
+        return (expiry - datetime.utcnow()).total_seconds()
+
+    def _needs_refresh(self, credentials) -> bool:
+        if not hasattr(credentials, "refresh"):
+            return False
+        if getattr(credentials, "token", None) is None:
+            return True
+        remaining = self._seconds_until_expiry(credentials)
+        return remaining is not None and remaining <= self.refresh_margin_seconds
+
+    def _refresh(self, credentials) -> None:
+        """Refresh the credentials unless another thread just did (blocking)."""
+        with self._lock:
+            if not self._needs_refresh(credentials):
+                return
+            try:
+                credentials.refresh(self._request)
+            except Exception as exc:
+                self.last_error = str(exc)
+                raise
+            self.refresh_count += 1
+            self.last_refresh_at = datetime.utcnow()
+            self.last_error = None
+
+    async def get(self):
+        """Return signing credentials with a valid token.
+
+        Returns:
+            Signing credentials, or None when none are configured
+        """
+        credentials = self._provider()
+        if credentials is None:
+            return None
+
+        if self._task is None and not self._stopped:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+        if self._needs_refresh(credentials):
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, self._refresh, credentials)
+        return credentials
+
+    async def _refresh_loop(self) -> None:
+        loop = asyncio.get_event_loop()
+        while True:
+            credentials = self._provider()
+            remaining = self._seconds_until_expiry(credentials) if credentials is not None else None
+            if remaining is None:
+                # Credentials without an expiry (e.g. not refreshed yet) are checked again later
+                delay = self.refresh_margin_seconds
+            else:
+                delay = max(remaining - self.refresh_margin_seconds, 5.0)
+            await asyncio.sleep(delay)
+
+            credentials = self._provider()
+            if credentials is None or not hasattr(credentials, "refresh"):
+                continue
+            try:
+                await loop.run_in_executor(None, self._refresh, credentials)
+            except Exception as exc:
+                print(f"Background refresh of signing credentials failed: {exc}")
+                await asyncio.sleep(self.retry_seconds)
+
+    async def stop(self) -> None:
+        """Stop the background refresh task."""
+        self._stopped = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Refresh counters, for monitoring."""
+        return {
+            "refresh_count": self.refresh_count,
+            "last_refresh_at": self.last_refresh_at.isoformat() if self.last_refresh_at else None,
+            "last_error": self.last_error,
+            "background_refresh": self._task is not None and not self._task.done(),
+        }
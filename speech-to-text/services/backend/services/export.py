@@ -0,0 +1,313 @@
+"""Streaming transcript export to SRT, WebVTT, plain text and JSON."""
+
+import re
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .serialization import dumps
+
+EXPORT_FORMATS: Dict[str, Tuple[str, str]] = {
+    "srt": ("application/x-subrip", "srt"),
+    "vtt": ("text/vtt", "vtt"),
+    "txt": ("text/plain", "txt"),
+    "json": ("application/json", "json"),
+}
+
+# Output is sent in chunks of about this size instead of one write per cue
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# "Speaker: text" paragraphs of a speaker-identified transcript
+_SPEAKER_TURN = re.compile(r"^([^:\n]{1,60}):\s*(.*)$", re.DOTALL)
+
+WordsProvider = Callable[[int], List[Dict[str, Any]]]
+
+
+def _field(segment: Any, name: str) -> Any:
+    if isinstance(segment, dict):
+        return segment.get(name)
+    return getattr(segment, name, None)
+
+
+def _wrap(words: Sequence[str], max_chars: int) -> List[str]:
+    """Greedily wrap words into lines of at most ``max_chars`` characters."""
+    lines: List[str] = []
+    current = ""
+    for word in words:
+        if current and len(current) + 1 + len(word) > max_chars:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        lines.append(current)
+    return lines
+
+
+def speaker_turns(speaker_transcript: Optional[str]) -> List[Tuple[str, int]]:
+    """Split a speaker-identified transcript into (speaker, word count) turns."""
+    turns: List[Tuple[str, int]] = []
+    for paragraph in (speaker_transcript or "").split("\n\n"):
+        match = _SPEAKER_TURN.match(paragraph.strip())
+        if match:
+            turns.append((match.group(1).strip(), len(match.group(2).split())))
+    return turns
+
+
+def segment_speakers(
+    segments: Sequence[Any],
+    speaker_transcript: Optional[str]
+) -> Optional[List[Optional[str]]]:
+    """Assign a speaker to each segment from the speaker-identified transcript.
+
+    The speaker-identified text is a lightly refined copy of the transcript,
+    so turns are aligned to segments by relative word position.
+
+    Args:
+        segments: Transcript segments
+        speaker_transcript: Transcript with ``Speaker: text`` paragraphs
+
+    Returns:
+        Speaker per segment, or None if no speaker turns are available
+    """
+    turns = speaker_turns(speaker_transcript)
+    turn_words = sum(count for _, count in turns)
+    if not turns or not turn_words:
+        return None
+
+    segment_words = [len((_field(segment, "text") or "").split()) for segment in segments]
+    total_words = sum(segment_words) or 1
+    scale = turn_words / total_words
+
+    speakers: List[Optional[str]] = []
+    turn_index = 0
+    turn_end = turns[0][1]
+    position = 0
+    for count in segment_words:
+        # Attribute each segment to the turn containing its middle word
+        middle = (position + count / 2) * scale
+        while middle >= turn_end and turn_index < len(turns) - 1:
+            turn_index += 1
+            turn_end += turns[turn_index][1]
+        speakers.append(turns[turn_index][0])
+        position += count
+    return speakers
+
+
+def iter_cues(
+    segments: Sequence[Any],
+    words_for: WordsProvider,
+    max_chars_per_line: int = 42,
+    max_lines: int = 2,
+    max_cue_seconds: float = 6.0,
+    speakers: Optional[Sequence[Optional[str]]] = None
+) -> Iterator[Dict[str, Any]]:
+    """Re-flow transcript segments into subtitle cues.
+
+    Cues are cut from word timings so that they fit ``max_lines`` lines of
+    ``max_chars_per_line`` characters and last at most ``max_cue_seconds``.
+    Segments without word timings are split by text length over the segment
+    time instead. Cues never span segments, so speaker changes stay intact.
+
+    Args:
+        segments: Transcript segments (pydantic models or dicts)
+        words_for: Returns the word dicts of the segment at an index
+        max_chars_per_line: Maximum characters on one cue line
+        max_lines: Maximum lines per cue
+        max_cue_seconds: Maximum cue duration in seconds
+        speakers: Optional speaker label per segment
+
+    Yields:
+        Cues with ``start``, ``end``, ``lines`` and ``speaker``
+    """
+    max_chars = max_chars_per_line * max_lines
+
+    for index, segment in enumerate(segments):
+        speaker = speakers[index] if speakers and index < len(speakers) else None
+        segment_start = _field(segment, "start_seconds") or 0.0
+        segment_end = _field(segment, "end_seconds")
+        if segment_end is None or segment_end < segment_start:
+            segment_end = segment_start
+
+        words = [
+            word for word in words_for(index)
+            if word.get("word") and word.get("start_seconds") is not None and word.get("end_seconds") is not None
+        ]
+
+        if not words:
+            text_words = (_field(segment, "text") or "").split()
+            if not text_words:
+                continue
+            lines = _wrap(text_words, max_chars_per_line)
+            total_chars = sum(len(line) for line in lines) or 1
+            duration = segment_end - segment_start
+            start = segment_start
+            for first in range(0, len(lines), max_lines):
+                cue_lines = lines[first:first + max_lines]
+                end = start + duration * sum(len(line) for line in cue_lines) / total_chars
+                yield {"start": start, "end": end, "lines": cue_lines, "speaker": speaker}
+                start = end
+            continue
+
+        cue_words: List[str] = []
+        cue_start = words[0]["start_seconds"]
+        cue_end = cue_start
+        cue_chars = 0
+        for word in words:
+            text = word["word"]
+            added = len(text) + (1 if cue_words else 0)
+            too_long = cue_chars + added > max_chars or len(_wrap(cue_words + [text], max_chars_per_line)) > max_lines
+            if cue_words and (too_long or word["end_seconds"] - cue_start > max_cue_seconds):
+                yield {"start": cue_start, "end": cue_end, "lines": _wrap(cue_words, max_chars_per_line), "speaker": speaker}
+                cue_words = []
+                cue_start = word["start_seconds"]
+                cue_chars = 0
+                added = len(text)
+            cue_words.append(text)
+            cue_chars += added
+            cue_end = max(cue_end, word["end_seconds"])
+        if cue_words:
+            yield {"start": cue_start, "end": cue_end, "lines": _wrap(cue_words, max_chars_per_line), "speaker": speaker}
+
+
+def format_timestamp(seconds: float, separator: str) -> str:
+    """Format seconds as ``HH:MM:SS<separator>mmm``."""
+    millis = int(round(max(seconds, 0.0) * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def iter_srt(cues: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Render cues as SubRip (SRT)."""
+    for number, cue in enumerate(cues, start=1):
+        lines = list(cue["lines"])
+        if cue["speaker"]:
+            lines[0] = f"{cue['speaker']}: {lines[0]}"
+        yield (
+            f"{number}\n"
+            f"{format_timestamp(cue['start'], ',')} --> {format_timestamp(cue['end'], ',')}\n"
+            + "\n".join(lines)
+            + "\n\n"
+        )
+
+
+def _escape_vtt(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def iter_vtt(cues: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Render cues as WebVTT, with speakers as voice spans."""
+    yield "WEBVTT\n\n"
+    for cue in cues:
+        lines = [_escape_vtt(line) for line in cue["lines"]]
+        if cue["speaker"]:
+            lines[0] = f"<v {_escape_vtt(cue['speaker'])}>{lines[0]}"
+        yield (
+            f"{format_timestamp(cue['start'], '.')} --> {format_timestamp(cue['end'], '.')}\n"
+            + "\n".join(lines)
+            + "\n\n"
+        )
+
+
+def iter_txt(
+    segments: Sequence[Any],
+    speakers: Optional[Sequence[Optional[str]]] = None
+) -> Iterator[str]:
+    """Render segments as plain text, starting a paragraph per speaker turn."""
+    previous_speaker: Optional[str] = None
+    for index, segment in enumerate(segments):
+        text = (_field(segment, "text") or "").strip()
+        if not text:
+            continue
+        speaker = speakers[index] if speakers and index < len(speakers) else None
+        if speaker and speaker != previous_speaker:
+            prefix = "\n" if previous_speaker else ""
+            yield f"{prefix}{speaker}:\n"
+            previous_speaker = speaker
+        yield text + "\n"
+
+
+def iter_json(
+    job_id: str,
+    segments: Sequence[Any],
+    words_for: WordsProvider,
+    speakers: Optional[Sequence[Optional[str]]] = None
+) -> Iterator[bytes]:
+    """Render segments as a JSON document, one segment at a time."""
+    yield b'{"job_id":' + dumps(job_id) + b',"transcript_segments":['
+    for index, segment in enumerate(segments):
+        view = segment.model_dump() if hasattr(segment, "model_dump") else dict(segment)
+        if not view.get("words"):
+            view["words"] = words_for(index) or None
+        if speakers:
+            view["speaker"] = speakers[index] if index < len(speakers) else None
+        yield (b"," if index else b"") + dumps(view)
+    yield b"]}"
+
+
+def buffered(chunks: Iterable[Any], chunk_bytes: int = STREAM_CHUNK_BYTES) -> Iterator[bytes]:
+    """Encode and join small output pieces into chunks of about ``chunk_bytes``."""
+    buffer: List[bytes] = []
+    size = 0
+    for chunk in chunks:
+        data = chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+        buffer.append(data)
+        size += len(data)
+        if size >= chunk_bytes:
+            yield b"".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def export_transcript(
+    export_format: str,
+    job_id: str,
+    segments: Sequence[Any],
+    words_for: WordsProvider,
+    speakers: Optional[Sequence[Optional[str]]] = None,
+    max_chars_per_line: int = 42,
+    max_cue_seconds: float = 6.0
+) -> Iterator[bytes]:
+    """Stream a transcript in one of ``EXPORT_FORMATS``.
+
+    Args:
+        export_format: ``srt``, ``vtt``, ``txt`` or ``json``
+        job_id: Unique job identifier
+        segments: Transcript segments
+        words_for: Returns the word dicts of the segment at an index
+        speakers: Optional speaker label per segment
+        max_chars_per_line: Maximum characters per subtitle line
+        max_cue_seconds: Maximum subtitle cue duration in seconds
+
+    Returns:
+        Iterator of encoded output chunks
+    """
+    pieces: Iterable[Any]
+    if export_format in ("srt", "vtt"):
+        cues = iter_cues(
+            segments,
+            words_for,
+            max_chars_per_line=max_chars_per_line,
+            max_cue_seconds=max_cue_seconds,
+            speakers=speakers
+        )
+        pieces = iter_srt(cues) if export_format == "srt" else iter_vtt(cues)
+    elif export_format == "txt":
+        pieces = iter_txt(segments, speakers)
+    elif export_format == "json":
+        pieces = iter_json(job_id, segments, words_for, speakers)
+    else:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    return buffered(pieces)
@@ -0,0 +1,442 @@
+"""Job status storage backends (in-memory and Redis)."""
+
+import json
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from pydantic_core import to_jsonable_python
+
+from models import JobStatus
+
+from .word_store import WordStore
+
+# Fields that can grow to megabytes for long recordings. They are stored in
+# their own Redis keys so status polls only have to touch the small hash.
+LARGE_FIELDS = (
+    "transcript",
+    "transcript_segments",
+    "speaker_identified_transcript",
+    "speaker_identification_summary",
+    "refined_transcript",
+    "transcript_words",
+    "result_payload",
+)
+
+# Large fields stored as raw bytes instead of JSON, with their (encode, decode)
+BINARY_FIELDS: Dict[str, Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+    "transcript_words": (WordStore.to_bytes, WordStore.from_bytes),
+    "result_payload": (bytes, bytes),
+}
+
+
+class JobStore:
+    """Interface for persisting transcription job status."""
+
+    async def create(self, job: JobStatus) -> None:
+        """Store a new job.
+
+        Args:
+            job: Job status to store
+        """
+        raise NotImplementedError
+
+    async def get(
+        self,
+        job_id: str,
+        include_results: Union[bool, Iterable[str]] = True
+    ) -> Optional[JobStatus]:
+        """Load a job.
+
+        Args:
+            job_id: Job identifier
+            include_results: Whether to load the large result fields, or the
+                names of the large result fields to load
+
+        Returns:
+            Job status, or None if the job does not exist or has expired
+        """
+        raise NotImplementedError
+
+    async def update(self, job_id: str, **fields: Any) -> None:
+        """Update a subset of job fields and increment the job version.
+
+        Updates to a job that does not exist (never created, expired or
+        deleted) are ignored, so a job deleted while it runs stays deleted.
+
+        Args:
+            job_id: Job identifier
+            **fields: JobStatus field values to set
+        """
+        raise NotImplementedError
+
+    async def cache_result_payload(self, job_id: str, payload: bytes, version: int) -> None:
+        """Attach the serialized result of a completed job.
+
+        Unlike ``update`` this does not change the job version, and the
+        payload is dropped again by the next ``update``. Nothing is stored
+        when the job was updated after the payload was rendered.
+
+        Args:
+            job_id: Job identifier
+            payload: Gzip-compressed JSON of the full status response
+            version: Job version the payload was rendered from
+        """
+        raise NotImplementedError
+
+    async def delete(self, job_id: str) -> bool:
+        """Delete a job.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            True if the job existed, False otherwise
+        """
+        raise NotImplementedError
+
+    async def exists(self, job_id: str) -> bool:
+        """Check whether a job exists."""
+        return await self.get(job_id, include_results=False) is not None
+
+    async def close(self) -> None:
+        """Release backend resources."""
+        return None
+
+
+class InMemoryJobStore(JobStore):
+    """Process-local job store with TTL-based eviction."""
+
+    SWEEP_INTERVAL_SECONDS = 60
+
+    def __init__(self, ttl_seconds: int):
+        """Initialize the in-memory store.
+
+        Args:
+            ttl_seconds: Seconds a job is kept after its last update
+        """
+        self.ttl_seconds = ttl_seconds
+        self._jobs: Dict[str, JobStatus] = {}
+        self._expires_at: Dict[str, float] = {}
+        self._next_sweep = time.monotonic() + self.SWEEP_INTERVAL_SECONDS
+
+    def _touch(self, job_id: str) -> None:
+        self._expires_at[job_id] = time.monotonic() + self.ttl_seconds
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + self.SWEEP_INTERVAL_SECONDS
+
+        expired = [job_id for job_id, expires_at in self._expires_at.items() if expires_at <= now]
+        for job_id in expired:
+            self._jobs.pop(job_id, None)
+            self._expires_at.pop(job_id, None)
+
+    async def create(self, job: JobStatus) -> None:
+        self._evict_expired()
+        self._jobs[job.job_id] = job
+        self._touch(job.job_id)
+
+    async def get(
+        self,
+        job_id: str,
+        include_results: Union[bool, Iterable[str]] = True
+    ) -> Optional[JobStatus]:
+        expires_at = self._expires_at.get(job_id)
+        if expires_at is None:
+            return None
+
+        if expires_at <= time.monotonic():
+            self._jobs.pop(job_id, None)
+            self._expires_at.pop(job_id, None)
+            return None
+
+        return self._jobs.get(job_id)
+
+    async def update(self, job_id: str, **fields: Any) -> None:
+        job = self._jobs.get(job_id)
+        if job is None or self._expires_at[job_id] <= time.monotonic():
+            return
+
+        for key, value in fields.items():
+            setattr(job, key, value)
+        job.result_payload = None
+        job.version += 1
+        self._touch(job_id)
+
+    async def cache_result_payload(self, job_id: str, payload: bytes, version: int) -> None:
+        job = self._jobs.get(job_id)
+        if job is not None and job.version == version:
+            job.result_payload = payload
+
+    async def delete(self, job_id: str) -> bool:
+        self._expires_at.pop(job_id, None)
+        return self._jobs.pop(job_id, None) is not None
+
+
+class RedisJobStore(JobStore):
+    """Redis-backed job store shared between workers and instances.
+
+    Each job is stored as a hash of small, JSON-encoded status fields under
+    ``{prefix}{job_id}`` plus one string key per large result field under
+    ``{prefix}{job_id}:{field}``. Reads are pipelined and writes run as one
+    transaction or Lua script, so that each operation costs a single
+    round-trip, and every write refreshes the TTL of all keys belonging to
+    the job.
+    """
+
+    # KEYS: status hash, then the LARGE_FIELDS keys in order.
+    # ARGV: TTL; count and field/value pairs to set in the hash; count and
+    # names of hash fields to delete; then per large field an operation
+    # ("set", "del" or "keep") and its value.
+    UPDATE_SCRIPT = """
+    if redis.call("EXISTS", KEYS[1]) == 0 then
+        return 0
+    end
+    local ttl = tonumber(ARGV[1])
+    local i = 2
+
+    local count = tonumber(ARGV[i])
+    if count > 0 then
+        redis.call("HSET", KEYS[1], unpack(ARGV, i + 1, i + 2 * count))
+    end
+    i = i + 1 + 2 * count
+
+    count = tonumber(ARGV[i])
+    if count > 0 then
+        redis.call("HDEL", KEYS[1], unpack(ARGV, i + 1, i + count))
+    end
+    i = i + 1 + count
+
+    for k = 2, #KEYS do
+        if ARGV[i] == "set" then
+            redis.call("SET", KEYS[k], ARGV[i + 1], "EX", ttl)
+        elseif ARGV[i] == "del" then
+            redis.call("DEL", KEYS[k])
+        end
+        i = i + 2
+    end
+
+    local version = redis.call("HINCRBY", KEYS[1], "version", 1)
+    for k = 1, #KEYS do
+        redis.call("EXPIRE", KEYS[k], ttl)
+    end
+    return version
+    """
+
+    # KEYS: status hash, payload key. ARGV: payload, job version it was rendered from.
+    CACHE_PAYLOAD_SCRIPT = """
+    if redis.call("HGET", KEYS[1], "version") ~= ARGV[2] then
+        return 0
+    end
+    local ttl = redis.call("TTL", KEYS[1])
+    if ttl <= 0 then
+        return 0
+    end
+    redis.call("SET", KEYS[2], ARGV[1], "EX", ttl)
+    return 1
+    """
+
+    def __init__(self, client, ttl_seconds: int, key_prefix: str = "job:"):
+        """Initialize the Redis store.
+
+        Args:
+            client: ``redis.asyncio`` compatible client
+            ttl_seconds: Seconds a job is kept after its last update
+            key_prefix: Prefix for all job keys
+        """
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+        # Sent with EVALSHA, falling back to EVAL when Redis does not know the script
+        self._update_script = client.register_script(self.UPDATE_SCRIPT)
+        self._cache_payload_script = client.register_script(self.CACHE_PAYLOAD_SCRIPT)
+
+    def _status_key(self, job_id: str) -> str:
+        return f"{self.key_prefix}{job_id}"
+
+    def _field_key(self, job_id: str, field: str) -> str:
+        return f"{self.key_prefix}{job_id}:{field}"
+
+    def _all_keys(self, job_id: str) -> List[str]:
+        return [self._status_key(job_id)] + [self._field_key(job_id, field) for field in LARGE_FIELDS]
+
+    @staticmethod
+    def _encode(value: Any) -> str:
+        return json.dumps(to_jsonable_python(value), ensure_ascii=False)
+
+    @staticmethod
+    def _decode(value: Any) -> Any:
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return json.loads(value)
+
+    def _encode_large(self, key: str, value: Any) -> Union[str, bytes]:
+        if key in BINARY_FIELDS:
+            encode, _ = BINARY_FIELDS[key]
+            return encode(value)
+        return self._encode(value)
+
+    def _queue_write(self, pipe, job_id: str, fields: Dict[str, Any]) -> None:
+        """Queue the commands that persist ``fields`` on a pipeline."""
+        status_key = self._status_key(job_id)
+        small_values: Dict[str, str] = {}
+        cleared: List[str] = []
+
+        for key, value in fields.items():
+            if key in LARGE_FIELDS:
+                field_key = self._field_key(job_id, key)
+                if value is None:
+                    pipe.delete(field_key)
+                else:
+                    pipe.set(field_key, self._encode_large(key, value), ex=self.ttl_seconds)
+            elif value is None:
+                cleared.append(key)
+            else:
+                small_values[key] = self._encode(value)
+
+        if small_values:
+            pipe.hset(status_key, mapping=small_values)
+        if cleared:
+            pipe.hdel(status_key, *cleared)
+
+        for key in self._all_keys(job_id):
+            pipe.expire(key, self.ttl_seconds)
+
+    def _update_args(self, fields: Dict[str, Any]) -> List[Union[str, bytes, int]]:
+        """Arguments of ``UPDATE_SCRIPT`` that persist ``fields``."""
+        small_values: List[Union[str, bytes, int]] = []
+        cleared: List[Union[str, bytes, int]] = []
+        for key, value in fields.items():
+            if key in LARGE_FIELDS:
+                continue
+            if value is None:
+                cleared.append(key)
+            else:
+                small_values.extend((key, self._encode(value)))
+
+        large_ops: List[Union[str, bytes, int]] = []
+        for key in LARGE_FIELDS:
+            if key not in fields:
+                large_ops.extend(("keep", ""))
+            elif fields[key] is None:
+                large_ops.extend(("del", ""))
+            else:
+                large_ops.extend(("set", self._encode_large(key, fields[key])))
+
+        return [
+            self.ttl_seconds,
+            len(small_values) // 2, *small_values,
+            len(cleared), *cleared,
+            *large_ops,
+        ]
+
+    async def create(self, job: JobStatus) -> None:
+        fields = {key: getattr(job, key) for key in JobStatus.model_fields}
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(*self._all_keys(job.job_id))
+            self._queue_write(pipe, job.job_id, fields)
+            await pipe.execute()
+
+    async def get(
+        self,
+        job_id: str,
+        include_results: Union[bool, Iterable[str]] = True
+    ) -> Optional[JobStatus]:
+        if include_results is True:
+            result_fields = list(LARGE_FIELDS)
+        elif include_results is False:
+            result_fields = []
+        else:
+            result_fields = [field for field in include_results if field in LARGE_FIELDS]
+
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hgetall(self._status_key(job_id))
+            if result_fields:
+                pipe.mget([self._field_key(job_id, field) for field in result_fields])
+            replies = await pipe.execute()
+
+        raw_status = replies[0]
+        if not raw_status:
+            return None
+
+        data: Dict[str, Any] = {}
+        for key, value in raw_status.items():
+            if isinstance(key, bytes):
+                key = key.decode("utf-8")
+            data[key] = self._decode(value)
+
+        if result_fields:
+            for field, value in zip(result_fields, replies[1], strict=True):
+                if value is None:
+                    continue
+                if field in BINARY_FIELDS:
+                    _, decode = BINARY_FIELDS[field]
+                    data[field] = decode(value)
+                else:
+                    data[field] = self._decode(value)
+
+        return JobStatus.model_validate(data)
+
+    async def update(self, job_id: str, **fields: Any) -> None:
+        if not fields:
+            return
+        fields.pop("version", None)
+        fields.setdefault("result_payload", None)
+        # The script skips missing jobs, which would otherwise be left as a partial hash
+        await self._update_script(keys=self._all_keys(job_id), args=self._update_args(fields))
+
+    async def cache_result_payload(self, job_id: str, payload: bytes, version: int) -> None:
+        await self._cache_payload_script(
+            keys=[self._status_key(job_id), self._field_key(job_id, "result_payload")],
+            args=[payload, version]
+        )
+
+    async def delete(self, job_id: str) -> bool:
+        deleted = await self.client.delete(*self._all_keys(job_id))
+        return bool(deleted)
+
+    async def exists(self, job_id: str) -> bool:
+        return bool(await self.client.exists(self._status_key(job_id)))
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def create_redis_client(settings):
+    """Create the async Redis client selected by the settings.
+
+    ``JOB_STORE_BACKEND=fakeredis`` returns an in-process fakeredis instance
+    (dev dependency) so the Redis code path can be exercised without a server.
+    """
+    if settings.job_store_backend == "fakeredis":
+        from fakeredis import FakeAsyncRedis
+
+        return FakeAsyncRedis()
+
+    import redis.asyncio as redis
+
+    return redis.Redis(
+        host=settings.redis_host or "localhost",
+        port=settings.redis_port,
+        db=settings.redis_db,
+    )
+
+
+def create_job_store(settings) -> JobStore:
+    """Create the job store configured in the settings.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Configured job store
+    """
+    ttl_seconds = settings.job_ttl_hours * 3600
+    backend = settings.job_store_backend
+
+    if backend in ("redis", "fakeredis"):
+        return RedisJobStore(create_redis_client(settings), ttl_seconds)
+
+    return InMemoryJobStore(ttl_seconds)
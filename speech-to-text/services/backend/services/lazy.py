@@ -0,0 +1,87 @@
+"""Thread-safe lazy initialization of expensive clients with timing report."""
+
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Generic, Iterator, Optional, TypeVar, cast
+
+T = TypeVar("T")
+
+# Initialization timings of every lazy component, keyed by component name
+_init_report: Dict[str, Dict[str, Any]] = {}
+_report_lock = threading.Lock()
+
+
+def record_init(component: str, seconds: float, error: Optional[str] = None) -> None:
+    """Record how long a component took to initialize.
+
+    Args:
+        component: Component name
+        seconds: Initialization time in seconds
+        error: Error message if initialization failed
+    """
+    with _report_lock:
+        _init_report[component] = {
+            "seconds": round(seconds, 4),
+            "initialized_at": datetime.utcnow().isoformat(),
+            "error": error,
+        }
+
+
+@contextmanager
+def timed_init(component: str) -> Iterator[None]:
+    """Record the initialization time of the code run inside the block.
+
+    Args:
+        component: Component name
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as exc:
+        record_init(component, time.perf_counter() - started, str(exc))
+        raise
+    record_init(component, time.perf_counter() - started)
+
+
+def get_init_report() -> Dict[str, Dict[str, Any]]:
+    """Initialization timings of all components created so far."""
+    with _report_lock:
+        return {component: dict(entry) for component, entry in _init_report.items()}
+
+
+class Lazy(Generic[T]):
+    """Create a value on first use, exactly once, from any thread.
+
+    Failed initializations are not cached, so the next access retries.
+    """
+
+    def __init__(self, component: str, factory: Callable[[], T]):
+        """Initialize the lazy value.
+
+        Args:
+            component: Name used in the initialization report
+            factory: Zero-argument callable creating the value
+        """
+        self.component = component
+        self._factory = factory
+        self._value: Optional[T] = None
+        self._initialized = False
+        self._lock = threading.Lock()
+
+    @property
+    def initialized(self) -> bool:
+        return self._initialized
+
+    def get(self) -> T:
+        """Return the value, creating it on first use."""
+        if not self._initialized:
+            with self._lock:
+                if not self._initialized:
+                    with timed_init(self.component):
+                        self._value = self._factory()
+                    self._initialized = True
+
+        # The factory may legitimately return None, so the flag, not the value, is checked
+        return cast(T, self._value)
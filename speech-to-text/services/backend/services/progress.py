@@ -0,0 +1,129 @@
+"""Recognition progress tracking with throughput-based ETA estimates."""
+
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# Part of the overall job progress covered by the recognition stage
+RECOGNITION_PROGRESS_RANGE: Tuple[int, int] = (25, 80)
+
+
+def recognition_job_progress(recognition_percent: float) -> int:
+    """Map recognition progress (0-100) onto the overall job progress."""
+    low, high = RECOGNITION_PROGRESS_RANGE
+    percent = min(max(recognition_percent, 0), 100)
+    return int(low + (high - low) * percent / 100)
+
+
+class ThroughputEstimator:
+    """Moving average of recognition speed in seconds of audio per second."""
+
+    def __init__(self, smoothing: float = 0.3):
+        """Initialize the estimator.
+
+        Args:
+            smoothing: Weight of the newest observation
+        """
+        self.smoothing = smoothing
+        self.rate: Optional[float] = None
+
+    def observe(self, audio_seconds: float, elapsed_seconds: float) -> None:
+        """Record a finished recognition."""
+        if audio_seconds <= 0 or elapsed_seconds <= 0:
+            return
+        rate = audio_seconds / elapsed_seconds
+        if self.rate is None:
+            self.rate = rate
+        else:
+            self.rate = self.smoothing * rate + (1 - self.smoothing) * self.rate
+
+    def estimate_seconds(self, audio_seconds: Optional[float]) -> Optional[float]:
+        """Expected recognition time for ``audio_seconds`` of audio, if known."""
+        if not audio_seconds or not self.rate:
+            return None
+        return audio_seconds / self.rate
+
+
+class RecognitionProgress:
+    """Turns Speech operation progress into rate-limited job progress updates.
+
+    The ETA blends the estimate from past throughput with the one implied by
+    the progress of this operation, trusting the latter more as it advances.
+    """
+
+    def __init__(
+        self,
+        publish: Callable[[Dict[str, Any]], Awaitable[None]],
+        throughput: ThroughputEstimator,
+        audio_seconds: Optional[float] = None,
+        min_interval_seconds: float = 2.0
+    ):
+        """Initialize the tracker.
+
+        Args:
+            publish: Coroutine called with the progress fields to store and send
+            throughput: Shared throughput estimator
+            audio_seconds: Duration of the audio being recognised, if known
+            min_interval_seconds: Minimum time between two published updates
+        """
+        self.publish = publish
+        self.throughput = throughput
+        self.audio_seconds = audio_seconds
+        self.min_interval_seconds = min_interval_seconds
+        self.started = time.monotonic()
+        self.expected_seconds = throughput.estimate_seconds(audio_seconds)
+        self._last_percent: Optional[int] = None
+        self._last_published = 0.0
+        self._finished = False
+
+    def _eta_seconds(self, percent: int, elapsed: float) -> Optional[float]:
+        prior = max(self.expected_seconds - elapsed, 0.0) if self.expected_seconds is not None else None
+        if percent <= 0:
+            return prior
+
+        observed = elapsed * (100 - percent) / percent
+        if prior is None:
+            return observed
+
+        weight = min(1.0, percent / 20)
+        return weight * observed + (1 - weight) * prior
+
+    def snapshot(self, percent: int) -> Dict[str, Any]:
+        """Progress fields for a recognition progress percentage."""
+        elapsed = time.monotonic() - self.started
+        eta = self._eta_seconds(percent, elapsed)
+        fields: Dict[str, Any] = {
+            "recognition_progress": percent,
+            "progress": recognition_job_progress(percent),
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+            "estimated_completion_at": datetime.now() + timedelta(seconds=eta) if eta is not None else None,
+        }
+        if self.audio_seconds and percent > 0 and elapsed > 0:
+            fields["audio_seconds_per_second"] = round(self.audio_seconds * percent / 100 / elapsed, 2)
+        return fields
+
+    async def update(self, percent: int) -> None:
+        """Publish new progress unless it is unchanged or too recent."""
+        now = time.monotonic()
+        if percent == self._last_percent:
+            return
+        if self._last_percent is not None and percent < 100 and now - self._last_published < self.min_interval_seconds:
+            return
+
+        self._last_percent = percent
+        self._last_published = now
+        if percent >= 100:
+            self.finish()
+        await self.publish(self.snapshot(percent))
+
+    async def start(self) -> None:
+        """Publish the initial ETA from past throughput."""
+        await self.update(0)
+
+    def finish(self) -> None:
+        """Record the throughput of the finished recognition (once)."""
+        if self._finished:
+            return
+        self._finished = True
+        if self.audio_seconds:
+            self.throughput.observe(self.audio_seconds, time.monotonic() - self.started)
@@ -0,0 +1,261 @@
+"""Publish/subscribe hub for job progress events (in-process or Redis-backed)."""
+
+import asyncio
+import json
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, List, Optional, Set
+
+from redis.asyncio.client import PubSub
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+class Subscription:
+    """Queue of events delivered to one subscriber, de-duplicated by sequence number."""
+
+    MAX_PENDING = 1000
+
+    def __init__(self, last_seq: int = 0):
+        self.last_seq = last_seq
+        self._queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize=self.MAX_PENDING)
+
+    def deliver(self, event: Dict[str, Any]) -> None:
+        """Queue an event unless it was already delivered."""
+        if event["seq"] <= self.last_seq:
+            return
+        self.last_seq = event["seq"]
+
+        if self._queue.full():
+            # A stalled subscriber loses its oldest event; the gap in sequence
+            # numbers tells the client to resume from its last event.
+            self._queue.get_nowait()
+        self._queue.put_nowait(event)
+
+    async def get(self) -> Dict[str, Any]:
+        """Wait for the next event."""
+        return await self._queue.get()
+
+
+class _JobChannel:
+    def __init__(self, history_size: int):
+        self.seq = 0
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self.subscribers: Set[Subscription] = set()
+        self.expiry: Optional[asyncio.TimerHandle] = None
+
+
+class ProgressHub:
+    """In-process hub with many subscribers per job and resumable event history.
+
+    Every published event gets a per-job, monotonically increasing ``seq``. The
+    last ``history_size`` events are kept so a reconnecting client can resume
+    after the last ``seq`` it saw. Subscribers are only woken when an event is
+    published. Channels of finished jobs are dropped ``retention_seconds``
+    after their terminal event once nobody is subscribed.
+    """
+
+    def __init__(self, history_size: int = 100, retention_seconds: int = 3600):
+        self.history_size = history_size
+        self.retention_seconds = retention_seconds
+        self._channels: Dict[str, _JobChannel] = {}
+
+    def _channel(self, job_id: str) -> _JobChannel:
+        channel = self._channels.get(job_id)
+        if channel is None:
+            channel = self._channels[job_id] = _JobChannel(self.history_size)
+        return channel
+
+    async def publish(self, job_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Publish an event for a job.
+
+        Args:
+            job_id: Job identifier
+            data: Event payload
+
+        Returns:
+            The event including its ``seq`` number
+        """
+        channel = self._channel(job_id)
+        channel.seq += 1
+        event = {**data, "job_id": job_id, "seq": channel.seq}
+        self._dispatch(job_id, event)
+        return event
+
+    def _dispatch(self, job_id: str, event: Dict[str, Any]) -> None:
+        """Record an event in the local history and hand it to local subscribers."""
+        channel = self._channel(job_id)
+        channel.seq = max(channel.seq, event["seq"])
+        channel.history.append(event)
+
+        for subscription in list(channel.subscribers):
+            subscription.deliver(event)
+
+        if event.get("status") in TERMINAL_STATUSES:
+            self._schedule_expiry(job_id)
+
+    def _schedule_expiry(self, job_id: str) -> None:
+        channel = self._channels.get(job_id)
+        if channel is None:
+            return
+        if channel.expiry is not None:
+            channel.expiry.cancel()
+        loop = asyncio.get_running_loop()
+        channel.expiry = loop.call_later(self.retention_seconds, self._expire, job_id)
+
+    def _expire(self, job_id: str) -> None:
+        channel = self._channels.get(job_id)
+        if channel is None:
+            return
+        if channel.subscribers:
+            self._schedule_expiry(job_id)
+        else:
+            del self._channels[job_id]
+
+    async def _history_since(self, job_id: str, last_seq: int) -> List[Dict[str, Any]]:
+        channel = self._channels.get(job_id)
+        if channel is None:
+            return []
+        return [event for event in channel.history if event["seq"] > last_seq]
+
+    @asynccontextmanager
+    async def subscribe(self, job_id: str, last_seq: Optional[int] = None):
+        """Subscribe to a job's events.
+
+        Args:
+            job_id: Job identifier
+            last_seq: Last event the client has seen; missed events after it
+                are replayed first. None only delivers new events.
+
+        Yields:
+            Subscription to read events from
+        """
+        channel = self._channel(job_id)
+        subscription = Subscription(last_seq if last_seq is not None else channel.seq)
+        channel.subscribers.add(subscription)
+        try:
+            if last_seq is not None:
+                for event in await self._history_since(job_id, last_seq):
+                    subscription.deliver(event)
+            yield subscription
+        finally:
+            channel.subscribers.discard(subscription)
+            if not channel.subscribers and channel.expiry is None and not channel.history:
+                self._channels.pop(job_id, None)
+
+    async def start(self) -> None:
+        """Start background resources."""
+        return None
+
+    async def stop(self) -> None:
+        """Stop background resources."""
+        return None
+
+
+class RedisProgressHub(ProgressHub):
+    """Hub that shares events between instances through Redis.
+
+    Sequence numbers come from a per-job Redis counter and recent events are
+    kept in a capped Redis list for resuming. Each instance holds a single
+    pattern subscription and fans events out to its local subscribers.
+    """
+
+    def __init__(self, client, history_size: int = 100, retention_seconds: int = 3600, key_prefix: str = "progress:"):
+        super().__init__(history_size, retention_seconds)
+        self.client = client
+        self.key_prefix = key_prefix
+        self._listener: Optional[asyncio.Task] = None
+        self._pubsub: Optional[PubSub] = None
+
+    def _channel_name(self, job_id: str) -> str:
+        return f"{self.key_prefix}events:{job_id}"
+
+    def _seq_key(self, job_id: str) -> str:
+        return f"{self.key_prefix}seq:{job_id}"
+
+    def _history_key(self, job_id: str) -> str:
+        return f"{self.key_prefix}history:{job_id}"
+
+    async def publish(self, job_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        seq = await self.client.incr(self._seq_key(job_id))
+        event = {**data, "job_id": job_id, "seq": seq}
+        encoded = json.dumps(event, default=str)
+
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.rpush(self._history_key(job_id), encoded)
+            pipe.ltrim(self._history_key(job_id), -self.history_size, -1)
+            pipe.expire(self._history_key(job_id), self.retention_seconds)
+            pipe.expire(self._seq_key(job_id), self.retention_seconds)
+            pipe.publish(self._channel_name(job_id), encoded)
+            await pipe.execute()
+
+        return event
+
+    async def _history_since(self, job_id: str, last_seq: int) -> List[Dict[str, Any]]:
+        raw_events = await self.client.lrange(self._history_key(job_id), 0, -1)
+        events = [json.loads(raw) for raw in raw_events]
+        return [event for event in events if event["seq"] > last_seq]
+
+    @asynccontextmanager
+    async def subscribe(self, job_id: str, last_seq: Optional[int] = None):
+        if last_seq is None:
+            current = await self.client.get(self._seq_key(job_id))
+            last_seq = int(current) if current else 0
+        async with super().subscribe(job_id, last_seq) as subscription:
+            yield subscription
+
+    def _dispatch(self, job_id: str, event: Dict[str, Any]) -> None:
+        # The history lives in Redis, so only wake local subscribers
+        channel = self._channels.get(job_id)
+        if channel is None:
+            return
+        for subscription in list(channel.subscribers):
+            subscription.deliver(event)
+
+    async def start(self) -> None:
+        pubsub = self.client.pubsub()
+        await pubsub.psubscribe(f"{self.key_prefix}events:*")
+        self._pubsub = pubsub
+        self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def _listen(self, pubsub: PubSub) -> None:
+        prefix_length = len(f"{self.key_prefix}events:")
+        while True:
+            try:
+                async for message in pubsub.listen():
+                    if message.get("type") != "pmessage":
+                        continue
+                    channel = message["channel"]
+                    if isinstance(channel, bytes):
+                        channel = channel.decode("utf-8")
+                    self._dispatch(channel[prefix_length:], json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"Progress hub listener error: {exc}")
+                await asyncio.sleep(1)
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+
+
+def create_progress_hub(settings, redis_client=None) -> ProgressHub:
+    """Create the progress hub matching the configured job store backend.
+
+    Args:
+        settings: Application settings
+        redis_client: Redis client shared with the job store, if any
+
+    Returns:
+        Configured progress hub
+    """
+    retention_seconds = settings.progress_retention_minutes * 60
+    if redis_client is not None:
+        return RedisProgressHub(redis_client, settings.progress_history_size, retention_seconds)
+    return ProgressHub(settings.progress_history_size, retention_seconds)
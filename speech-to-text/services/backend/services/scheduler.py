@@ -0,0 +1,456 @@
+"""Job scheduling: durable job queue, bounded worker pool and per-stage limits."""
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import json
+import math
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from redis.exceptions import WatchError
+
+# Pipeline stages that can be limited independently
+STAGE_EXTRACTION = "extraction"
+STAGE_RECOGNITION = "recognition"
+STAGE_SPEAKER_IDENTIFICATION = "speaker_identification"
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+    def __init__(self, queue_size: int, retry_after_seconds: int, estimated_wait_seconds: int):
+        super().__init__(f"Job queue is full ({queue_size} jobs waiting)")
+        self.queue_size = queue_size
+        self.retry_after_seconds = retry_after_seconds
+        self.estimated_wait_seconds = estimated_wait_seconds
+
+
+class StageLimiter:
+    """Caps the number of jobs that run a pipeline stage concurrently."""
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None):
+        """Initialize the limiter.
+
+        Args:
+            limits: Maximum concurrency per stage; stages without a positive
+                limit are not restricted
+        """
+        self._semaphores = {
+            name: asyncio.Semaphore(limit)
+            for name, limit in (limits or {}).items()
+            if limit and limit > 0
+        }
+
+    @classmethod
+    def from_settings(cls, settings) -> "StageLimiter":
+        """Create a limiter from the application settings."""
+        return cls({
+            STAGE_EXTRACTION: settings.max_concurrent_extractions,
+            STAGE_RECOGNITION: settings.max_concurrent_recognitions,
+            STAGE_SPEAKER_IDENTIFICATION: settings.max_concurrent_speaker_identifications,
+        })
+
+    def stage(self, name: str):
+        """Return an async context manager that holds a slot for ``name``."""
+        semaphore = self._semaphores.get(name)
+        if semaphore is None:
+            return contextlib.nullcontext()
+        return semaphore
+
+
+class JobQueue:
+    """Interface for the priority queue of pending transcription jobs.
+
+    Higher priorities are served first; jobs with equal priority are FIFO.
+    Dequeued jobs are leased until they are acknowledged, released or their
+    lease runs out, after which ``recover`` puts them back on the queue.
+    """
+
+    async def put(self, job_id: str, payload: Dict[str, Any], priority: int = 0) -> int:
+        """Enqueue a job and return its 1-based queue position."""
+        raise NotImplementedError
+
+    async def get(self, timeout: float, lease_seconds: int) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Dequeue the next job, waiting up to ``timeout`` seconds."""
+        raise NotImplementedError
+
+    async def ack(self, job_id: str) -> None:
+        """Mark a leased job as finished."""
+        raise NotImplementedError
+
+    async def extend(self, job_id: str, lease_seconds: int) -> bool:
+        """Renew the lease of a running job; False if the job is no longer leased."""
+        raise NotImplementedError
+
+    async def release(self, job_id: str) -> None:
+        """Return a leased job to the queue at its original position."""
+        raise NotImplementedError
+
+    async def remove(self, job_id: str) -> bool:
+        """Drop a job that has not started yet."""
+        raise NotImplementedError
+
+    async def size(self) -> int:
+        """Number of jobs waiting to be processed."""
+        raise NotImplementedError
+
+    async def position(self, job_id: str) -> Optional[int]:
+        """1-based queue position of a waiting job, or None."""
+        raise NotImplementedError
+
+    async def recover(self) -> int:
+        """Requeue jobs whose lease expired and return how many were requeued."""
+        return 0
+
+
+class InMemoryJobQueue(JobQueue):
+    """Process-local priority queue; pending jobs are lost on restart."""
+
+    def __init__(self):
+        self._heap: List[Tuple[int, int, str]] = []
+        self._entries: Dict[str, Tuple[int, int, str]] = {}
+        self._payloads: Dict[str, Dict[str, Any]] = {}
+        self._leased: Dict[str, Tuple[int, int, str]] = {}
+        self._counter = itertools.count()
+        self._available = asyncio.Condition()
+
+    async def put(self, job_id: str, payload: Dict[str, Any], priority: int = 0) -> int:
+        entry = (-priority, next(self._counter), job_id)
+        self._payloads[job_id] = payload
+        await self._push(entry)
+        return await self.position(job_id) or len(self._entries)
+
+    async def _push(self, entry: Tuple[int, int, str]) -> None:
+        async with self._available:
+            self._entries[entry[2]] = entry
+            heapq.heappush(self._heap, entry)
+            self._available.notify()
+
+    async def get(self, timeout: float, lease_seconds: int) -> Optional[Tuple[str, Dict[str, Any]]]:
+        async with self._available:
+            deadline = time.monotonic() + timeout
+            while True:
+                while self._heap:
+                    entry = heapq.heappop(self._heap)
+                    job_id = entry[2]
+                    # Skip entries that were removed while waiting
+                    if self._entries.get(job_id) is not entry:
+                        continue
+                    del self._entries[job_id]
+                    self._leased[job_id] = entry
+                    return job_id, self._payloads[job_id]
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                try:
+                    await asyncio.wait_for(self._available.wait(), remaining)
+                except TimeoutError:
+                    return None
+
+    async def ack(self, job_id: str) -> None:
+        self._leased.pop(job_id, None)
+        self._payloads.pop(job_id, None)
+
+    async def extend(self, job_id: str, lease_seconds: int) -> bool:
+        # Leases only end with the process, so there is nothing to renew
+        return job_id in self._leased
+
+    async def release(self, job_id: str) -> None:
+        entry = self._leased.pop(job_id, None)
+        if entry is not None:
+            await self._push(entry)
+
+    async def remove(self, job_id: str) -> bool:
+        if self._entries.pop(job_id, None) is None:
+            return False
+        self._payloads.pop(job_id, None)
+        return True
+
+    async def size(self) -> int:
+        return len(self._entries)
+
+    async def position(self, job_id: str) -> Optional[int]:
+        entry = self._entries.get(job_id)
+        if entry is None:
+            return None
+        return 1 + sum(1 for other in self._entries.values() if other < entry)
+
+
+class RedisJobQueue(JobQueue):
+    """Redis-backed priority queue that survives restarts and is shared by instances.
+
+    Pending job ids live in a sorted set scored by priority and enqueue time,
+    leased job ids in a second sorted set scored by lease deadline, and the
+    payloads in a hash. A job moves from pending to leased in one
+    transaction, so a worker dying mid-dequeue cannot lose it.
+    """
+
+    # Keeps the priority dominant over the millisecond enqueue timestamp
+    PRIORITY_WEIGHT = 10 ** 13
+    # Seconds between polls while the queue is empty
+    POLL_INTERVAL_SECONDS = 0.5
+
+    def __init__(self, client, key_prefix: str = "queue:"):
+        """Initialize the Redis queue.
+
+        Args:
+            client: ``redis.asyncio`` compatible client
+            key_prefix: Prefix for the queue keys
+        """
+        self.client = client
+        self.pending_key = f"{key_prefix}pending"
+        self.leased_key = f"{key_prefix}leased"
+        self.payload_key = f"{key_prefix}payloads"
+
+    @staticmethod
+    def _decode(value: Any) -> Any:
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    async def put(self, job_id: str, payload: Dict[str, Any], priority: int = 0) -> int:
+        score = -priority * self.PRIORITY_WEIGHT + int(time.time() * 1000)
+        record = json.dumps({"payload": payload, "score": score})
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hset(self.payload_key, job_id, record)
+            pipe.zadd(self.pending_key, {job_id: score})
+            pipe.zrank(self.pending_key, job_id)
+            replies = await pipe.execute()
+        return (replies[2] or 0) + 1
+
+    async def _lease_next(self, lease_seconds: int) -> Optional[Tuple[str, Any]]:
+        """Move the first pending job to the leased set in one transaction.
+
+        Returns:
+            (job_id, payload record) of the leased job, or None if none is pending
+        """
+        async with self.client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(self.pending_key)
+                    first = await pipe.zrange(self.pending_key, 0, 0)
+                    if not first:
+                        return None
+                    job_id = self._decode(first[0])
+                    pipe.multi()
+                    pipe.zrem(self.pending_key, job_id)
+                    pipe.zadd(self.leased_key, {job_id: time.time() + lease_seconds})
+                    pipe.hget(self.payload_key, job_id)
+                    replies = await pipe.execute()
+                    return job_id, replies[2]
+                except WatchError:
+                    # Another worker took or added a job first; retry
+                    continue
+
+    async def get(self, timeout: float, lease_seconds: int) -> Optional[Tuple[str, Dict[str, Any]]]:
+        deadline = time.monotonic() + timeout
+        while True:
+            leased = await self._lease_next(lease_seconds)
+            if leased is not None:
+                job_id, record = leased
+                if record is not None:
+                    return job_id, json.loads(self._decode(record))["payload"]
+                # Payload already gone; drop the lease and take the next job
+                await self.client.zrem(self.leased_key, job_id)
+                continue
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(self.POLL_INTERVAL_SECONDS, remaining))
+
+    async def ack(self, job_id: str) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.zrem(self.leased_key, job_id)
+            pipe.hdel(self.payload_key, job_id)
+            await pipe.execute()
+
+    async def extend(self, job_id: str, lease_seconds: int) -> bool:
+        # XX: a lease that was already recovered must not be recreated
+        changed = await self.client.zadd(self.leased_key, {job_id: time.time() + lease_seconds}, xx=True, ch=True)
+        return bool(changed)
+
+    async def _requeue(self, job_ids: List[str]) -> int:
+        if not job_ids:
+            return 0
+        records = await self.client.hmget(self.payload_key, job_ids)
+        requeued = 0
+        async with self.client.pipeline(transaction=True) as pipe:
+            for job_id, record in zip(job_ids, records, strict=True):
+                pipe.zrem(self.leased_key, job_id)
+                if record is None:
+                    continue
+                pipe.zadd(self.pending_key, {job_id: json.loads(self._decode(record))["score"]})
+                requeued += 1
+            await pipe.execute()
+        return requeued
+
+    async def release(self, job_id: str) -> None:
+        await self._requeue([job_id])
+
+    async def remove(self, job_id: str) -> bool:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.zrem(self.pending_key, job_id)
+            pipe.hdel(self.payload_key, job_id)
+            replies = await pipe.execute()
+        return bool(replies[0])
+
+    async def size(self) -> int:
+        return int(await self.client.zcard(self.pending_key))
+
+    async def position(self, job_id: str) -> Optional[int]:
+        rank = await self.client.zrank(self.pending_key, job_id)
+        return None if rank is None else rank + 1
+
+    async def recover(self) -> int:
+        expired = await self.client.zrangebyscore(self.leased_key, "-inf", time.time())
+        return await self._requeue([self._decode(job_id) for job_id in expired])
+
+
+def create_job_queue(settings, redis_client=None) -> JobQueue:
+    """Create the job queue matching the configured job store backend.
+
+    Args:
+        settings: Application settings
+        redis_client: Redis client shared with the job store, if any
+
+    Returns:
+        Configured job queue
+    """
+    if redis_client is not None:
+        return RedisJobQueue(redis_client)
+    return InMemoryJobQueue()
+
+
+class JobScheduler:
+    """Runs queued jobs on a fixed-size pool of worker tasks."""
+
+    # Initial guess for the average job duration, refined as jobs complete
+    DEFAULT_JOB_SECONDS = 300.0
+    RECOVERY_INTERVAL_SECONDS = 60
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handler: Callable[[str, Dict[str, Any]], Awaitable[None]],
+        max_workers: int,
+        max_queue_size: int,
+        lease_seconds: int
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            queue: Queue holding pending jobs
+            handler: Coroutine function called with (job_id, payload)
+            max_workers: Number of jobs processed concurrently
+            max_queue_size: Number of waiting jobs before submissions are rejected
+            lease_seconds: Lease length, renewed while a job runs; a job whose
+                worker stops renewing it is requeued after this time
+        """
+        self.queue = queue
+        self.handler = handler
+        self.max_workers = max(1, max_workers)
+        self.max_queue_size = max_queue_size
+        self.lease_seconds = lease_seconds
+        self.average_job_seconds = self.DEFAULT_JOB_SECONDS
+        self._tasks: List[asyncio.Task] = []
+        self._running = False
+
+    def estimate_wait_seconds(self, position: int) -> int:
+        """Estimate how long a job at ``position`` waits before it starts."""
+        rounds = math.ceil(max(position, 1) / self.max_workers)
+        return int(rounds * self.average_job_seconds)
+
+    async def submit(self, job_id: str, payload: Dict[str, Any], priority: int = 0) -> int:
+        """Enqueue a job.
+
+        Args:
+            job_id: Job identifier
+            payload: JSON-serializable job parameters
+            priority: Higher values are processed first
+
+        Returns:
+            1-based queue position
+
+        Raises:
+            QueueFullError: If the queue already holds ``max_queue_size`` jobs
+        """
+        queue_size = await self.queue.size()
+        if self.max_queue_size and queue_size >= self.max_queue_size:
+            raise QueueFullError(
+                queue_size,
+                retry_after_seconds=max(1, int(self.average_job_seconds / self.max_workers)),
+                estimated_wait_seconds=self.estimate_wait_seconds(queue_size + 1)
+            )
+        return await self.queue.put(job_id, payload, priority)
+
+    async def start(self) -> None:
+        """Requeue abandoned jobs and start the worker pool."""
+        if self._running:
+            return
+        self._running = True
+        recovered = await self.queue.recover()
+        if recovered:
+            print(f"Requeued {recovered} jobs with expired leases")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
+        self._tasks.append(asyncio.create_task(self._recovery_loop()))
+
+    async def stop(self) -> None:
+        """Stop the workers, returning in-flight jobs to the queue."""
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _recovery_loop(self) -> None:
+        while self._running:
+            await asyncio.sleep(self.RECOVERY_INTERVAL_SECONDS)
+            try:
+                await self.queue.recover()
+            except Exception as exc:
+                print(f"Job queue recovery failed: {exc}")
+
+    async def _renew_lease(self, job_id: str) -> None:
+        """Extend a running job's lease so recovery does not start it a second time."""
+        interval = max(1.0, self.lease_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if not await self.queue.extend(job_id, self.lease_seconds):
+                    print(f"Lease of job {job_id} was lost; it may be run again")
+                    return
+            except Exception as exc:
+                print(f"Failed to renew the lease of job {job_id}: {exc}")
+
+    async def _worker(self) -> None:
+        while self._running:
+            try:
+                item = await self.queue.get(timeout=1.0, lease_seconds=self.lease_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"Failed to dequeue job: {exc}")
+                await asyncio.sleep(1)
+                continue
+
+            if item is None:
+                continue
+
+            job_id, payload = item
+            started = time.monotonic()
+            heartbeat = asyncio.create_task(self._renew_lease(job_id))
+            try:
+                await self.handler(job_id, payload)
+            except asyncio.CancelledError:
+                await asyncio.shield(self.queue.release(job_id))
+                raise
+            except Exception as exc:
+                print(f"Job {job_id} failed in worker: {exc}")
+            finally:
+                heartbeat.cancel()
+
+            elapsed = time.monotonic() - started
+            self.average_job_seconds = 0.8 * self.average_job_seconds + 0.2 * elapsed
+            await self.queue.ack(job_id)
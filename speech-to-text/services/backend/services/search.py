@@ -0,0 +1,359 @@
+"""Full-text search over completed transcripts, backed by SQLite FTS5."""
+
+import asyncio
+import bisect
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import orjson
+
+# Shortest term the trigram index can match
+MIN_TERM_LENGTH = 3
+
+# Characters of context on each side of the first match in a snippet
+SNIPPET_CONTEXT_CHARS = 60
+
+# Characters dropped while folding, so "auto's" matches "autos" and
+# "zee-egel" matches "zeeegel"
+_DROPPED_CHARS = {"-", "'", "\u2019", "\u00ad"}
+
+_QUERY_TERMS = re.compile(r'"([^"]+)"|(\S+)')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    indexed_at REAL NOT NULL,
+    segment_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    job_id TEXT NOT NULL,
+    segment_id INTEGER NOT NULL,
+    start_seconds REAL,
+    end_seconds REAL,
+    text TEXT NOT NULL,
+    word_times BLOB
+);
+CREATE INDEX IF NOT EXISTS segments_job_id ON segments (job_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5(folded, tokenize='trigram');
+"""
+
+
+def fold(text: str) -> Tuple[str, List[int]]:
+    """Normalize text for Dutch-friendly matching.
+
+    Lowercases, strips diacritics (``één`` -> ``een``, ``ideeën`` -> ``ideeen``)
+    and drops hyphens and apostrophes. The index is built on trigrams of the
+    folded text, so a term also matches inside compound words
+    (``vergadering`` finds ``projectvergadering`` and ``vergaderingen``).
+
+    Args:
+        text: Original text
+
+    Returns:
+        Tuple of the folded text and, per folded character, its index in ``text``
+    """
+    folded: List[str] = []
+    positions: List[int] = []
+    for index, char in enumerate(text):
+        if char in _DROPPED_CHARS:
+            continue
+        base = unicodedata.normalize("NFKD", char)
+        base = "".join(part for part in base if not unicodedata.combining(part)) or char
+        for part in base.lower():
+            folded.append(part)
+            positions.append(index)
+    return "".join(folded), positions
+
+
+def parse_query(query: str) -> List[str]:
+    """Split a query into folded terms; quoted text is kept as one phrase."""
+    terms: List[str] = []
+    for phrase, word in _QUERY_TERMS.findall(query):
+        term = " ".join(fold(phrase or word)[0].split())
+        term = term.strip(".,;:!?()[]{}")
+        if len(term) >= MIN_TERM_LENGTH:
+            terms.append(term)
+    return terms
+
+
+def _word_times(folded: str, words: Sequence[Dict[str, Any]]) -> Optional[bytes]:
+    """Offsets of the words in the folded segment text with their start times."""
+    times: List[List[float]] = []
+    cursor = 0
+    for word in words:
+        start = word.get("start_seconds")
+        term = fold(word.get("word") or "")[0]
+        if start is None or not term:
+            continue
+        position = folded.find(term, cursor)
+        if position < 0:
+            continue
+        times.append([position, start])
+        cursor = position + len(term)
+    return orjson.dumps(times) if times else None
+
+
+class SearchIndex:
+    """Incrementally maintained search index of transcript segments.
+
+    Each completed job adds its segments once; re-indexing a job replaces its
+    rows. Hits carry the start time of the first matched word when word
+    timings are available, and of the segment otherwise.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the index.
+
+        Args:
+            path: SQLite database file, or ``:memory:``
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory and self.path != ":memory:":
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def _remove_job(self, connection: sqlite3.Connection, job_id: str) -> None:
+        connection.execute(
+            "DELETE FROM segments_fts WHERE rowid IN (SELECT id FROM segments WHERE job_id = ?)",
+            (job_id,)
+        )
+        connection.execute("DELETE FROM segments WHERE job_id = ?", (job_id,))
+        connection.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+
+    def index_job_sync(
+        self,
+        job_id: str,
+        segments: Sequence[Any],
+        words_for: Optional[Callable[[int], List[Dict[str, Any]]]] = None
+    ) -> int:
+        """Add (or replace) the segments of a job in the index.
+
+        Args:
+            job_id: Unique job identifier
+            segments: Transcript segments (pydantic models or dicts)
+            words_for: Returns the word dicts of the segment at an index
+
+        Returns:
+            Number of indexed segments
+        """
+        rows = []
+        for index, segment in enumerate(segments):
+            view = segment.model_dump() if hasattr(segment, "model_dump") else segment
+            text = (view.get("text") or "").strip()
+            if not text:
+                continue
+            folded = fold(text)[0]
+            words = view.get("words") or (words_for(index) if words_for else None) or []
+            segment_id = view.get("segment_id")
+            rows.append((
+                segment_id if segment_id is not None else index,
+                view.get("start_seconds"),
+                view.get("end_seconds"),
+                text,
+                _word_times(folded, words),
+                folded,
+            ))
+
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                self._remove_job(connection, job_id)
+                for segment_id, start, end, text, word_times, folded in rows:
+                    cursor = connection.execute(
+                        "INSERT INTO segments (job_id, segment_id, start_seconds, end_seconds, text, word_times) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (job_id, segment_id, start, end, text, word_times)
+                    )
+                    connection.execute(
+                        "INSERT INTO segments_fts (rowid, folded) VALUES (?, ?)",
+                        (cursor.lastrowid, folded)
+                    )
+                connection.execute(
+                    "INSERT INTO jobs (job_id, indexed_at, segment_count) VALUES (?, ?, ?)",
+                    (job_id, time.time(), len(rows))
+                )
+        return len(rows)
+
+    def remove_job_sync(self, job_id: str) -> None:
+        """Remove a job from the index."""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                self._remove_job(connection, job_id)
+
+    def search_sync(
+        self,
+        query: str,
+        job_id: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+        order: str = "recent"
+    ) -> Dict[str, Any]:
+        """Find segments containing all query terms.
+
+        ``recent`` returns the most recently indexed segments first and reads
+        only as many matches as needed, which keeps queries fast however
+        common the terms are. ``relevance`` ranks all matches by BM25.
+
+        Args:
+            query: Search terms; quoted text is matched as a phrase
+            job_id: Only search the transcript of this job
+            limit: Maximum number of hits
+            offset: Number of hits to skip
+            order: ``recent`` or ``relevance``
+
+        Returns:
+            Dictionary with the parsed ``terms``, the ``hits`` and the query time
+
+        Raises:
+            ValueError: If the query has no term of at least ``MIN_TERM_LENGTH`` characters
+        """
+        started = time.perf_counter()
+        terms = parse_query(query)
+        if not terms:
+            raise ValueError(f"Search terms need at least {MIN_TERM_LENGTH} characters")
+
+        match = " AND ".join('"' + term.replace('"', '""') + '"' for term in terms)
+        sql = (
+            "SELECT s.job_id, s.segment_id, s.start_seconds, s.end_seconds, s.text, s.word_times "
+            "FROM segments_fts JOIN segments s ON s.id = segments_fts.rowid "
+            "WHERE segments_fts MATCH ?"
+        )
+        params: List[Any] = [match]
+        if job_id:
+            sql += " AND s.job_id = ?"
+            params.append(job_id)
+        sql += " ORDER BY rank" if order == "relevance" else " ORDER BY segments_fts.rowid DESC"
+        sql += " LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+
+        hits = [self._hit(row, terms) for row in rows]
+        return {
+            "terms": terms,
+            "hits": hits,
+            "took_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    @staticmethod
+    def _hit(row: Tuple[Any, ...], terms: List[str]) -> Dict[str, Any]:
+        job_id, segment_id, start_seconds, end_seconds, text, word_times = row
+        folded, positions = fold(text)
+
+        matches: List[Tuple[int, int]] = []
+        for term in terms:
+            position = folded.find(term)
+            while position >= 0:
+                matches.append((position, position + len(term)))
+                position = folded.find(term, position + len(term))
+        matches.sort()
+
+        # Timestamp of the word containing the first match
+        timestamp = start_seconds
+        if matches and word_times:
+            times = orjson.loads(word_times)
+            word_index = bisect.bisect_right([offset for offset, _ in times], matches[0][0]) - 1
+            if word_index >= 0:
+                timestamp = times[word_index][1]
+
+        # Snippet around the first match, with highlight offsets into the snippet
+        first = positions[matches[0][0]] if matches else 0
+        snippet_start = max(0, first - SNIPPET_CONTEXT_CHARS)
+        snippet_end = min(len(text), first + SNIPPET_CONTEXT_CHARS)
+        if snippet_start > 0:
+            space = text.find(" ", snippet_start)
+            if 0 <= space < first:
+                snippet_start = space + 1
+        if snippet_end < len(text):
+            space = text.rfind(" ", first, snippet_end)
+            if space > first:
+                snippet_end = space
+
+        prefix = "…" if snippet_start > 0 else ""
+        suffix = "…" if snippet_end < len(text) else ""
+        highlights = []
+        for match_start, match_end in matches:
+            original_start = positions[match_start]
+            original_end = positions[match_end - 1] + 1
+            if original_start >= snippet_start and original_end <= snippet_end:
+                shift = len(prefix) - snippet_start
+                highlights.append([original_start + shift, original_end + shift])
+
+        return {
+            "job_id": job_id,
+            "segment_id": segment_id,
+            "timestamp_seconds": timestamp,
+            "start_seconds": start_seconds,
+            "end_seconds": end_seconds,
+            "snippet": prefix + text[snippet_start:snippet_end] + suffix,
+            "highlights": highlights,
+        }
+
+    def stats_sync(self) -> Dict[str, Any]:
+        """Number of indexed jobs and segments."""
+        with self._lock:
+            connection = self._connect()
+            jobs, segments = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(segment_count), 0) FROM jobs"
+            ).fetchone()
+        return {"jobs": jobs, "segments": segments, "path": self.path}
+
+    async def index_job(self, job_id: str, segments: Sequence[Any], words_for=None) -> int:
+        """Index the segments of a job without blocking the event loop."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.index_job_sync, job_id, segments, words_for)
+
+    async def remove_job(self, job_id: str) -> None:
+        """Remove a job from the index without blocking the event loop."""
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self.remove_job_sync, job_id)
+
+    async def search(
+        self,
+        query: str,
+        job_id: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+        order: str = "recent"
+    ) -> Dict[str, Any]:
+        """Search the index without blocking the event loop."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.search_sync, query, job_id, limit, offset, order)
+
+    async def stats(self) -> Dict[str, Any]:
+        """Index statistics, read without blocking the event loop."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self.stats_sync)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def create_search_index(settings) -> Optional[SearchIndex]:
+    """Create the transcript search index, or None when search is disabled."""
+    if not settings.search_enabled:
+        return None
+    return SearchIndex(settings.search_index_path)
@@ -0,0 +1,104 @@
+"""Fast JSON serialization and content-encoding negotiation for large responses."""
+
+import asyncio
+import gzip
+from typing import Any, Dict, Optional
+
+import brotli
+import orjson
+from fastapi.responses import Response
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_BYTES = 1024
+
+# Bodies larger than this are compressed in the executor, off the event loop
+EXECUTOR_COMPRESS_BYTES = 256 * 1024
+
+# Preferred encodings, best first
+SUPPORTED_ENCODINGS = ("br", "gzip")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize JSON-compatible content (datetimes included) to UTF-8 bytes."""
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> Dict[str, float]:
+    """Parse an ``Accept-Encoding`` header into encoding -> quality."""
+    encodings: Dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[name.strip().lower()] = quality
+    return encodings
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best supported encoding the client accepts, or None."""
+    accepted = accepted_encodings(accept_encoding)
+    candidates = [
+        encoding for encoding in SUPPORTED_ENCODINGS
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda encoding: accepted.get(encoding, accepted.get("*", 0.0)))
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a body with ``br`` or ``gzip``."""
+    if encoding == "br":
+        compressed: bytes = brotli.compress(body, quality=5)
+        return compressed
+    return gzip.compress(body, compresslevel=6)
+
+
+async def _run_compression(func, *args) -> bytes:
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, func, *args)
+
+
+async def encoded_response(
+    body: bytes,
+    accept_encoding: Optional[str],
+    headers: Optional[Dict[str, str]] = None,
+    gzip_body: Optional[bytes] = None
+) -> Response:
+    """Build a JSON response compressed according to ``Accept-Encoding``.
+
+    Args:
+        body: Serialized JSON body; may be empty when ``gzip_body`` is given
+        accept_encoding: Client ``Accept-Encoding`` header
+        headers: Extra response headers
+        gzip_body: Already gzip-compressed body, served as-is to gzip clients
+
+    Returns:
+        Response with the matching ``Content-Encoding``
+    """
+    headers = {**(headers or {}), "Vary": "Accept-Encoding"}
+    accepted = accepted_encodings(accept_encoding)
+
+    if gzip_body is not None:
+        if accepted.get("gzip", accepted.get("*", 0.0)) > 0:
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=gzip_body, media_type="application/json", headers=headers)
+        if not body:
+            body = await _run_compression(gzip.decompress, gzip_body)
+
+    encoding = choose_encoding(accept_encoding) if len(body) >= MIN_COMPRESS_BYTES else None
+    if encoding is not None:
+        if len(body) >= EXECUTOR_COMPRESS_BYTES:
+            body = await _run_compression(compress, body, encoding)
+        else:
+            body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -7,7 +7,8 @@ from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Sequence
 
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_google_vertexai import ChatVertexAI
+
+from .lazy import Lazy
 
 
 @dataclass
@@ -39,14 +40,30 @@ class SpeakerIdentificationService:
         self.project_id = settings.gcp_project_id
         self.location = settings.gcp_location
 
-        # Initialize Gemini model via LangChain
-        self.llm = ChatVertexAI(
+        # The Gemini client is created when speakers are first identified
+        self._llm = Lazy("speaker_identification_llm", self._create_llm)
+
+    def _create_llm(self):
+        """Create the Gemini model via LangChain."""
+        # Importing the Vertex AI integration alone takes seconds, so it is
+        # deferred until the first speaker identification
+        from langchain_google_vertexai import ChatVertexAI
+
+        return ChatVertexAI(
             model_name="gemini-2.5-pro",
             project=self.project_id,
             location=self.location,
             temperature=0.3,  # Low temperature for consistent analysis
         )
 
+    @property
+    def llm(self):
+        return self._llm.get()
+
+    def warm_up(self) -> None:
+        """Create the Gemini client ahead of the first job."""
+        self._llm.get()
+
     async def identify_speakers(self, transcript: str) -> Dict:
         """Identify speakers in a transcript using LLM analysis.
 
@@ -65,40 +82,26 @@ class SpeakerIdentificationService:
             if not segments:
                 return self._create_fallback_response(transcript)
 
+            chunks = self._chunk_segments(segments)
+
+            if self.settings.speaker_identification_parallel and len(chunks) > 1:
+                chunk_results = await self._label_chunks_parallel(segments, chunks)
+            else:
+                chunk_results = await self._label_chunks_sequential(chunks)
+
             known_speakers: Dict[str, Dict[str, Any]] = {}
             assignments: Dict[int, Dict[str, Any]] = {}
             collected_notes: List[str] = []
             confidence_values: List[str] = []
 
-            loop = asyncio.get_event_loop()
-
-            for chunk in self._chunk_segments(segments):
-                messages = self._create_prompt_messages(chunk, known_speakers)
-
-                response = await loop.run_in_executor(
-                    None,
-                    self.llm.invoke,
-                    messages
-                )
-
-                chunk_result = self._parse_chunk_response(response.content, chunk)
-
+            for chunk_result in chunk_results:
                 if chunk_result.get("notes"):
                     collected_notes.append(chunk_result["notes"])
 
                 if chunk_result.get("overall_confidence"):
                     confidence_values.append(chunk_result["overall_confidence"])
 
-                for speaker in chunk_result.get("speakers", []) or []:
-                    label = speaker.get("label")
-                    if not label:
-                        continue
-                    if label not in known_speakers:
-                        known_speakers[label] = speaker
-                    else:
-                        for key, value in speaker.items():
-                            if value:
-                                known_speakers[label][key] = value
+                self._merge_speakers(known_speakers, chunk_result.get("speakers"))
 
                 for segment_id, assignment in chunk_result.get("assignments", {}).items():
                     assignments[segment_id] = assignment
@@ -154,6 +157,197 @@ class SpeakerIdentificationService:
             print(f"Error in speaker identification: {exc}")
             return self._create_fallback_response(transcript)
 
+    async def _invoke_llm(self, messages: List) -> str:
+        """Invoke the LLM in the default executor and return the response text."""
+        loop = asyncio.get_event_loop()
+        # Access the client inside the executor so its first creation does
+        # not block the event loop
+        response = await loop.run_in_executor(
+            None,
+            lambda: self.llm.invoke(messages)
+        )
+        return str(response.content)
+
+    @staticmethod
+    def _merge_speakers(known_speakers: Dict[str, Dict[str, Any]], speakers: Optional[List[Any]]):
+        """Add speaker descriptions to ``known_speakers``, updating existing labels."""
+        for speaker in speakers or []:
+            if not isinstance(speaker, dict):
+                continue
+            label = speaker.get("label")
+            if not label:
+                continue
+            if label not in known_speakers:
+                known_speakers[label] = dict(speaker)
+            else:
+                for key, value in speaker.items():
+                    if value:
+                        known_speakers[label][key] = value
+
+    async def _label_chunks_sequential(self, chunks: List[List[TranscriptSegment]]) -> List[Dict[str, Any]]:
+        """Label chunks one at a time, carrying the known speakers forward."""
+        known_speakers: Dict[str, Dict[str, Any]] = {}
+        chunk_results: List[Dict[str, Any]] = []
+
+        for chunk in chunks:
+            messages = self._create_prompt_messages(chunk, known_speakers)
+            chunk_result = self._parse_chunk_response(await self._invoke_llm(messages), chunk)
+            self._merge_speakers(known_speakers, chunk_result.get("speakers"))
+            chunk_results.append(chunk_result)
+
+        return chunk_results
+
+    async def _label_chunks_parallel(
+        self,
+        segments: Sequence[TranscriptSegment],
+        chunks: List[List[TranscriptSegment]]
+    ) -> List[Dict[str, Any]]:
+        """Label chunks concurrently against a shared speaker roster.
+
+        1. A roster pass labels an evenly spaced sample of segments to learn
+           who speaks in the meeting.
+        2. All chunks are labelled concurrently (bounded by
+           ``speaker_identification_concurrency``) using that roster. A chunk
+           that fails leaves its segments unassigned instead of discarding
+           the labels of every other chunk.
+        3. If chunks introduced labels outside the roster, a reconciliation
+           pass maps them onto consistent labels.
+        """
+        roster = await self._extract_roster(segments)
+
+        semaphore = asyncio.Semaphore(max(1, self.settings.speaker_identification_concurrency))
+
+        async def label_chunk(chunk: List[TranscriptSegment]) -> Dict[str, Any]:
+            async with semaphore:
+                messages = self._create_prompt_messages(chunk, roster)
+                try:
+                    return self._parse_chunk_response(await self._invoke_llm(messages), chunk)
+                except Exception as exc:
+                    print(
+                        f"Speaker identification failed for segments "
+                        f"{chunk[0].segment_id}-{chunk[-1].segment_id}, using the default speaker: {exc}"
+                    )
+                    return {"assignments": {}, "speakers": []}
+
+        chunk_results = list(await asyncio.gather(*(label_chunk(chunk) for chunk in chunks)))
+
+        try:
+            await self._reconcile_labels(roster, chunks, chunk_results)
+        except Exception as exc:
+            print(f"Speaker label reconciliation failed, keeping chunk labels: {exc}")
+
+        return chunk_results
+
+    async def _extract_roster(self, segments: Sequence[TranscriptSegment]) -> Dict[str, Dict[str, Any]]:
+        """Build a speaker roster from an evenly spaced sample of segments."""
+        sample_size = min(len(segments), self.settings.speaker_roster_sample_segments, self.MAX_SEGMENTS_PER_REQUEST)
+        if sample_size <= 0:
+            return {}
+
+        step = len(segments) / sample_size
+        sample = [segments[int(i * step)] for i in range(sample_size)]
+
+        roster: Dict[str, Dict[str, Any]] = {}
+        try:
+            messages = self._create_prompt_messages(sample, {})
+            self._merge_speakers(roster, self._parse_chunk_response(await self._invoke_llm(messages), sample).get("speakers"))
+        except Exception as exc:
+            print(f"Speaker roster extraction failed, labelling without roster: {exc}")
+
+        return roster
+
+    async def _reconcile_labels(
+        self,
+        roster: Dict[str, Dict[str, Any]],
+        chunks: List[List[TranscriptSegment]],
+        chunk_results: List[Dict[str, Any]]
+    ):
+        """Map labels that chunks introduced independently onto consistent labels.
+
+        Only chunks that used labels missing from the roster are sent to the
+        LLM, together with the segments around their boundaries. Assignments
+        and speaker descriptions in ``chunk_results`` are rewritten in place.
+        """
+        new_labels: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        for index, chunk_result in enumerate(chunk_results):
+            chunk_speakers = {
+                speaker.get("label"): speaker
+                for speaker in chunk_result.get("speakers") or []
+                if isinstance(speaker, dict) and speaker.get("label")
+            }
+            used_labels = {assignment["speaker"] for assignment in chunk_result["assignments"].values()}
+            unknown = {
+                label: chunk_speakers.get(label, {"label": label})
+                for label in used_labels
+                if label not in roster
+            }
+            if unknown:
+                new_labels[index] = unknown
+
+        if not new_labels:
+            return
+
+        roster_lines = "\n".join(
+            f"{label}: {info.get('description') or info.get('summary') or ''}".strip()
+            for label, info in roster.items()
+        ) or "Geen."
+
+        chunk_blocks = []
+        for index, labels in new_labels.items():
+            chunk = chunks[index]
+            assignments = chunk_results[index]["assignments"]
+            excerpt = "\n".join(
+                f"- [{assignments.get(segment.segment_id, {}).get('speaker', '?')}] {segment.prompt_text}"
+                for segment in list(chunk[:3]) + list(chunk[-3:])
+            )
+            label_lines = "\n".join(
+                f"- {label}: {info.get('description') or ''}".strip()
+                for label, info in labels.items()
+            )
+            chunk_blocks.append(f"Deel {index}:\nNieuwe labels:\n{label_lines}\nFragmenten:\n{excerpt}")
+        chunk_text = "\n\n".join(chunk_blocks)
+
+        human_prompt = f"""Verschillende delen van hetzelfde gesprek zijn los van elkaar gelabeld. Sommige delen gebruiken labels die niet in de vaste sprekerslijst staan.
+
+Vaste sprekers:
+{roster_lines}
+
+{chunk_text}
+
+Geef voor elk nieuw label aan welk label het moet worden: een bestaand label als het dezelfde persoon is, anders een nieuw label in de vorm "Spreker X" dat nog niet gebruikt is. Gebruik hetzelfde nieuwe label in meerdere delen alleen als het echt dezelfde persoon is.
+
+Beantwoord uitsluitend met één JSON-object:
+{{
+  "mappings": [
+    {{ "part": 3, "label": "Spreker D", "canonical": "Spreker B" }}
+  ]
+}}
+"""
+
+        messages = [
+            SystemMessage(content="Je bent een expert in het consistent labelen van sprekers in Nederlandse gesprekken."),
+            HumanMessage(content=human_prompt)
+        ]
+        payload = self._extract_json(await self._invoke_llm(messages))
+        if not isinstance(payload, dict) or not isinstance(payload.get("mappings"), list):
+            raise ValueError("Reconciliation response could not be parsed")
+
+        mapping: Dict[int, Dict[str, str]] = {}
+        for item in payload["mappings"]:
+            if not isinstance(item, dict):
+                continue
+            part, label, canonical = item.get("part"), item.get("label"), item.get("canonical")
+            if part in new_labels and label in new_labels[part] and isinstance(canonical, str) and canonical.strip():
+                mapping.setdefault(part, {})[label] = canonical.strip()
+
+        for index, label_map in mapping.items():
+            chunk_result = chunk_results[index]
+            for assignment in chunk_result["assignments"].values():
+                assignment["speaker"] = label_map.get(assignment["speaker"], assignment["speaker"])
+            for speaker in chunk_result.get("speakers") or []:
+                if isinstance(speaker, dict) and speaker.get("label") in label_map:
+                    speaker["label"] = label_map[speaker["label"]]
+
     def _segment_transcript(self, transcript: str) -> List[TranscriptSegment]:
         """Split transcript into manageable segments for LLM analysis."""
 
@@ -2,17 +2,226 @@
 
 import os
 import asyncio
+import base64
+import bisect
+import functools
+import hashlib
+import struct
 import tempfile
-import subprocess
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional, BinaryIO
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, BinaryIO, Union
 
+import google_crc32c
+import orjson
+from google.api_core.exceptions import NotFound
 from google.cloud import storage
 from google.cloud.storage import Blob
 from google.auth import default
 from google.auth.credentials import Signing
 from google.auth.impersonated_credentials import Credentials as ImpersonatedCredentials
-from google.auth.transport.requests import Request
+
+from .audio_format import AudioFormat, choose_intermediate_format, parse_ffmpeg_duration, wav_header
+from .chunking import PcmRangeSplitter, parse_silences, plan_chunks
+from .clients import storage_client as shared_storage_client
+from .composite_upload import PARTS_PREFIX, RangeReader, compose_objects, part_name, plan_parts
+from .credentials import SigningCredentialManager
+from .lazy import Lazy
+from .serialization import dumps
+from .upload_sessions import recommend_chunk_size
+from .vad import OffsetMap, StreamingFrameFeatures, speech_frames, speech_regions
+
+
+class ChecksumReader:
+    """File wrapper that computes MD5, CRC32C and SHA-256 while the file is read.
+
+    Upload retries may seek back and re-read a chunk; bytes that were already
+    hashed are skipped so the digests always describe the file exactly once.
+    """
+
+    def __init__(self, file_obj: Union[BinaryIO, RangeReader]):
+        self._file = file_obj
+        self._md5 = hashlib.md5()
+        self._crc32c = google_crc32c.Checksum()
+        self._sha256 = hashlib.sha256()
+        self._hashed_bytes = 0
+
+    def read(self, size: int = -1) -> bytes:
+        position = self._file.tell()
+        data = self._file.read(size)
+        end = position + len(data)
+
+        if position > self._hashed_bytes:
+            raise OSError("Upload stream skipped bytes; cannot compute checksum")
+
+        if end > self._hashed_bytes:
+            new_data = data[self._hashed_bytes - position:]
+            self._md5.update(new_data)
+            self._crc32c.update(new_data)
+            self._sha256.update(new_data)
+            self._hashed_bytes = end
+
+        return data
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    @property
+    def size(self) -> int:
+        return self._hashed_bytes
+
+    @property
+    def md5_hash(self) -> str:
+        """Base64-encoded MD5 digest, as reported by GCS."""
+        return base64.b64encode(self._md5.digest()).decode("ascii")
+
+    @property
+    def crc32c(self) -> str:
+        """Base64-encoded CRC32C checksum, as reported by GCS."""
+        return base64.b64encode(self._crc32c.digest()).decode("ascii")
+
+    @property
+    def sha256(self) -> str:
+        """Hex SHA-256 digest; GCS does not compute one."""
+        return self._sha256.hexdigest()
+
+
+async def _pipe_stdout_to_writer(process: asyncio.subprocess.Process, writer: BinaryIO, read_size: int) -> None:
+    """Copy a subprocess' stdout into a blob writer in blocks of ``read_size``.
+
+    On failure the process is killed, so a task blocked on its stdin fails
+    instead of waiting forever.
+    """
+    if process.stdout is None:
+        raise RuntimeError("Process was started without a stdout pipe")
+    loop = asyncio.get_event_loop()
+    buffer = bytearray()
+    try:
+        while True:
+            chunk = await process.stdout.read(read_size)
+            if not chunk:
+                break
+            buffer += chunk
+            if len(buffer) >= read_size:
+                await loop.run_in_executor(None, writer.write, bytes(buffer))
+                buffer.clear()
+        if buffer:
+            await loop.run_in_executor(None, writer.write, bytes(buffer))
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+        raise
+
+
+async def _collect_stderr(process: asyncio.subprocess.Process) -> str:
+    """Read a subprocess' stderr to the end and return its tail."""
+    if process.stderr is None:
+        raise RuntimeError("Process was started without a stderr pipe")
+    # Keep only the tail so verbose FFmpeg logs cannot grow unbounded
+    tail = bytearray()
+    while True:
+        chunk = await process.stderr.read(64 * 1024)
+        if not chunk:
+            break
+        tail = (tail + chunk)[-8192:]
+    return tail.decode("utf-8", errors="replace")
+
+
+class PcmEncoder:
+    """FFmpeg process encoding 16-bit mono PCM into a resumable GCS upload.
+
+    PCM passed to ``write`` is piped into FFmpeg as it is produced and the
+    encoded audio is streamed from FFmpeg's stdout into the object, so
+    neither is held on disk or in memory as a whole.
+    """
+
+    def __init__(self, settings, blob: Blob, audio_format: AudioFormat):
+        self.settings = settings
+        self.blob = blob
+        self.audio_format = audio_format
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._writer: Optional[BinaryIO] = None
+        self._output: Optional[asyncio.Future[Tuple[None, str]]] = None
+
+    async def start(self) -> None:
+        """Start FFmpeg and open the upload."""
+        loop = asyncio.get_event_loop()
+        sample_rate = self.settings.ffmpeg_sample_rate
+        self._process = await asyncio.create_subprocess_exec(
+            self.settings.ffmpeg_path,
+            "-hide_banner",
+            "-nostats",
+            "-f", "s16le",
+            "-ar", str(sample_rate),
+            "-ac", "1",
+            "-i", "pipe:0",
+            *self.audio_format.ffmpeg_args(sample_rate, 1),
+            "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            writer = await loop.run_in_executor(
+                None,
+                lambda: self.blob.open("wb", content_type=self.audio_format.content_type, ignore_flush=True)
+            )
+        except BaseException:
+            await self.abort()
+            raise
+        self._writer = writer
+        read_size = self.settings.ffmpeg_stream_chunk_size_kb * 1024
+        self._output = asyncio.ensure_future(asyncio.gather(
+            _pipe_stdout_to_writer(self._process, writer, read_size),
+            _collect_stderr(self._process)
+        ))
+
+    def _started(self) -> Tuple[
+        asyncio.subprocess.Process, asyncio.StreamWriter, BinaryIO, asyncio.Future[Tuple[None, str]]
+    ]:
+        process, writer, output = self._process, self._writer, self._output
+        if process is None or process.stdin is None or writer is None or output is None:
+            raise RuntimeError("PcmEncoder.start() has not completed")
+        return process, process.stdin, writer, output
+
+    async def write(self, data: bytes) -> None:
+        """Encode the next block of PCM."""
+        _, stdin, _, _ = self._started()
+        try:
+            stdin.write(data)
+            await stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            # FFmpeg exited early; close() raises its error
+            await self.close()
+            raise RuntimeError("FFmpeg exited before all audio was encoded") from e
+
+    async def close(self) -> None:
+        """Finish encoding and finalize the object.
+
+        Raises:
+            RuntimeError: If FFmpeg failed; the upload is then abandoned
+        """
+        process, stdin, writer, output = self._started()
+        if not stdin.is_closing():
+            stdin.close()
+        _, stderr_text = await output
+        if await process.wait() != 0:
+            # Leaving the writer open abandons the resumable session, so no
+            # partial object is created.
+            raise RuntimeError(f"FFmpeg error: {stderr_text}")
+        await asyncio.get_event_loop().run_in_executor(None, writer.close)
+
+    async def abort(self) -> None:
+        """Stop FFmpeg and abandon the upload."""
+        if self._process is not None and self._process.returncode is None:
+            self._process.kill()
+            await self._process.wait()
+        if self._output is not None:
+            await asyncio.gather(self._output, return_exceptions=True)
 
 
 class StorageService:
@@ -28,6 +237,25 @@ class StorageService:
         self.bucket_name = settings.gcs_bucket_name
         self.transcript_bucket = settings.gcs_transcript_bucket
 
+        self.project_id = settings.gcp_project_id
+
+        # Credentials and clients are created on first use to keep startup fast
+        self._clients = Lazy("storage", self._create_clients)
+
+        # Signing credentials are refreshed in the background, not per URL
+        self.credential_manager = SigningCredentialManager(
+            lambda: self.signing_credentials,
+            refresh_margin_seconds=settings.signing_token_refresh_margin_seconds
+        )
+
+        # Handles of other buckets referenced by GCS URIs, by name
+        self._buckets: Dict[str, storage.Bucket] = {}
+
+        # Segment indexes of persisted results, by job ID (results are immutable)
+        self._segment_index_cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+
+    def _create_clients(self) -> Dict[str, Any]:
+        """Resolve credentials and create the storage client and buckets."""
         base_credentials, detected_project = default()
 
         if hasattr(base_credentials, 'with_scopes'):
@@ -35,14 +263,14 @@ class StorageService:
                 'https://www.googleapis.com/auth/cloud-platform'
             ])
 
-        self.project_id = settings.gcp_project_id or detected_project
+        self.project_id = self.settings.gcp_project_id or detected_project
 
-        self.signing_credentials = None
+        signing_credentials = None
 
         if hasattr(base_credentials, 'sign_bytes') and callable(getattr(base_credentials, 'sign_bytes', None)):
-            self.signing_credentials = base_credentials
+            signing_credentials = base_credentials
         else:
-            target_principal = settings.signing_service_account
+            target_principal = self.settings.signing_service_account
             if target_principal and target_principal.lower() == 'default':
                 target_principal = None
 
@@ -51,7 +279,7 @@ class StorageService:
 
             if target_principal:
                 try:
-                    self.signing_credentials = ImpersonatedCredentials(
+                    signing_credentials = ImpersonatedCredentials(
                         source_credentials=base_credentials,
                         target_principal=target_principal,
                         target_scopes=['https://www.googleapis.com/auth/cloud-platform'],
@@ -59,16 +287,47 @@ class StorageService:
                     )
                 except Exception as exc:
                     print(f"WARNING: Failed to create impersonated credentials for signing: {exc}")
-                    self.signing_credentials = None
+                    signing_credentials = None
 
-        self._request = Request()
+        # Shared with every service in the process, with a connection pool sized for our concurrency
+        storage_client = shared_storage_client(self.settings, self.project_id, base_credentials)
+        return {
+            "signing_credentials": signing_credentials,
+            "storage_client": storage_client,
+            "bucket": storage_client.bucket(self.bucket_name),
+            "transcript_bucket": storage_client.bucket(self.transcript_bucket),
+        }
 
-        self.storage_client = storage.Client(
-            project=self.project_id,
-            credentials=base_credentials
-        )
-        self.bucket = self.storage_client.bucket(self.bucket_name)
-        self.transcript_bucket_obj = self.storage_client.bucket(self.transcript_bucket)
+    @property
+    def storage_client(self) -> storage.Client:
+        return self._clients.get()["storage_client"]
+
+    @property
+    def signing_credentials(self):
+        return self._clients.get()["signing_credentials"]
+
+    @property
+    def bucket(self) -> storage.Bucket:
+        return self._clients.get()["bucket"]
+
+    @property
+    def transcript_bucket_obj(self) -> storage.Bucket:
+        return self._clients.get()["transcript_bucket"]
+
+    def get_bucket(self, bucket_name: str) -> storage.Bucket:
+        """Bucket handle by name, reused across calls."""
+        if bucket_name == self.bucket_name:
+            return self.bucket
+        if bucket_name == self.transcript_bucket:
+            return self.transcript_bucket_obj
+        bucket = self._buckets.get(bucket_name)
+        if bucket is None:
+            bucket = self._buckets[bucket_name] = self.storage_client.bucket(bucket_name)
+        return bucket
+
+    def warm_up(self) -> None:
+        """Create the credentials and storage client ahead of the first request."""
+        self._clients.get()
     
     async def upload_file(
         self,
@@ -105,10 +364,27 @@ class StorageService:
         self,
         file_obj: BinaryIO,
         filename: str,
-        content_type: Optional[str] = None
-    ) -> str:
-        """Upload a file-like object to Google Cloud Storage without loading it all into memory."""
-        blob = self.bucket.blob(filename)
+        content_type: Optional[str] = None,
+        size: Optional[int] = None
+    ) -> dict:
+        """Upload a file-like object to Google Cloud Storage without loading it all into memory.
+
+        The file is sent as a chunked resumable upload, so at most one chunk
+        (``upload_chunk_size_mb``) is held in memory. MD5 and CRC32C are computed
+        while streaming and compared with the checksums GCS reports; the object
+        is deleted if they differ. SHA-256 is computed in the same pass.
+
+        Args:
+            file_obj: Seekable binary file object
+            filename: Name for the file in GCS
+            content_type: MIME type of the file
+            size: File size in bytes, if known
+
+        Returns:
+            Dictionary with the GCS URI, object generation, size, base64
+            MD5/CRC32C checksums and hex SHA-256
+        """
+        blob = self.bucket.blob(filename, chunk_size=self.settings.upload_chunk_size_mb * 1024 * 1024)
 
         if content_type:
             blob.content_type = content_type
@@ -117,12 +393,189 @@ class StorageService:
 
         def _upload():
             file_obj.seek(0)
-            blob.upload_from_file(file_obj, rewind=True, content_type=content_type)
+            reader = ChecksumReader(file_obj)
+            blob.upload_from_file(reader, size=size, content_type=content_type)
 
-        await loop.run_in_executor(None, _upload)
+            if blob.crc32c != reader.crc32c or (blob.md5_hash and blob.md5_hash != reader.md5_hash):
+                blob.delete()
+                raise OSError(
+                    f"Checksum mismatch for {filename}: "
+                    f"crc32c {reader.crc32c} != {blob.crc32c}, md5 {reader.md5_hash} != {blob.md5_hash}"
+                )
+            return reader
+
+        reader = await loop.run_in_executor(None, _upload)
+
+        return {
+            "gcs_uri": f"gs://{self.bucket_name}/{filename}",
+            "generation": blob.generation,
+            "size": reader.size,
+            "md5_hash": reader.md5_hash,
+            "crc32c": reader.crc32c,
+            "sha256": reader.sha256,
+        }
+
+    async def upload_file_parallel(
+        self,
+        file_obj: BinaryIO,
+        filename: str,
+        content_type: Optional[str] = None,
+        size: Optional[int] = None
+    ) -> dict:
+        """Upload a large file as parallel parts composed into one object.
+
+        Parts are read with ``os.pread`` from the file's descriptor and uploaded
+        on ``composite_upload_concurrency`` connections; each part's CRC32C is
+        checked against GCS before the parts are composed. Composite objects
+        have no MD5, so only the CRC32C of the final object is returned, with
+        a SHA-256 of the file computed alongside the part uploads.
+
+        Args:
+            file_obj: Binary file object backed by a file descriptor
+            filename: Name for the file in GCS
+            content_type: MIME type of the file
+            size: File size in bytes, if known
+
+        Returns:
+            Dictionary with the GCS URI, object generation, size, base64
+            CRC32C checksum and hex SHA-256
+        """
+        fd = file_obj.fileno()
+        if size is None:
+            size = os.fstat(fd).st_size
+
+        upload_id = uuid.uuid4().hex
+        parts = plan_parts(
+            size,
+            self.settings.composite_upload_max_parts,
+            self.settings.composite_upload_min_part_mb * 1024 * 1024
+        )
+        part_names = [part_name(upload_id, index) for index in range(len(parts))]
+        semaphore = asyncio.Semaphore(self.settings.composite_upload_concurrency)
+        loop = asyncio.get_event_loop()
+
+        def _upload_part(name: str, offset: int, part_size: int):
+            blob = self.bucket.blob(name, chunk_size=self.settings.upload_chunk_size_mb * 1024 * 1024)
+            reader = ChecksumReader(RangeReader(fd, offset, part_size))
+            blob.upload_from_file(reader, size=part_size, content_type=content_type)
+            if blob.crc32c != reader.crc32c:
+                raise OSError(f"Checksum mismatch for part {name}: crc32c {reader.crc32c} != {blob.crc32c}")
+
+        async def _bounded_upload(name: str, offset: int, part_size: int):
+            async with semaphore:
+                await loop.run_in_executor(None, _upload_part, name, offset, part_size)
+
+        def _sha256() -> str:
+            reader = ChecksumReader(RangeReader(fd, 0, size))
+            while reader.read(1024 * 1024):
+                pass
+            return reader.sha256
+
+        try:
+            sha256, *_ = await asyncio.gather(
+                loop.run_in_executor(None, _sha256),
+                *(
+                    _bounded_upload(name, offset, part_size)
+                    for name, (offset, part_size) in zip(part_names, parts, strict=True)
+                )
+            )
+            blob = await loop.run_in_executor(
+                None,
+                lambda: compose_objects(self.bucket, filename, part_names, content_type)
+            )
+        finally:
+            await self.delete_composite_parts(upload_id)
+
+        return {
+            "gcs_uri": f"gs://{self.bucket_name}/{filename}",
+            "generation": blob.generation,
+            "size": blob.size,
+            "md5_hash": None,
+            "crc32c": blob.crc32c,
+            "sha256": sha256,
+        }
+
+    async def generate_composite_part_urls(
+        self,
+        upload_id: str,
+        parts: List[Tuple[int, int]],
+        expiration_hours: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Sign a PUT URL for every part of a composite upload.
+
+        Args:
+            upload_id: Composite upload ID
+            parts: (offset, size) per part
+            expiration_hours: URL expiration time in hours
+
+        Returns:
+            Part index, byte range and signed URL per part
+        """
+        urls = await asyncio.gather(*(
+            self.generate_signed_url(part_name(upload_id, index), expiration_hours=expiration_hours, method="PUT")
+            for index in range(len(parts))
+        ))
+        return [
+            {"index": index, "offset": offset, "size": part_size, "url": url, "method": "PUT"}
+            for index, ((offset, part_size), url) in enumerate(zip(parts, urls, strict=True))
+        ]
+
+    async def list_composite_parts(self, upload_id: str) -> Dict[str, int]:
+        """Sizes of the uploaded parts of a composite upload, by object name."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None,
+            lambda: {
+                blob.name: blob.size
+                for blob in self.storage_client.list_blobs(self.bucket, prefix=f"{PARTS_PREFIX}{upload_id}/")
+            }
+        )
+
+    async def compose_upload(
+        self,
+        upload_id: str,
+        part_count: int,
+        filename: str,
+        content_type: Optional[str] = None
+    ) -> dict:
+        """Compose the uploaded parts into the final object and delete the parts.
+
+        Args:
+            upload_id: Composite upload ID
+            part_count: Number of parts
+            filename: Name for the composed file in GCS
+            content_type: MIME type of the file
+
+        Returns:
+            Dictionary with the GCS URI, size and base64 CRC32C checksum
+        """
+        part_names = [part_name(upload_id, index) for index in range(part_count)]
+        loop = asyncio.get_event_loop()
+        blob = await loop.run_in_executor(
+            None,
+            lambda: compose_objects(self.bucket, filename, part_names, content_type)
+        )
+        await self.delete_composite_parts(upload_id)
+        return {
+            "gcs_uri": f"gs://{self.bucket_name}/{filename}",
+            "size": blob.size,
+            "crc32c": blob.crc32c,
+        }
+
+    async def delete_composite_parts(self, upload_id: str) -> None:
+        """Delete the temporary part objects of a composite upload."""
+        loop = asyncio.get_event_loop()
+
+        def delete():
+            blobs = list(self.storage_client.list_blobs(self.bucket, prefix=f"{PARTS_PREFIX}{upload_id}/"))
+            if blobs:
+                self.bucket.delete_blobs(blobs, on_error=lambda blob: None)
+
+        try:
+            await loop.run_in_executor(None, delete)
+        except Exception as exc:
+            print(f"Failed to delete parts of composite upload {upload_id}: {exc}")
 
-        return f"gs://{self.bucket_name}/{filename}"
-    
     async def download_file(self, gcs_uri: str) -> bytes:
         """Download a file from Google Cloud Storage.
         
@@ -141,7 +594,7 @@ class StorageService:
             raise ValueError("Invalid GCS URI format")
         
         bucket_name, blob_name = parts
-        bucket = self.storage_client.bucket(bucket_name)
+        bucket = self.get_bucket(bucket_name)
         blob = bucket.blob(blob_name)
         
         # Download in executor to avoid blocking
@@ -168,13 +621,54 @@ class StorageService:
             raise ValueError("Invalid GCS URI format")
         
         bucket_name, blob_name = parts
-        bucket = self.storage_client.bucket(bucket_name)
+        bucket = self.get_bucket(bucket_name)
         blob = bucket.blob(blob_name)
         
         # Delete in executor to avoid blocking
         loop = asyncio.get_event_loop()
         await loop.run_in_executor(None, blob.delete)
+
+    async def delete_trimmed_audio(self, gcs_uri: str, job_id: str) -> bool:
+        """Delete audio written by ``trim_silence`` once it was recognised.
+
+        Any other URI, such as the untrimmed audio of a job where nothing was
+        cut, is left alone.
+
+        Args:
+            gcs_uri: GCS URI of the audio that was recognised
+            job_id: Job the audio belongs to
+
+        Returns:
+            True if a trimmed object was deleted
+        """
+        if not gcs_uri.startswith(f"gs://{self.bucket_name}/trimmed/{job_id}/"):
+            return False
+        await self.delete_file(gcs_uri)
+        return True
     
+    async def get_upload_info(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Generation, size and checksums of an object in the upload bucket.
+
+        Args:
+            filename: Object name in the upload bucket
+
+        Returns:
+            Dictionary with ``generation``, ``size``, ``md5_hash`` (None for
+            composite objects) and ``crc32c``, or None if the object does not exist
+        """
+        blob = self.bucket.blob(filename)
+        loop = asyncio.get_event_loop()
+        try:
+            await loop.run_in_executor(None, blob.reload)
+        except NotFound:
+            return None
+        return {
+            "generation": blob.generation,
+            "size": blob.size,
+            "md5_hash": blob.md5_hash,
+            "crc32c": blob.crc32c,
+        }
+
     async def generate_signed_url(
         self,
         filename: str,
@@ -199,15 +693,13 @@ class StorageService:
         # Generate signed URL in executor
         loop = asyncio.get_event_loop()
         
-        signing_credentials = self.signing_credentials
+        signing_credentials = await self.credential_manager.get()
         if signing_credentials is None:
             raise RuntimeError(
                 "No signing credentials available. Ensure the service account can sign blobs or set SIGNING_SERVICE_ACCOUNT."
             )
 
         def _generate_signed_url():
-            if hasattr(signing_credentials, 'refresh'):
-                signing_credentials.refresh(self._request)
             return blob.generate_signed_url(
                 version="v4",
                 expiration=timedelta(hours=expiration_hours),
@@ -245,7 +737,7 @@ class StorageService:
         # Generate resumable upload URL in executor
         loop = asyncio.get_event_loop()
         
-        signing_credentials = self.signing_credentials
+        signing_credentials = await self.credential_manager.get()
         if signing_credentials is None:
             raise RuntimeError(
                 "No signing credentials available for resumable upload. Ensure the service account can sign blobs or set SIGNING_SERVICE_ACCOUNT."
@@ -254,8 +746,6 @@ class StorageService:
         def _create_resumable_session():
             expiration = datetime.utcnow() + timedelta(hours=expiration_hours)
 
-            if hasattr(signing_credentials, 'refresh'):
-                signing_credentials.refresh(self._request)
             signed_url = blob.generate_signed_url(
                 version="v4",
                 expiration=expiration,
@@ -279,7 +769,73 @@ class StorageService:
         
         session_info = await loop.run_in_executor(None, _create_resumable_session)
         return session_info
-    
+
+    async def create_resumable_session(
+        self,
+        filename: str,
+        file_size: Optional[int] = None,
+        content_type: Optional[str] = None,
+        origin: Optional[str] = None
+    ) -> str:
+        """Start a resumable upload session server-side.
+
+        The returned session URI authorizes uploading this one object without
+        further credentials, so the browser can send chunks to it directly.
+
+        Args:
+            filename: Name for the file in GCS
+            file_size: Declared file size in bytes
+            content_type: MIME type of the file
+            origin: Browser origin; GCS only answers CORS requests from it
+
+        Returns:
+            Resumable session URI
+        """
+        blob = self.bucket.blob(filename)
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None,
+            lambda: blob.create_resumable_upload_session(
+                content_type=content_type or "application/octet-stream",
+                size=file_size,
+                origin=origin
+            )
+        )
+
+    async def query_resumable_session(self, session_uri: str, file_size: Optional[int] = None) -> Dict[str, Any]:
+        """Ask GCS how many bytes of a resumable upload it has committed.
+
+        Args:
+            session_uri: Resumable session URI
+            file_size: Total file size, if known
+
+        Returns:
+            Dictionary with ``committed_bytes``, ``complete`` and ``expired``
+        """
+        total = str(file_size) if file_size is not None else "*"
+        loop = asyncio.get_event_loop()
+        response = await loop.run_in_executor(
+            None,
+            lambda: self.storage_client._http.put(
+                session_uri,
+                headers={"Content-Range": f"bytes */{total}", "Content-Length": "0"},
+                timeout=30
+            )
+        )
+
+        if response.status_code in (200, 201):
+            return {"committed_bytes": file_size, "complete": True, "expired": False}
+        if response.status_code == 308:
+            # "bytes=0-N" lists the last committed byte; no header means nothing yet
+            committed = 0
+            range_header = response.headers.get("Range")
+            if range_header and "-" in range_header:
+                committed = int(range_header.rsplit("-", 1)[1]) + 1
+            return {"committed_bytes": committed, "complete": False, "expired": False}
+        if response.status_code in (404, 410):
+            return {"committed_bytes": None, "complete": False, "expired": True}
+        raise RuntimeError(f"Unexpected status {response.status_code} querying upload session: {response.text[:200]}")
+
     async def generate_upload_options(
         self,
         filename: str,
@@ -311,12 +867,24 @@ class StorageService:
             "content_type": content_type
         }
         
-        # Always provide regular signed URL for smaller uploads
-        regular_url = await self.generate_signed_url(
-            filename=filename,
-            expiration_hours=expiration_hours,
-            method="PUT"
-        )
+        # Always provide regular signed URL for smaller uploads; the resumable
+        # URL for larger files is signed concurrently
+        signing: List[Awaitable[Any]] = [
+            self.generate_signed_url(
+                filename=filename,
+                expiration_hours=expiration_hours,
+                method="PUT"
+            )
+        ]
+        if file_size is None or file_size >= resumable_threshold:
+            signing.append(
+                self.generate_resumable_upload_url(
+                    filename=filename,
+                    content_type=content_type,
+                    expiration_hours=expiration_hours
+                )
+            )
+        regular_url, *resumable = await asyncio.gather(*signing)
         
         options["signed_url"] = {
             "url": regular_url,
@@ -328,17 +896,16 @@ class StorageService:
         }
         
         # Provide resumable upload for larger files
-        if file_size is None or file_size >= resumable_threshold:
-            resumable_info = await self.generate_resumable_upload_url(
-                filename=filename,
-                content_type=content_type,
-                expiration_hours=expiration_hours
-            )
-            
+        if resumable:
             options["resumable_upload"] = {
-                **resumable_info,
+                **resumable[0],
                 "recommended_for": "files_over_100mb",
-                "chunk_size": 8 * 1024 * 1024,  # 8MB chunks
+                "chunk_size": recommend_chunk_size(
+                    file_size,
+                    target_chunk_seconds=self.settings.upload_chunk_target_seconds,
+                    min_chunk_bytes=self.settings.upload_chunk_min_mb * 1024 * 1024,
+                    max_chunk_bytes=self.settings.upload_chunk_max_mb * 1024 * 1024
+                ),
                 "supports_resume": True
             }
         
@@ -370,85 +937,749 @@ class StorageService:
         
         return f"gs://{self.transcript_bucket}/{filename}"
     
-    async def extract_and_upload_audio(self, video_gcs_uri: str) -> str:
+    SEGMENT_INDEX_CACHE_SIZE = 128
+
+    def _result_path(self, job_id: str, name: str) -> str:
+        return f"results/{job_id}/{name}"
+
+    async def save_transcript_result(
+        self,
+        job_id: str,
+        result: Dict[str, Any],
+        segments: Optional[List[Dict[str, Any]]]
+    ) -> str:
+        """Persist the structured result of a job next to the transcript text.
+
+        Three objects are written under ``results/{job_id}/`` in the transcript
+        bucket: ``segments.jsonl`` with one segment (including its words) per
+        line, ``index.json`` with the time range and byte range of every line,
+        and ``result.json`` with the job metadata and transcript variants.
+        ``result.json`` is written last, so its presence marks a complete result.
+
+        Args:
+            job_id: Job identifier
+            result: Job fields to restore later (JSON-compatible)
+            segments: Transcript segments in time order
+
+        Returns:
+            GCS URI of ``result.json``
+        """
+        lines: List[bytes] = []
+        index: List[List[Any]] = []
+        offset = 0
+
+        for segment in segments or []:
+            line = dumps(segment) + b"\n"
+            index.append([segment.get("start_seconds"), segment.get("end_seconds"), offset, len(line)])
+            lines.append(line)
+            offset += len(line)
+
+        index_document = {"format": 1, "segment_count": len(index), "segments": index}
+        bucket = self.transcript_bucket_obj
+
+        def upload():
+            bucket.blob(self._result_path(job_id, "segments.jsonl")).upload_from_string(
+                b"".join(lines), "application/x-ndjson"
+            )
+            bucket.blob(self._result_path(job_id, "index.json")).upload_from_string(
+                dumps(index_document), "application/json"
+            )
+            bucket.blob(self._result_path(job_id, "result.json")).upload_from_string(
+                dumps(result), "application/json"
+            )
+
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, upload)
+
+        return f"gs://{self.transcript_bucket}/{self._result_path(job_id, 'result.json')}"
+
+    async def load_transcript_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Load a result persisted with ``save_transcript_result``.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            The saved job fields with ``transcript_segments`` added, or None if
+            no complete result exists
+        """
+        bucket = self.transcript_bucket_obj
+
+        def download() -> Optional[Dict[str, Any]]:
+            try:
+                result: Dict[str, Any] = orjson.loads(bucket.blob(self._result_path(job_id, "result.json")).download_as_bytes())
+                segment_data = bucket.blob(self._result_path(job_id, "segments.jsonl")).download_as_bytes()
+            except NotFound:
+                return None
+            result["transcript_segments"] = [orjson.loads(line) for line in segment_data.splitlines() if line]
+            return result
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, download)
+
+    async def _load_segment_index(self, job_id: str) -> Optional[Dict[str, Any]]:
+        cached = self._segment_index_cache.get(job_id)
+        if cached is not None:
+            self._segment_index_cache.move_to_end(job_id)
+            return cached
+
+        blob = self.transcript_bucket_obj.blob(self._result_path(job_id, "index.json"))
+        loop = asyncio.get_event_loop()
+        try:
+            index: Dict[str, Any] = orjson.loads(await loop.run_in_executor(None, blob.download_as_bytes))
+        except NotFound:
+            return None
+
+        # Segments without timings inherit the time of the previous segment
+        ends: List[float] = []
+        last_time = 0.0
+        for start, end, _, _ in index["segments"]:
+            last_time = end if end is not None else (start if start is not None else last_time)
+            ends.append(last_time)
+        index["ends"] = ends
+
+        self._segment_index_cache[job_id] = index
+        if len(self._segment_index_cache) > self.SEGMENT_INDEX_CACHE_SIZE:
+            self._segment_index_cache.popitem(last=False)
+        return index
+
+    async def read_transcript_range(
+        self,
+        job_id: str,
+        from_seconds: float = 0.0,
+        to_seconds: Optional[float] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Read the persisted segments overlapping a time range.
+
+        Only the byte range of ``segments.jsonl`` holding those segments is
+        downloaded, located through the (cached) segment index.
+
+        Args:
+            job_id: Job identifier
+            from_seconds: Start of the range in seconds
+            to_seconds: End of the range in seconds (default: end of the audio)
+
+        Returns:
+            Segments in time order, or None if no result was persisted
+        """
+        index = await self._load_segment_index(job_id)
+        if index is None:
+            return None
+
+        entries = index["segments"]
+        ends = index["ends"]
+        first = bisect.bisect_left(ends, from_seconds)
+        last = first
+        while last < len(entries):
+            start = entries[last][0]
+            if to_seconds is not None and start is not None and start > to_seconds:
+                break
+            last += 1
+
+        if first >= last:
+            return []
+
+        byte_start = entries[first][2]
+        byte_end = entries[last - 1][2] + entries[last - 1][3] - 1
+        blob = self.transcript_bucket_obj.blob(self._result_path(job_id, "segments.jsonl"))
+
+        loop = asyncio.get_event_loop()
+        data = await loop.run_in_executor(
+            None, lambda: blob.download_as_bytes(start=byte_start, end=byte_end)
+        )
+        return [orjson.loads(line) for line in data.splitlines() if line]
+
+    async def delete_transcript_result(self, job_id: str) -> None:
+        """Delete the persisted structured result of a job, if any."""
+        self._segment_index_cache.pop(job_id, None)
+        bucket = self.transcript_bucket_obj
+
+        def delete():
+            for name in ("result.json", "index.json", "segments.jsonl"):
+                try:
+                    bucket.blob(self._result_path(job_id, name)).delete()
+                except NotFound:
+                    pass
+
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, delete)
+
+    async def extract_and_upload_audio(
+        self,
+        video_gcs_uri: str,
+        audio_format: Optional[AudioFormat] = None,
+        job_id: Optional[str] = None
+    ) -> str:
         """Extract audio from video file and upload to GCS.
         
+        By default the video is streamed from GCS into FFmpeg's stdin and the
+        extracted audio is streamed from FFmpeg's stdout into a chunked
+        resumable upload, so memory use stays at a few chunks per job and no
+        temp files are written. Inputs that FFmpeg can only read with seeking
+        (MP4/MOV with the ``moov`` atom at the end) fall back to a temp file.
+        The audio duration is stored in the object metadata, because FLAC and
+        Ogg headers written to a pipe do not contain it.
+        
         Args:
             video_gcs_uri: GCS URI of the video file
+            audio_format: Intermediate audio format (default: the configured policy)
+            job_id: Job the audio belongs to, which keeps object names unique
+                when jobs share a video
             
         Returns:
             GCS URI of extracted audio file
         """
-        # Download video file to temp location
-        video_content = await self.download_file(video_gcs_uri)
-        
-        with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as video_file:
-            video_file.write(video_content)
+        audio_format = audio_format or choose_intermediate_format(self.settings)
+        bucket_name, blob_name = self._parse_gcs_uri(video_gcs_uri)
+        source_blob = self.get_bucket(bucket_name).blob(blob_name)
+
+        # Generate filename for audio, scoped to the job so that concurrent
+        # jobs for the same video do not overwrite each other's audio
+        stem = os.path.splitext(blob_name.split("/")[-1])[0]
+        audio_filename = f"extracted/{job_id or uuid.uuid4().hex}/{stem}_audio{audio_format.extension}"
+        audio_blob = self.bucket.blob(
+            audio_filename,
+            chunk_size=self.settings.upload_chunk_size_mb * 1024 * 1024
+        )
+
+        streaming = self.settings.streaming_audio_extraction
+        if streaming and await self._needs_seekable_input(source_blob):
+            print(f"{video_gcs_uri} requires seeking (moov atom after mdat); extracting from disk")
+            streaming = False
+
+        if streaming:
+            duration = await self._extract_audio_streaming(source_blob, audio_blob, audio_format)
+        else:
+            duration = await self._extract_audio_from_disk(source_blob, audio_blob, audio_format)
+
+        if duration is not None:
+            audio_blob.metadata = {"duration_seconds": f"{duration:.3f}"}
+            try:
+                await asyncio.get_event_loop().run_in_executor(None, audio_blob.patch)
+            except Exception as exc:
+                print(f"Could not store the duration of {audio_filename}: {exc}")
+
+        return f"gs://{self.bucket_name}/{audio_filename}"
+
+    @staticmethod
+    def _parse_gcs_uri(gcs_uri: str):
+        """Split a ``gs://bucket/object`` URI into bucket and object name."""
+        if not gcs_uri.startswith("gs://"):
+            raise ValueError("Invalid GCS URI format")
+
+        parts = gcs_uri[5:].split("/", 1)
+        if len(parts) != 2:
+            raise ValueError("Invalid GCS URI format")
+
+        return parts[0], parts[1]
+
+    def _ffmpeg_audio_args(self, audio_format: AudioFormat) -> list:
+        """FFmpeg output options for the intermediate audio file."""
+        return audio_format.ffmpeg_args(self.settings.ffmpeg_sample_rate, self.settings.ffmpeg_channels)
+
+    async def _needs_seekable_input(self, blob: Blob) -> bool:
+        """Check whether an ISO-BMFF (MP4/MOV) file stores ``moov`` after ``mdat``.
+
+        Only the box headers are read with small ranged requests. FFmpeg cannot
+        read such files from a pipe because the index is at the end of the file.
+        """
+        ext = os.path.splitext(blob.name)[1].lower()
+        if ext not in (".mp4", ".m4a", ".mov", ".3gp"):
+            return False
+
+        loop = asyncio.get_event_loop()
+        offset = 0
+
+        # ftyp, free/wide and friends precede moov or mdat; a handful is plenty
+        for _ in range(16):
+            header = await loop.run_in_executor(
+                None,
+                functools.partial(blob.download_as_bytes, start=offset, end=offset + 15)
+            )
+            if len(header) < 8:
+                return False
+
+            box_size = int.from_bytes(header[0:4], "big")
+            box_type = header[4:8]
+
+            if box_type == b"moov":
+                return False
+            if box_type == b"mdat":
+                return True
+
+            if box_size == 1 and len(header) >= 16:
+                box_size = int.from_bytes(header[8:16], "big")
+            if box_size < 8:
+                # Size 0 means the box runs to the end of the file
+                return False
+            offset += box_size
+
+        return False
+
+    async def _extract_audio_streaming(
+        self,
+        source_blob: Blob,
+        audio_blob: Blob,
+        audio_format: AudioFormat
+    ) -> Optional[float]:
+        """Pipe a GCS object through FFmpeg into a resumable GCS upload.
+
+        Args:
+            source_blob: Blob holding the input media
+            audio_blob: Blob to write the extracted audio to
+            audio_format: Intermediate audio format
+
+        Returns:
+            Duration of the extracted audio in seconds, if FFmpeg reported it
+        """
+        loop = asyncio.get_event_loop()
+        read_size = self.settings.ffmpeg_stream_chunk_size_kb * 1024
+
+        command = [
+            self.settings.ffmpeg_path,
+            "-hide_banner",
+            "-i", "pipe:0",
+            *self._ffmpeg_audio_args(audio_format),
+            "pipe:1",
+        ]
+
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+
+        writer = await loop.run_in_executor(
+            None,
+            lambda: audio_blob.open("wb", content_type=audio_format.content_type, ignore_flush=True)
+        )
+
+        try:
+            _, _, stderr_text = await asyncio.gather(
+                self._feed_blob_to_stdin(source_blob, process),
+                _pipe_stdout_to_writer(process, writer, read_size),
+                _collect_stderr(process)
+            )
+            returncode = await process.wait()
+        except BaseException:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+
+        if returncode != 0:
+            # Leaving the writer open abandons the resumable session, so no
+            # partial object is created.
+            raise RuntimeError(f"FFmpeg error: {stderr_text}")
+
+        # Closing the writer uploads the final chunk and finalizes the object
+        await loop.run_in_executor(None, writer.close)
+        return parse_ffmpeg_duration(stderr_text)
+
+    async def _feed_blob_to_stdin(self, source_blob: Blob, process):
+        """Stream a GCS object into a subprocess' stdin using ranged reads."""
+        loop = asyncio.get_event_loop()
+        read_size = self.settings.ffmpeg_stream_chunk_size_kb * 1024
+
+        reader = await loop.run_in_executor(
+            None,
+            lambda: source_blob.open("rb", chunk_size=read_size)
+        )
+        try:
+            while True:
+                chunk = await loop.run_in_executor(None, reader.read, read_size)
+                if not chunk:
+                    break
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            # FFmpeg exited early; its exit code and stderr explain why
+            pass
+        finally:
+            process.stdin.close()
+            await loop.run_in_executor(None, reader.close)
+
+    async def split_audio_for_recognition(
+        self,
+        gcs_uri: str,
+        chunk_seconds: float,
+        overlap_seconds: float,
+        job_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Split audio at silences into overlapping chunks for parallel recognition.
+
+        The audio is decoded to 16-bit mono PCM twice, streaming through a
+        pipe instead of to disk. In the first pass ``silencedetect`` reports
+        the silent regions and chunk boundaries are placed at silences (see
+        ``plan_chunks``). In the second the PCM is routed as it is decoded
+        into one WAV upload per chunk under ``chunks/{job_id}/`` in the upload
+        bucket; at most two chunks (sharing an overlap) are open at a time.
+
+        Args:
+            gcs_uri: GCS URI of the audio file
+            chunk_seconds: Target chunk length in seconds
+            overlap_seconds: Audio shared by neighbouring chunks at each cut
+            job_id: Job the audio belongs to, which keeps object names unique
+                (a random ID when not given)
+
+        Returns:
+            Chunk descriptions from ``plan_chunks`` with a ``gcs_uri`` each. A
+            single chunk pointing at the original file is returned when the
+            audio is too short to split.
+        """
+        loop = asyncio.get_event_loop()
+        _, blob_name = self._parse_gcs_uri(gcs_uri)
+        sample_rate = self.settings.ffmpeg_sample_rate
+        pcm_bytes = 0
+
+        async def _count(data: bytes):
+            nonlocal pcm_bytes
+            pcm_bytes += len(data)
+
+        silence_lines = await self._stream_pcm(
+            gcs_uri,
+            _count,
+            audio_filter=(
+                f"silencedetect=noise={self.settings.chunk_silence_threshold_db}dB"
+                f":d={self.settings.chunk_min_silence_seconds}"
+            )
+        )
+
+        chunks = plan_chunks(
+            pcm_bytes // 2 / sample_rate,
+            parse_silences(silence_lines),
+            chunk_seconds,
+            overlap_seconds,
+            search_window_seconds=self.settings.chunk_search_window_seconds
+        )
+
+        if len(chunks) == 1:
+            chunks[0]["gcs_uri"] = gcs_uri
+            return chunks
+
+        stem = os.path.splitext(blob_name.split("/")[-1])[0]
+        prefix = f"chunks/{job_id or uuid.uuid4().hex}/{stem}"
+        byte_ranges = [
+            (int(chunk["start_seconds"] * sample_rate) * 2, min(int(chunk["end_seconds"] * sample_rate) * 2, pcm_bytes))
+            for chunk in chunks
+        ]
+        writers: Dict[int, Any] = {}
+
+        async def _open(index: int):
+            chunk_name = f"{prefix}_{index:03d}.wav"
+            blob = self.bucket.blob(chunk_name, chunk_size=self.settings.upload_chunk_size_mb * 1024 * 1024)
+            writer = await loop.run_in_executor(
+                None,
+                lambda: blob.open("wb", content_type="audio/wav", ignore_flush=True)
+            )
+            start_byte, end_byte = byte_ranges[index]
+            await loop.run_in_executor(None, writer.write, wav_header(sample_rate, end_byte - start_byte))
+            chunks[index]["gcs_uri"] = f"gs://{self.bucket_name}/{chunk_name}"
+            writers[index] = writer
+
+        closed = 0
+
+        async def _close_completed(completed: int):
+            # Closing a writer uploads its final part and finalizes the chunk
+            nonlocal closed
+            while closed < completed:
+                if closed not in writers:
+                    await _open(closed)
+                await loop.run_in_executor(None, writers.pop(closed).close)
+                closed += 1
+
+        splitter = PcmRangeSplitter(byte_ranges)
+
+        async def _route(data: bytes):
+            for index, piece in splitter.split(data):
+                if index not in writers:
+                    await _open(index)
+                await loop.run_in_executor(None, writers[index].write, piece)
+            await _close_completed(splitter.completed)
+
+        # Writers left open when decoding fails abandon their resumable
+        # sessions, so no partial chunks are created
+        await self._stream_pcm(gcs_uri, _route)
+        if splitter.position != pcm_bytes:
+            raise RuntimeError(f"Decoded {splitter.position} bytes of PCM, expected {pcm_bytes}")
+        await _close_completed(len(chunks))
+        return chunks
+
+    async def _stream_pcm(
+        self,
+        gcs_uri: str,
+        consume: Callable[[bytes], Awaitable[None]],
+        audio_filter: Optional[str] = None
+    ) -> List[str]:
+        """Decode an audio/video object with FFmpeg and pass on the 16-bit mono PCM in blocks.
+
+        The object is streamed into FFmpeg's stdin (or downloaded to a temp
+        file first when FFmpeg needs to seek in it) and the PCM is read from
+        FFmpeg's stdout, so the decoded audio is never written to disk.
+
+        Args:
+            gcs_uri: GCS URI of the audio/video file
+            consume: Coroutine function called with each block of PCM, in order
+            audio_filter: Optional FFmpeg audio filter (e.g. ``silencedetect``)
+
+        Returns:
+            Log lines written by the audio filter
+        """
+        loop = asyncio.get_event_loop()
+        bucket_name, blob_name = self._parse_gcs_uri(gcs_uri)
+        source_blob = self.get_bucket(bucket_name).blob(blob_name)
+        filter_name = audio_filter.split("=", 1)[0] if audio_filter else None
+        read_size = self.settings.ffmpeg_stream_chunk_size_kb * 1024
+
+        input_path = None
+        try:
+            if await self._needs_seekable_input(source_blob):
+                with tempfile.NamedTemporaryFile(suffix=os.path.splitext(blob_name)[1], delete=False) as input_file:
+                    input_path = input_file.name
+                await loop.run_in_executor(None, source_blob.download_to_filename, input_path)
+
+            command = [
+                self.settings.ffmpeg_path,
+                "-hide_banner",
+                "-nostats",
+                "-i", input_path or "pipe:0",
+                "-vn",
+                *(["-af", audio_filter] if audio_filter else []),
+                "-ac", "1",
+                "-ar", str(self.settings.ffmpeg_sample_rate),
+                "-f", "s16le",
+                "pipe:1",
+            ]
+
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdin=asyncio.subprocess.DEVNULL if input_path else asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+
+            filter_lines: List[str] = []
+            error_tail: List[str] = []
+
+            async def _read_stderr():
+                async for raw_line in process.stderr:
+                    line = raw_line.decode("utf-8", errors="replace")
+                    if filter_name and f"[{filter_name} @" in line:
+                        filter_lines.append(line)
+                    else:
+                        error_tail.append(line)
+                        del error_tail[:-50]
+
+            async def _read_stdout():
+                buffer = bytearray()
+                while True:
+                    chunk = await process.stdout.read(read_size)
+                    if not chunk:
+                        break
+                    buffer += chunk
+                    if len(buffer) >= read_size:
+                        await consume(bytes(buffer))
+                        buffer.clear()
+                if buffer:
+                    await consume(bytes(buffer))
+
+            tasks = [_read_stderr(), _read_stdout()]
+            if not input_path:
+                tasks.append(self._feed_blob_to_stdin(source_blob, process))
+            try:
+                await asyncio.gather(*tasks)
+                returncode = await process.wait()
+            except BaseException:
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                raise
+
+            if returncode != 0:
+                raise RuntimeError(f"FFmpeg error: {''.join(error_tail)}")
+
+            return filter_lines
+
+        finally:
+            if input_path:
+                os.unlink(input_path)
+
+    async def trim_silence(
+        self,
+        gcs_uri: str,
+        job_id: str,
+        audio_format: Optional[AudioFormat] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Remove non-speech stretches from an audio file before recognition.
+
+        The audio is decoded to 16-bit mono PCM twice, streaming through a
+        pipe instead of to disk. In the first pass a NumPy energy/zero-crossing
+        voice activity detector finds the speech regions; in the second the
+        speech, with ``silence_trimming_gap_seconds`` of silence between
+        regions, is encoded to ``audio_format`` and uploaded under
+        ``trimmed/{job_id}/`` in the upload bucket.
+
+        Args:
+            gcs_uri: GCS URI of the audio file
+            job_id: Job the audio belongs to, which keeps object names unique
+            audio_format: Format of the trimmed audio (default: the configured policy)
+
+        Returns:
+            Dictionary with the trimmed ``gcs_uri``, the ``offset_map`` back to
+            original time, ``original_seconds`` and ``removed_seconds``; None
+            when less than ``silence_trimming_min_saved_seconds`` would be removed
+        """
+        audio_format = audio_format or choose_intermediate_format(self.settings)
+        loop = asyncio.get_event_loop()
+        _, blob_name = self._parse_gcs_uri(gcs_uri)
+        sample_rate = self.settings.ffmpeg_sample_rate
+        frame_ms = self.settings.vad_frame_ms
+        gap_seconds = self.settings.silence_trimming_gap_seconds
+
+        features = StreamingFrameFeatures(sample_rate, frame_ms)
+
+        async def _analyse(data: bytes):
+            await loop.run_in_executor(None, features.feed, data)
+
+        await self._stream_pcm(gcs_uri, _analyse)
+
+        duration = features.duration
+        energies, crossings = features.result()
+        is_speech = speech_frames(energies, crossings, margin_db=self.settings.vad_threshold_margin_db)
+        regions = speech_regions(
+            is_speech,
+            frame_ms / 1000,
+            duration,
+            min_silence_seconds=self.settings.silence_trimming_min_silence_seconds,
+            padding_seconds=self.settings.silence_trimming_padding_seconds
+        )
+
+        kept = sum(end - start for start, end in regions)
+        removed = duration - kept - gap_seconds * max(len(regions) - 1, 0)
+        if not regions or removed < self.settings.silence_trimming_min_saved_seconds:
+            return None
+
+        byte_ranges = [
+            (int(start * sample_rate) * 2, int(end * sample_rate) * 2)
+            for start, end in regions
+        ]
+        gap = bytes(int(gap_seconds * sample_rate) * 2)
+        trimmed_bytes = sum(end - start for start, end in byte_ranges) + len(gap) * (len(byte_ranges) - 1)
+
+        stem = os.path.splitext(blob_name.split("/")[-1])[0]
+        trimmed_name = f"trimmed/{job_id}/{stem}_speech{audio_format.extension}"
+        trimmed_blob = self.bucket.blob(
+            trimmed_name,
+            chunk_size=self.settings.upload_chunk_size_mb * 1024 * 1024
+        )
+        # FLAC and Ogg headers written to a pipe do not contain the duration
+        trimmed_blob.metadata = {"duration_seconds": f"{trimmed_bytes / 2 / sample_rate:.3f}"}
+
+        encoder = PcmEncoder(self.settings, trimmed_blob, audio_format)
+        splitter = PcmRangeSplitter(byte_ranges)
+        current = None
+
+        async def _encode(data: bytes):
+            nonlocal current
+            for index, piece in splitter.split(data):
+                if index != current:
+                    if current is not None and gap:
+                        await encoder.write(gap)
+                    current = index
+                await encoder.write(piece)
+
+        await encoder.start()
+        try:
+            await self._stream_pcm(gcs_uri, _encode)
+            await encoder.close()
+        except BaseException:
+            await encoder.abort()
+            raise
+
+        return {
+            "gcs_uri": f"gs://{self.bucket_name}/{trimmed_name}",
+            "offset_map": OffsetMap.from_regions(regions, gap_seconds),
+            "original_seconds": duration,
+            "removed_seconds": removed,
+        }
+
+    async def _extract_audio_from_disk(
+        self,
+        source_blob: Blob,
+        audio_blob: Blob,
+        audio_format: AudioFormat
+    ) -> Optional[float]:
+        """Extract audio through temp files, for inputs that need seeking.
+
+        The input is downloaded and the output uploaded in chunks, so only the
+        disk usage grows with the file size.
+
+        Returns:
+            Duration of the extracted audio in seconds, if FFmpeg reported it
+        """
+        loop = asyncio.get_event_loop()
+        suffix = os.path.splitext(source_blob.name)[1] or ".mp4"
+
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as video_file:
             video_path = video_file.name
-        
+
+        audio_path = None
         try:
+            await loop.run_in_executor(None, source_blob.download_to_filename, video_path)
+
             # Extract audio using FFmpeg
-            audio_path = await self._extract_audio_ffmpeg(video_path)
-            
-            # Read extracted audio
-            with open(audio_path, "rb") as audio_file:
-                audio_content = audio_file.read()
-            
-            # Generate filename for audio
-            video_filename = video_gcs_uri.split("/")[-1]
-            audio_filename = os.path.splitext(video_filename)[0] + "_audio.wav"
-            
-            # Upload audio to GCS
-            audio_gcs_uri = await self.upload_file(
-                audio_content,
-                audio_filename,
-                "audio/wav"
+            audio_path, duration = await self._extract_audio_ffmpeg(video_path, audio_format)
+
+            await loop.run_in_executor(
+                None,
+                lambda: audio_blob.upload_from_filename(audio_path, content_type=audio_format.content_type)
             )
-            
-            # Clean up temp files
-            os.unlink(audio_path)
-            
-            return audio_gcs_uri
-            
+            return duration
         finally:
-            # Always clean up video temp file
+            # Always clean up temp files
             os.unlink(video_path)
-    
-    async def _extract_audio_ffmpeg(self, video_path: str) -> str:
+            if audio_path and os.path.exists(audio_path):
+                os.unlink(audio_path)
+
+    async def _extract_audio_ffmpeg(
+        self,
+        video_path: str,
+        audio_format: AudioFormat
+    ) -> Tuple[str, Optional[float]]:
         """Extract audio from video using FFmpeg.
         
         Args:
             video_path: Path to video file
+            audio_format: Intermediate audio format
             
         Returns:
-            Path to extracted audio file
+            Tuple of the path to the extracted audio file and its duration in seconds
         """
         # Create output filename
-        audio_path = os.path.splitext(video_path)[0] + ".wav"
+        audio_path = os.path.splitext(video_path)[0] + "_audio" + audio_format.extension
         
         # Construct FFmpeg command
         command = [
             self.settings.ffmpeg_path,
             "-i", video_path,
-            "-vn",  # No video
-            "-acodec", self.settings.ffmpeg_audio_codec,
-            "-ar", str(self.settings.ffmpeg_sample_rate),
-            "-ac", str(self.settings.ffmpeg_channels),
+            *self._ffmpeg_audio_args(audio_format),
             "-y",  # Overwrite output
             audio_path
         ]
         
-        # Run FFmpeg in executor
-        loop = asyncio.get_event_loop()
-        process = await loop.run_in_executor(
-            None,
-            lambda: subprocess.run(command, capture_output=True, text=True)
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
         )
+        _, stderr = await process.communicate()
         
+        stderr_text = stderr.decode('utf-8', errors='replace')
         if process.returncode != 0:
-            raise RuntimeError(f"FFmpeg error: {process.stderr}")
+            raise RuntimeError(f"FFmpeg error: {stderr_text}")
         
-        return audio_path
+        return audio_path, parse_ffmpeg_duration(stderr_text)
     
     async def list_files(self, prefix: Optional[str] = None) -> list:
         """List files in the bucket.
@@ -484,6 +1715,113 @@ class StorageService:
         
         return exists
     
+    async def get_object_checksums(self, gcs_uri: str) -> dict:
+        """Get the content checksums GCS keeps for an object.
+        
+        Args:
+            gcs_uri: GCS URI of the object
+            
+        Returns:
+            Dictionary with base64 ``crc32c`` and ``md5_hash`` (None for
+            composite objects) and the object ``size``
+        """
+        bucket_name, blob_name = self._parse_gcs_uri(gcs_uri)
+        blob = self.get_bucket(bucket_name).blob(blob_name)
+        
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, blob.reload)
+        
+        return {
+            "crc32c": blob.crc32c,
+            "md5_hash": blob.md5_hash,
+            "size": blob.size,
+        }
+    
+    async def get_audio_duration(self, gcs_uri: str) -> Optional[float]:
+        """Get the duration of an audio file.
+        
+        Extracted audio carries its duration in the object metadata. For other
+        WAV files the duration is computed from the header and object size:
+        only the first few kilobytes are downloaded, and the data chunk size in
+        the header is ignored because FFmpeg cannot fill it in when writing to
+        a pipe.
+        
+        Args:
+            gcs_uri: GCS URI of the audio file
+            
+        Returns:
+            Duration in seconds, or None for other formats or unreadable headers
+        """
+        bucket_name, blob_name = self._parse_gcs_uri(gcs_uri)
+        
+        loop = asyncio.get_event_loop()
+        try:
+            blob = self.get_bucket(bucket_name).blob(blob_name)
+            await loop.run_in_executor(None, blob.reload)
+        except Exception as exc:
+            print(f"Could not read metadata of {gcs_uri}: {exc}")
+            return None
+        
+        duration = (blob.metadata or {}).get("duration_seconds")
+        if duration:
+            try:
+                return float(duration)
+            except ValueError:
+                pass
+        
+        if not gcs_uri.lower().endswith(".wav"):
+            return None
+        
+        try:
+            header = await loop.run_in_executor(
+                None, lambda: blob.download_as_bytes(start=0, end=4095)
+            )
+        except Exception as exc:
+            print(f"Could not read WAV header of {gcs_uri}: {exc}")
+            return None
+        
+        if header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            return None
+        
+        byte_rate: Optional[int] = None
+        offset = 12
+        while offset + 8 <= len(header):
+            chunk_id = header[offset:offset + 4]
+            chunk_size = struct.unpack("<I", header[offset + 4:offset + 8])[0]
+            if chunk_id == b"fmt " and offset + 20 <= len(header):
+                byte_rate = struct.unpack("<I", header[offset + 16:offset + 20])[0]
+            elif chunk_id == b"data":
+                if not byte_rate:
+                    return None
+                return (int(blob.size) - (offset + 8)) / byte_rate
+            offset += 8 + chunk_size + (chunk_size % 2)
+        
+        return None
+    
+    async def get_opus_sample_rate(self, gcs_uri: str) -> Optional[int]:
+        """Read the input sample rate from the ``OpusHead`` of an Ogg Opus file.
+        
+        Args:
+            gcs_uri: GCS URI of the Ogg Opus file
+            
+        Returns:
+            Sample rate in Hz, or None if the header cannot be read
+        """
+        bucket_name, blob_name = self._parse_gcs_uri(gcs_uri)
+        blob = self.get_bucket(bucket_name).blob(blob_name)
+        
+        loop = asyncio.get_event_loop()
+        try:
+            header = await loop.run_in_executor(None, lambda: blob.download_as_bytes(start=0, end=255))
+        except Exception as exc:
+            print(f"Could not read Opus header of {gcs_uri}: {exc}")
+            return None
+        
+        position = header.find(b"OpusHead")
+        if position < 0 or position + 16 > len(header):
+            return None
+        return struct.unpack("<I", header[position + 12:position + 16])[0] or None
+    
     async def get_file_metadata(self, filename: str) -> dict:
         """Get metadata for a file in GCS.
         
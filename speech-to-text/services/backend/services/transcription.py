@@ -1,44 +1,112 @@
 """Transcription service using Google Cloud Speech-to-Text API."""
 
 import asyncio
+import hashlib
 import os
-from typing import Optional, List, Tuple, Dict, Any
+from typing import Optional, List, Tuple, Dict, Any, Awaitable, Callable
 from google.cloud import speech
-from google.api_core import client_options
-from google.cloud.speech_v2 import SpeechClient
+from google.cloud.speech_v2 import SpeechAsyncClient
 from google.cloud.speech_v2.types import cloud_speech
 from .speaker_identification import SpeakerIdentificationService
+from .chunking import merge_chunk_segments
+from .cache import ResultCache, make_cache_key
+from .scheduler import StageLimiter, STAGE_RECOGNITION, STAGE_SPEAKER_IDENTIFICATION
+from .clients import speech_v1_client, speech_v2_client
 
 
 class TranscriptionService:
     """Service for handling speech transcription operations."""
     
-    def __init__(self, settings):
+    def __init__(
+        self,
+        settings,
+        stage_limiter: Optional[StageLimiter] = None,
+        storage_service=None,
+        recognition_cache: Optional[ResultCache] = None,
+        speaker_cache: Optional[ResultCache] = None
+    ):
         """Initialize the transcription service.
         
         Args:
             settings: Application settings
+            stage_limiter: Shared per-stage concurrency limits (unlimited if omitted)
+            storage_service: Storage service used to split audio for chunked
+                recognition and to read object checksums for caching
+            recognition_cache: Cache for raw recognition output
+            speaker_cache: Cache for speaker identification results
         """
         self.settings = settings
         self.project_id = settings.gcp_project_id
         self.location = settings.recognizer_location
+        self.stage_limiter = stage_limiter or StageLimiter()
+        self.storage_service = storage_service
+        self.recognition_cache = recognition_cache
+        self.speaker_cache = speaker_cache
         
-        # Initialize Speech clients
-        self._init_clients()
+        # Async Speech clients come from the shared client registry and are
+        # created on first use to keep startup fast. They share the event loop,
+        # so waiting on operations costs no threads; they must therefore be
+        # created from the event loop thread.
         
-        # Initialize Speaker Identification service
+        # Initialize Speaker Identification service (the LLM client is lazy too)
         self.speaker_identification = SpeakerIdentificationService(settings)
     
-    def _init_clients(self):
-        """Initialize Google Cloud Speech clients."""
-        # Configure client to use regional endpoint for v2
-        client_options_var = client_options.ClientOptions(
-            api_endpoint=f"{self.location}-speech.googleapis.com"
-        )
-        self.speech_client_v2 = SpeechClient(client_options=client_options_var)
-        
+    @property
+    def speech_client_v2(self) -> SpeechAsyncClient:
+        client: SpeechAsyncClient = speech_v2_client(self.settings, self.location)
+        return client
+    
+    @property
+    def speech_client_v1(self) -> speech.SpeechAsyncClient:
         # V1 client for fallback operations
-        self.speech_client_v1 = speech.SpeechClient()
+        client: speech.SpeechAsyncClient = speech_v1_client(self.settings)
+        return client
+    
+    async def warm_up(self) -> None:
+        """Create the Speech and LLM clients ahead of the first job."""
+        speech_v2_client(self.settings, self.location)
+        speech_v1_client(self.settings)
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self.speaker_identification.warm_up)
+    
+    async def _wait_for_operation(
+        self,
+        operation,
+        on_metadata: Optional[Callable[[Any], Awaitable[None]]] = None
+    ):
+        """Wait for a long-running operation without holding a thread.
+        
+        The operation is polled with exponential backoff, starting at
+        ``operation_poll_initial_seconds`` and growing to at most
+        ``operation_poll_interval_seconds``.
+        
+        Args:
+            operation: Async long-running operation
+            on_metadata: Coroutine called with the operation metadata after
+                every poll that finds the operation still running
+            
+        Returns:
+            Operation result
+        """
+        timeout = self.settings.transcription_timeout_minutes * 60
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + timeout
+        delay = self.settings.operation_poll_initial_seconds
+        
+        while not await operation.done():
+            if on_metadata is not None and operation.metadata is not None:
+                await on_metadata(operation.metadata)
+            
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise TimeoutError(
+                    f"Operation did not finish within {self.settings.transcription_timeout_minutes} minutes"
+                )
+            
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 1.5, self.settings.operation_poll_interval_seconds)
+        
+        return await operation.result()
 
     @staticmethod
     def _duration_to_seconds(duration: Any) -> Optional[float]:
@@ -144,13 +212,7 @@ class TranscriptionService:
         )
         
         try:
-            # Run in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                self.speech_client_v2.get_recognizer,
-                {"name": recognizer_name}
-            )
+            await self.speech_client_v2.get_recognizer(name=recognizer_name)
             return True
         except Exception:
             return False
@@ -193,17 +255,10 @@ class TranscriptionService:
             ),
         )
         
-        # Run in executor to avoid blocking
-        loop = asyncio.get_event_loop()
-        operation = await loop.run_in_executor(
-            None,
-            self.speech_client_v2.create_recognizer,
-            request
-        )
+        operation = await self.speech_client_v2.create_recognizer(request=request)
         
         # Wait for operation to complete
-        result = await loop.run_in_executor(None, operation.result)
-        return result
+        return await self._wait_for_operation(operation)
     
     async def transcribe_audio(
         self,
@@ -213,7 +268,9 @@ class TranscriptionService:
         enable_diarization: bool = False,
         enable_speaker_identification: bool = False,
         min_speaker_count: int = 2,
-        max_speaker_count: int = 10
+        max_speaker_count: int = 10,
+        on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+        job_id: Optional[str] = None
     ) -> Tuple[str, List[Dict[str, Any]], Optional[str], Optional[Dict[str, Any]], Optional[str]]:
         """Transcribe audio from Google Cloud Storage.
         
@@ -225,6 +282,8 @@ class TranscriptionService:
             enable_speaker_identification: Enable LLM-based speaker identification
             min_speaker_count: Minimum number of speakers
             max_speaker_count: Maximum number of speakers
+            on_progress: Coroutine called with the recognition progress percent
+            job_id: Job the audio belongs to, which names its chunks
             
         Returns:
             Tuple of (
@@ -252,21 +311,142 @@ class TranscriptionService:
             }
         )
 
-        if recognizer_to_use and self.location in ["us", "europe-west4"]:
-            transcript, transcript_segments = await self._transcribe_v2(
-                gcs_uri,
-                recognizer_to_use,
-                language_code or self.settings.default_language_code
-            )
-        else:
-            transcript, transcript_segments = await self._transcribe_v1(
-                gcs_uri,
+        async def recognize(
+            uri: str,
+            on_uri_progress: Optional[Callable[[str, int], Awaitable[None]]] = None
+        ) -> Tuple[str, List[Dict[str, Any]]]:
+            if recognizer_to_use and self.location in ["us", "europe-west4"]:
+                return await self._transcribe_v2(
+                    uri,
+                    recognizer_to_use,
+                    language_code or self.settings.default_language_code,
+                    on_uri_progress
+                )
+            return await self._transcribe_v1(
+                uri,
                 language_code,
                 use_diarization,
                 min_speaker_count,
-                max_speaker_count
+                max_speaker_count,
+                on_uri_progress
+            )
+
+        async def report_progress(uri: str, progress: int):
+            if on_progress is not None:
+                await on_progress(progress)
+
+        # Speaker tags are not consistent across chunks, so diarized audio is
+        # always recognised as a whole.
+        use_chunking = (
+            self.settings.chunked_recognition
+            and self.storage_service is not None
+            and not use_diarization
+        )
+
+        cache_key = await self._recognition_cache_key(
+            gcs_uri,
+            api_version="v2" if recognizer_to_use and self.location in ["us", "europe-west4"] else "v1",
+            recognizer_id=recognizer_to_use,
+            language_code=language_code or self.settings.default_language_code,
+            diarization=use_diarization,
+            chunked=use_chunking,
+            min_speaker_count=min_speaker_count if use_diarization else None,
+            max_speaker_count=max_speaker_count if use_diarization else None,
+        )
+        cached = None
+        if cache_key and self.recognition_cache is not None:
+            cached = await self.recognition_cache.get(cache_key)
+
+        if cached is not None:
+            print(f"Recognition cache hit for {gcs_uri}")
+            transcript, transcript_segments = cached["transcript"], cached["segments"]
+        else:
+            async with self.stage_limiter.stage(STAGE_RECOGNITION):
+                if use_chunking:
+                    transcript, transcript_segments = await self._transcribe_chunked(gcs_uri, recognize, on_progress, job_id)
+                else:
+                    transcript, transcript_segments = await recognize(gcs_uri, report_progress)
+
+            if on_progress is not None:
+                await on_progress(100)
+
+            # Empty results are not cached so a later retry can succeed
+            if cache_key and self.recognition_cache is not None and (transcript.strip() or transcript_segments):
+                await self.recognition_cache.set(cache_key, {"transcript": transcript, "segments": transcript_segments})
+
+        speaker_transcript, speaker_summary, refined_transcript = await self.apply_speaker_identification(
+            transcript,
+            transcript_segments,
+            enable_speaker_identification
+        )
+
+        return transcript, transcript_segments, speaker_transcript, speaker_summary, refined_transcript
+
+    async def _recognition_cache_key(self, gcs_uri: str, **config: Any) -> Optional[str]:
+        """Build the recognition cache key from the audio checksum and recognition config.
+
+        Returns None when caching is disabled or the checksum cannot be read.
+        """
+        if self.recognition_cache is None or self.storage_service is None:
+            return None
+
+        try:
+            checksums = await self.storage_service.get_object_checksums(gcs_uri)
+        except Exception as exc:
+            print(f"Could not read checksums for {gcs_uri}: {exc}")
+            return None
+
+        content_hash = checksums.get("crc32c") or checksums.get("md5_hash")
+        if not content_hash:
+            return None
+
+        return make_cache_key(
+            crc32c=checksums.get("crc32c"),
+            md5=checksums.get("md5_hash"),
+            size=checksums.get("size"),
+            model=self.settings.speech_model,
+            location=self.location,
+            **config
+        )
+
+    async def _identify_speakers_cached(self, transcript: str) -> Dict[str, Any]:
+        """Run speaker identification, reusing cached results for identical transcripts."""
+        cache_key = None
+        if self.speaker_cache is not None:
+            cache_key = make_cache_key(
+                transcript_sha256=hashlib.sha256(transcript.encode("utf-8")).hexdigest(),
+                model=getattr(self.speaker_identification.llm, "model_name", None),
             )
+            cached: Optional[Dict[str, Any]] = await self.speaker_cache.get(cache_key)
+            if cached is not None:
+                print("Speaker identification cache hit")
+                return cached
+
+        async with self.stage_limiter.stage(STAGE_SPEAKER_IDENTIFICATION):
+            identification_result = await self.speaker_identification.identify_speakers(transcript)
+
+        # Fallback responses are not cached so a later retry can succeed
+        if cache_key and self.speaker_cache is not None and identification_result.get("speakers_identified"):
+            await self.speaker_cache.set(cache_key, identification_result)
+
+        return identification_result
+
+    async def apply_speaker_identification(
+        self,
+        transcript: str,
+        transcript_segments: List[Dict[str, Any]],
+        enable_speaker_identification: bool
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]], Optional[str]]:
+        """Run LLM speaker identification and attach refined text to the segments.
+
+        Args:
+            transcript: Recognised transcript text
+            transcript_segments: Recognised segments; updated in place with ``refined_text``
+            enable_speaker_identification: Whether speaker identification was requested
 
+        Returns:
+            Tuple of (speaker-identified transcript, speaker summary, refined transcript text)
+        """
         speaker_transcript: Optional[str] = None
         speaker_summary: Optional[Dict[str, Any]] = None
         refined_transcript: Optional[str] = None
@@ -275,7 +455,7 @@ class TranscriptionService:
         # Apply speaker identification if enabled
         if enable_speaker_identification:
             try:
-                identification_result = await self.speaker_identification.identify_speakers(transcript)
+                identification_result = await self._identify_speakers_cached(transcript)
                 speaker_transcript = self.speaker_identification.format_transcript_with_speakers(identification_result)
                 speaker_summary = self.speaker_identification.get_speaker_summary(identification_result)
                 refined_transcript = self.speaker_identification.get_refined_transcript(identification_result)
@@ -296,7 +476,75 @@ class TranscriptionService:
                     if refined_value:
                         segment["refined_text"] = refined_value
 
-        return transcript, transcript_segments, speaker_transcript, speaker_summary, refined_transcript
+        return speaker_transcript, speaker_summary, refined_transcript
+
+    async def _transcribe_chunked(
+        self,
+        gcs_uri: str,
+        recognize: Callable[..., Awaitable[Tuple[str, List[Dict[str, Any]]]]],
+        on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+        job_id: Optional[str] = None
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """Recognise long audio as overlapping chunks running concurrently.
+
+        Args:
+            gcs_uri: GCS URI of the audio file
+            recognize: Coroutine function transcribing a single GCS URI, with
+                an optional per-URI progress callback
+            on_progress: Coroutine called with the overall progress percent,
+                weighted by chunk length
+            job_id: Job the audio belongs to, which names its chunks
+
+        Returns:
+            Tuple containing the merged transcript text and segment metadata
+        """
+        chunks = await self.storage_service.split_audio_for_recognition(
+            gcs_uri,
+            chunk_seconds=self.settings.chunk_minutes * 60,
+            overlap_seconds=self.settings.chunk_overlap_seconds,
+            job_id=job_id
+        )
+
+        async def report_progress(uri: str, progress: int):
+            if on_progress is not None:
+                await on_progress(progress)
+
+        if len(chunks) == 1:
+            return await recognize(gcs_uri, report_progress)
+
+        print(f"Recognising {gcs_uri} as {len(chunks)} chunks")
+        semaphore = asyncio.Semaphore(max(1, self.settings.chunk_concurrency))
+
+        chunk_weights = {
+            chunk["gcs_uri"]: chunk["end_seconds"] - chunk["start_seconds"]
+            for chunk in chunks
+        }
+        total_weight = sum(chunk_weights.values()) or 1.0
+        chunk_progress: Dict[str, int] = {}
+
+        async def report_chunk_progress(uri: str, progress: int):
+            chunk_progress[uri] = progress
+            if on_progress is not None:
+                overall = sum(chunk_weights[key] * value for key, value in chunk_progress.items())
+                await on_progress(int(overall / total_weight))
+
+        async def recognize_chunk(chunk: Dict[str, Any]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                _, segments = await recognize(chunk["gcs_uri"], report_chunk_progress)
+            await report_chunk_progress(chunk["gcs_uri"], 100)
+            return segments
+
+        try:
+            chunk_segments = await asyncio.gather(*(recognize_chunk(chunk) for chunk in chunks))
+        finally:
+            cleanup = [
+                self.storage_service.delete_file(chunk["gcs_uri"])
+                for chunk in chunks
+                if chunk["gcs_uri"] != gcs_uri
+            ]
+            await asyncio.gather(*cleanup, return_exceptions=True)
+
+        return merge_chunk_segments(chunks, chunk_segments)
 
     def _align_refined_segments(
         self,
@@ -361,74 +609,159 @@ class TranscriptionService:
         self,
         gcs_uri: str,
         recognizer_id: str,
-        language_code: str
+        language_code: str,
+        on_progress: Optional[Callable[[str, int], Awaitable[None]]] = None
     ) -> Tuple[str, List[Dict[str, Any]]]:
         """Transcribe using Speech-to-Text v2 API with recognizer.
         
         Args:
             gcs_uri: GCS URI of the audio file
             recognizer_id: Recognizer ID to use
+            language_code: Language code for transcription
+            on_progress: Coroutine called with (gcs_uri, progress percent)
             
         Returns:
             Tuple containing transcript text and segment metadata
         """
-        recognizer_name = (
-            f"projects/{self.project_id}/locations/{self.location}/"
-            f"recognizers/{recognizer_id}"
-        )
+        response = await self._batch_recognize_v2([gcs_uri], recognizer_id, language_code, on_progress)
         
-        # Configure recognition
+        # Parse the transcript
+        return self._parse_v2_transcript(response, gcs_uri)
+
+    async def transcribe_batch(
+        self,
+        gcs_uris: List[str],
+        recognizer_id: Optional[str],
+        language_code: str,
+        on_progress: Optional[Callable[[str, int], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
+        """Transcribe many files that share a recognizer and language.
+
+        Files are submitted together in ``BatchRecognize`` operations of at most
+        ``batch_recognize_max_files`` files each. Without a v2 recognizer the
+        files are transcribed one by one with the v1 API.
+
+        Args:
+            gcs_uris: GCS URIs of the audio files
+            recognizer_id: Recognizer ID (defaults to the configured recognizer)
+            language_code: Language code for transcription
+            on_progress: Coroutine called with (gcs_uri, progress percent)
+
+        Returns:
+            Mapping of GCS URI to a (transcript, segments) tuple, or to the
+            exception that made that file fail
+        """
+        recognizer_to_use = recognizer_id or self.settings.default_recognizer_id
+        language_code = language_code or self.settings.default_language_code
+        results: Dict[str, Any] = {}
+
+        if not (recognizer_to_use and self.location in ["us", "europe-west4"]):
+            async def recognize_v1(uri: str):
+                try:
+                    results[uri] = await self._transcribe_v1(uri, language_code, False, 2, 10, on_progress)
+                except Exception as exc:
+                    results[uri] = exc
+
+            await asyncio.gather(*(recognize_v1(uri) for uri in gcs_uris))
+            return results
+
+        batch_size = max(1, self.settings.batch_recognize_max_files)
+        batches = [gcs_uris[i:i + batch_size] for i in range(0, len(gcs_uris), batch_size)]
+
+        async def recognize_batch(batch: List[str]):
+            try:
+                response = await self._batch_recognize_v2(batch, recognizer_to_use, language_code, on_progress)
+            except Exception as exc:
+                for uri in batch:
+                    results[uri] = exc
+                return
+
+            for uri in batch:
+                try:
+                    results[uri] = self._parse_v2_transcript(response, uri)
+                except Exception as exc:
+                    results[uri] = exc
+
+        await asyncio.gather(*(recognize_batch(batch) for batch in batches))
+        return results
+
+    def _build_v2_config(self, language_code: str) -> cloud_speech.RecognitionConfig:
+        """Build the v2 recognition config used for batch requests."""
         features = cloud_speech.RecognitionFeatures(
             enable_automatic_punctuation=True,
             enable_word_confidence=True,
             enable_word_time_offsets=True,
         )
 
-        config = cloud_speech.RecognitionConfig(
+        return cloud_speech.RecognitionConfig(
             auto_decoding_config=cloud_speech.AutoDetectDecodingConfig(),
             language_codes=[language_code or self.settings.default_language_code],
             model=self.settings.speech_model,
             features=features,
         )
+
+    async def _batch_recognize_v2(
+        self,
+        gcs_uris: List[str],
+        recognizer_id: str,
+        language_code: str,
+        on_progress: Optional[Callable[[str, int], Awaitable[None]]] = None
+    ):
+        """Run one ``BatchRecognize`` operation over one or more files.
+
+        Args:
+            gcs_uris: GCS URIs of the audio files
+            recognizer_id: Recognizer ID to use
+            language_code: Language code for transcription
+            on_progress: Coroutine called with (gcs_uri, progress percent)
+
+        Returns:
+            Batch recognize response
+        """
+        recognizer_name = (
+            f"projects/{self.project_id}/locations/{self.location}/"
+            f"recognizers/{recognizer_id}"
+        )
+        
+        # Configure recognition
+        config = self._build_v2_config(language_code)
         print(
             "V2 recognition request:",
             {
                 "recognizer": recognizer_name,
                 "language_codes": config.language_codes,
                 "model": config.model,
+                "files": len(gcs_uris),
             }
         )
         
-        # Create file metadata
-        file_metadata = cloud_speech.BatchRecognizeFileMetadata(uri=gcs_uri)
-        
         # Create batch recognize request
         request = cloud_speech.BatchRecognizeRequest(
             recognizer=recognizer_name,
             config=config,
-            files=[file_metadata],
+            files=[cloud_speech.BatchRecognizeFileMetadata(uri=uri) for uri in gcs_uris],
             recognition_output_config=cloud_speech.RecognitionOutputConfig(
                 inline_response_config=cloud_speech.InlineOutputConfig(),
             ),
         )
         
-        # Run in executor to avoid blocking
-        loop = asyncio.get_event_loop()
-        operation = await loop.run_in_executor(
-            None,
-            self.speech_client_v2.batch_recognize,
-            request
-        )
+        operation = await self.speech_client_v2.batch_recognize(request=request)
         
-        # Wait for operation with timeout
-        response = await loop.run_in_executor(
-            None,
-            operation.result,
-            self.settings.transcription_timeout_minutes * 60
-        )
+        reported: Dict[str, int] = {}
         
-        # Parse the transcript
-        return self._parse_v2_transcript(response, gcs_uri)
+        async def report_metadata(metadata):
+            # Report per-file progress whenever it changes
+            if on_progress is None:
+                return
+            batch_metadata = getattr(metadata, "batch_recognize_metadata", None)
+            transcription_metadata = getattr(batch_metadata, "transcription_metadata", None) or {}
+            for uri, file_metadata in transcription_metadata.items():
+                progress = int(getattr(file_metadata, "progress_percent", 0) or 0)
+                if reported.get(uri) != progress:
+                    reported[uri] = progress
+                    await on_progress(uri, progress)
+        
+        return await self._wait_for_operation(operation, report_metadata)
     
     async def _transcribe_v1(
         self,
@@ -436,7 +769,8 @@ class TranscriptionService:
         language_code: str,
         enable_diarization: bool,
         min_speaker_count: int,
-        max_speaker_count: int
+        max_speaker_count: int,
+        on_progress: Optional[Callable[[str, int], Awaitable[None]]] = None
     ) -> Tuple[str, List[Dict[str, Any]]]:
         """Transcribe using Speech-to-Text v1 API.
         
@@ -446,6 +780,7 @@ class TranscriptionService:
             enable_diarization: Enable speaker diarization
             min_speaker_count: Minimum number of speakers
             max_speaker_count: Maximum number of speakers
+            on_progress: Coroutine called with (gcs_uri, progress percent)
             
         Returns:
             Tuple containing transcript text and segment metadata
@@ -472,6 +807,14 @@ class TranscriptionService:
         if encoding is not None:
             config_dict["encoding"] = encoding
 
+        # v1 reads the sample rate from WAV and FLAC headers, but needs it
+        # spelled out for Ogg Opus
+        if encoding == speech.RecognitionConfig.AudioEncoding.OGG_OPUS:
+            sample_rate = None
+            if self.storage_service is not None:
+                sample_rate = await self.storage_service.get_opus_sample_rate(gcs_uri)
+            config_dict["sample_rate_hertz"] = sample_rate or self.settings.ffmpeg_sample_rate
+
         # Add diarization if enabled
         if enable_diarization:
             config_dict["diarization_config"] = speech.SpeakerDiarizationConfig(
@@ -482,22 +825,24 @@ class TranscriptionService:
         
         config = speech.RecognitionConfig(**config_dict)
 
-        # Run in executor to avoid blocking
-        loop = asyncio.get_event_loop()
-        operation = await loop.run_in_executor(
-            None,
-            lambda: self.speech_client_v1.long_running_recognize(
-                config=config,
-                audio=audio
-            )
+        operation = await self.speech_client_v1.long_running_recognize(
+            config=config,
+            audio=audio
         )
         
+        last_progress: Optional[int] = None
+        
+        async def report_metadata(metadata):
+            nonlocal last_progress
+            if on_progress is None:
+                return
+            progress = int(getattr(metadata, "progress_percent", 0) or 0)
+            if progress != last_progress:
+                last_progress = progress
+                await on_progress(gcs_uri, progress)
+        
         # Wait for operation with timeout
-        response = await loop.run_in_executor(
-            None,
-            operation.result,
-            self.settings.transcription_timeout_minutes * 60
-        )
+        response = await self._wait_for_operation(operation, report_metadata)
         
         # Format the transcript
         if enable_diarization:
@@ -509,7 +854,13 @@ class TranscriptionService:
         self,
         gcs_uri: str
     ) -> Optional[speech.RecognitionConfig.AudioEncoding]:
-        """Infer the most suitable audio encoding from the GCS URI."""
+        """Infer the most suitable audio encoding from the GCS URI.
+
+        Covers the intermediate formats of ``services.audio_format`` (WAV,
+        FLAC and Ogg Opus) as well as uploaded audio. The v2 API keeps
+        ``AutoDetectDecodingConfig``, which reads the same formats from their
+        headers and lets one batch mix formats.
+        """
 
         filename = gcs_uri.rsplit('/', 1)[-1].lower()
         _, ext = os.path.splitext(filename)
@@ -540,11 +891,17 @@ class TranscriptionService:
             
         Returns:
             Parsed transcript text
+
+        Raises:
+            RuntimeError: If recognition of the file failed
         """
         if not response.results or gcs_uri not in response.results:
             return "", []
 
         file_result = response.results[gcs_uri]
+        error = getattr(file_result, "error", None)
+        if error is not None and getattr(error, "code", None):
+            raise RuntimeError(f"Recognition failed for {gcs_uri}: {error.message}")
 
         if not file_result.transcript or not file_result.transcript.results:
             return "", []
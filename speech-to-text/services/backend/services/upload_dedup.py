@@ -0,0 +1,254 @@
+"""Content-hash index of uploaded media, so repeated uploads can be skipped."""
+
+import base64
+import binascii
+import re
+from typing import Any, Dict, Iterable, Optional
+
+from .upload_sessions import (
+    InMemoryUploadSessionStore,
+    RedisUploadSessionStore,
+    UploadSessionStore,
+)
+
+# Digest length in bytes per supported algorithm. CRC32C is not accepted:
+# colliding content for a given checksum and size is trivial to construct.
+HASH_ALGORITHMS = {"md5": 16, "sha256": 32}
+
+# Field holding each hash in upload results and object info. GCS computes MD5
+# itself (except for composite objects); SHA-256 is only known when the file
+# was streamed through this service.
+HASH_FIELDS = {"md5": "md5_hash", "sha256": "sha256"}
+
+
+def normalize_content_hash(algorithm: str, value: str) -> str:
+    """Normalize a client-supplied content hash.
+
+    MD5 is returned base64-encoded, as GCS reports it; SHA-256 is returned
+    as lowercase hex. Both hex and base64 input are accepted.
+
+    Args:
+        algorithm: ``md5`` or ``sha256``
+        value: Hex or base64 digest
+
+    Returns:
+        Normalized digest
+
+    Raises:
+        ValueError: If the algorithm is unknown or the digest is malformed
+    """
+    algorithm = algorithm.lower()
+    if algorithm not in HASH_ALGORITHMS:
+        raise ValueError(f"Unsupported hash algorithm {algorithm}. Use one of: {', '.join(HASH_ALGORITHMS)}")
+
+    length = HASH_ALGORITHMS[algorithm]
+    value = value.strip()
+    if re.fullmatch(r"[0-9a-fA-F]+", value) and len(value) == 2 * length:
+        digest = bytes.fromhex(value)
+    else:
+        try:
+            digest = base64.b64decode(value, validate=True)
+        except (binascii.Error, ValueError):
+            digest = b""
+    if len(digest) != length:
+        raise ValueError(f"Malformed {algorithm} content hash")
+
+    if algorithm == "sha256":
+        return digest.hex()
+    return base64.b64encode(digest).decode("ascii")
+
+
+class UploadDedupIndex:
+    """Maps (hash algorithm, digest, size) to an uploaded object.
+
+    Only hashes this service verified itself are indexed, never a hash a
+    client declared: the MD5 GCS computed for an object, and the SHA-256
+    computed while an inline upload streamed through this service.
+    Otherwise any client could upload arbitrary bytes under the hash of a
+    popular file and have later uploads deduplicated onto them.
+
+    Requesting upload options with a hash records a *claim* on the new
+    object. When a direct upload completes (composite completion or the
+    first transcription of the object) it is indexed under the MD5 GCS
+    computed; composite objects have no MD5 and are not indexed. Entries
+    pin the object generation, and lookups re-check it, so deleted or
+    replaced objects are never returned.
+    """
+
+    def __init__(
+        self,
+        storage_service,
+        entries: UploadSessionStore,
+        claims: UploadSessionStore,
+        algorithms: Iterable[str] = tuple(HASH_ALGORITHMS)
+    ):
+        """Initialize the index.
+
+        Args:
+            storage_service: Storage service of the upload bucket
+            entries: Store for hash -> object entries
+            claims: Store for pending claims by object name
+            algorithms: Hash algorithms accepted for deduplication
+        """
+        self.storage_service = storage_service
+        self.entries = entries
+        self.claims = claims
+        self.algorithms = [algorithm for algorithm in algorithms if algorithm in HASH_ALGORITHMS]
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.indexed = 0
+        self.bytes_saved = 0
+
+    @staticmethod
+    def _key(algorithm: str, digest: str, size: int) -> str:
+        return f"{algorithm}:{digest}:{size}"
+
+    @staticmethod
+    def _matches(info: Dict[str, Any], entry: Dict[str, Any], algorithm: str, digest: str) -> bool:
+        """Whether the object is still the one that was indexed."""
+        if entry.get("generation") is None or info.get("generation") != entry["generation"]:
+            return False
+        if info.get("size") != entry["size"]:
+            return False
+        # GCS keeps the MD5 with the object; SHA-256 is pinned by the generation
+        return algorithm != "md5" or info.get("md5_hash") == digest
+
+    def normalize(self, algorithm: str, value: str) -> str:
+        """Normalize a hash, rejecting algorithms not enabled for deduplication."""
+        if algorithm.lower() not in self.algorithms:
+            raise ValueError(f"Hash algorithm {algorithm} is not accepted. Use one of: {', '.join(self.algorithms)}")
+        return normalize_content_hash(algorithm, value)
+
+    async def lookup(self, algorithm: str, digest: str, size: int) -> Optional[Dict[str, Any]]:
+        """Find a verified upload with this content.
+
+        Args:
+            algorithm: Hash algorithm
+            digest: Normalized digest
+            size: File size in bytes
+
+        Returns:
+            ``filename``, ``gcs_uri`` and ``size`` of the existing object, or None
+        """
+        key = self._key(algorithm, digest, size)
+        entry = await self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        info = await self.storage_service.get_upload_info(entry["filename"])
+        if info is None or not self._matches(info, entry, algorithm, digest):
+            await self.entries.delete(key)
+            self.stale += 1
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.bytes_saved += size
+        return entry
+
+    async def claim(self, filename: str, algorithm: str, digest: str, size: int) -> None:
+        """Remember that a client is about to upload an object, to index it once complete."""
+        await self.claims.save(filename, {"algorithm": algorithm, "digest": digest, "size": size})
+
+    async def confirm(self, filename: str) -> bool:
+        """Index a completed direct upload under the MD5 GCS computed for it.
+
+        The claimed digest is not trusted: the object is indexed under its
+        actual MD5, so a wrong claim only costs the client its own dedup.
+
+        Args:
+            filename: Object name in the upload bucket
+
+        Returns:
+            True if the object was indexed
+        """
+        claim = await self.claims.get(filename)
+        if claim is None:
+            return False
+
+        info = await self.storage_service.get_upload_info(filename)
+        if info is None:
+            # Not uploaded (yet); the claim expires with the upload session
+            return False
+        await self.claims.delete(filename)
+
+        if not info.get("md5_hash"):
+            # Composite objects have no MD5, and nothing else is verified here
+            print(f"Upload {filename} has no GCS MD5; not indexed")
+            return False
+        if claim["algorithm"] == "md5" and (info["md5_hash"] != claim["digest"] or info.get("size") != claim["size"]):
+            print(f"Upload {filename} does not match its declared md5; indexed under its actual MD5")
+        return await self.record(filename, info) > 0
+
+    async def record(self, filename: str, info: Dict[str, Any]) -> int:
+        """Index an object under the verified hashes in ``info``.
+
+        Args:
+            filename: Object name in the upload bucket
+            info: Object info from ``StorageService.get_upload_info``, or the
+                result of an upload streamed through this service (which
+                includes the SHA-256 computed while streaming)
+
+        Returns:
+            Number of hashes the object was indexed under
+        """
+        size = info.get("size")
+        if not size or info.get("generation") is None:
+            return 0
+        entry = {
+            "filename": filename,
+            "gcs_uri": f"gs://{self.storage_service.bucket_name}/{filename}",
+            "size": size,
+            "generation": info["generation"],
+        }
+        indexed = 0
+        for algorithm in self.algorithms:
+            digest = info.get(HASH_FIELDS[algorithm])
+            if digest:
+                await self.entries.save(self._key(algorithm, digest, size), entry)
+                indexed += 1
+        self.indexed += indexed
+        return indexed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit and miss counters, for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_entries": self.stale,
+            "indexed": self.indexed,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+        }
+
+
+def create_upload_dedup_index(settings, storage_service, redis_client=None) -> Optional[UploadDedupIndex]:
+    """Create the upload deduplication index from the settings.
+
+    Args:
+        settings: Application settings
+        storage_service: Storage service of the upload bucket
+        redis_client: Redis client of the job store, if any
+
+    Returns:
+        Configured index (shared via Redis when available), or None when disabled
+    """
+    if not settings.upload_dedup_enabled:
+        return None
+
+    entry_ttl = int(settings.upload_dedup_ttl_hours * 3600)
+    claim_ttl = int(settings.upload_session_ttl_hours * 3600)
+    entries: UploadSessionStore
+    claims: UploadSessionStore
+    if redis_client is not None:
+        entries = RedisUploadSessionStore(redis_client, entry_ttl, key_prefix="upload-hash:")
+        claims = RedisUploadSessionStore(redis_client, claim_ttl, key_prefix="upload-hash-claim:")
+    else:
+        entries = InMemoryUploadSessionStore(entry_ttl)
+        claims = InMemoryUploadSessionStore(claim_ttl)
+
+    algorithms = [algorithm.strip().lower() for algorithm in settings.upload_dedup_algorithms.split(",") if algorithm.strip()]
+    return UploadDedupIndex(storage_service, entries, claims, algorithms)
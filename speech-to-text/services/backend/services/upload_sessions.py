@@ -0,0 +1,154 @@
+"""Server-created resumable upload sessions and adaptive chunk sizing."""
+
+import json
+import time
+from typing import Any, Dict, Optional
+
+# GCS requires every chunk except the last to be a multiple of 256 KiB
+CHUNK_ALIGNMENT = 256 * 1024
+
+
+def recommend_chunk_size(
+    file_size: Optional[int],
+    throughput_bytes_per_second: Optional[float] = None,
+    target_chunk_seconds: float = 10.0,
+    min_chunk_bytes: int = 8 * 1024 * 1024,
+    max_chunk_bytes: int = 256 * 1024 * 1024,
+    target_chunk_count: int = 200
+) -> int:
+    """Recommend a resumable upload chunk size.
+
+    With a measured client throughput a chunk takes about
+    ``target_chunk_seconds`` to send: large enough that per-request overhead
+    does not dominate on fast links, small enough that little is re-sent
+    after an interruption on slow ones. Without a measurement the file is
+    split into about ``target_chunk_count`` chunks.
+
+    Args:
+        file_size: Declared file size in bytes
+        throughput_bytes_per_second: Observed client upload throughput
+        target_chunk_seconds: Upload time aimed for per chunk
+        min_chunk_bytes: Smallest recommended chunk
+        max_chunk_bytes: Largest recommended chunk
+        target_chunk_count: Chunks aimed for when the throughput is unknown
+
+    Returns:
+        Chunk size in bytes, a multiple of 256 KiB
+    """
+    if throughput_bytes_per_second and throughput_bytes_per_second > 0:
+        size = throughput_bytes_per_second * target_chunk_seconds
+    elif file_size:
+        size = file_size / target_chunk_count
+    else:
+        size = min_chunk_bytes
+
+    size = min(max(size, min_chunk_bytes), max_chunk_bytes)
+    if file_size:
+        # A single chunk covering the whole file (rounded up to the alignment)
+        size = min(size, -(-file_size // CHUNK_ALIGNMENT) * CHUNK_ALIGNMENT)
+    return max(CHUNK_ALIGNMENT, int(size) // CHUNK_ALIGNMENT * CHUNK_ALIGNMENT)
+
+
+def smooth_throughput(previous: Optional[float], observed: Optional[float], weight: float = 0.5) -> Optional[float]:
+    """Exponentially weighted throughput, so one slow chunk does not halve the chunk size."""
+    if not observed or observed <= 0:
+        return previous
+    if not previous:
+        return float(observed)
+    return weight * float(observed) + (1.0 - weight) * previous
+
+
+class UploadSessionStore:
+    """Interface for storing upload session records by session ID."""
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def save(self, session_id: str, session: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    async def delete(self, session_id: str) -> None:
+        raise NotImplementedError
+
+
+class InMemoryUploadSessionStore(UploadSessionStore):
+    """Process-local session records that expire ``ttl_seconds`` after creation."""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._expires_at: Dict[str, float] = {}
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        for session_id in [key for key, expires_at in self._expires_at.items() if expires_at <= now]:
+            self._sessions.pop(session_id, None)
+            self._expires_at.pop(session_id, None)
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        self._evict_expired()
+        session = self._sessions.get(session_id)
+        return dict(session) if session is not None else None
+
+    async def save(self, session_id: str, session: Dict[str, Any]) -> None:
+        self._evict_expired()
+        if session_id not in self._expires_at:
+            self._expires_at[session_id] = time.monotonic() + self.ttl_seconds
+        self._sessions[session_id] = dict(session)
+
+    async def delete(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+        self._expires_at.pop(session_id, None)
+
+
+class RedisUploadSessionStore(UploadSessionStore):
+    """Session records in Redis, so any instance can answer a resume query."""
+
+    def __init__(self, client, ttl_seconds: int, key_prefix: str = "upload-session:"):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.key_prefix}{session_id}"
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        value = await self.client.get(self._key(session_id))
+        return json.loads(value) if value is not None else None
+
+    async def save(self, session_id: str, session: Dict[str, Any]) -> None:
+        # KEEPTTL keeps the expiry of the GCS session set at creation
+        key = self._key(session_id)
+        value = json.dumps(session)
+        if await self.client.exists(key):
+            await self.client.set(key, value, keepttl=True)
+        else:
+            await self.client.set(key, value, ex=self.ttl_seconds)
+
+    async def delete(self, session_id: str) -> None:
+        await self.client.delete(self._key(session_id))
+
+
+def create_upload_session_store(
+    settings,
+    redis_client=None,
+    key_prefix: str = "upload-session:",
+    ttl_hours: Optional[float] = None
+) -> UploadSessionStore:
+    """Create the session store, shared via Redis when the job store uses Redis.
+
+    Args:
+        settings: Application settings
+        redis_client: Redis client of the job store, if any
+        key_prefix: Redis key prefix, one per kind of upload record
+        ttl_hours: Hours records are kept (default: ``upload_session_ttl_hours``)
+
+    Returns:
+        Configured upload session store
+    """
+    if ttl_hours is None:
+        ttl_hours = settings.upload_session_ttl_hours
+    ttl_seconds = int(ttl_hours * 3600)
+    if redis_client is not None:
+        return RedisUploadSessionStore(redis_client, ttl_seconds, key_prefix=key_prefix)
+    return InMemoryUploadSessionStore(ttl_seconds)
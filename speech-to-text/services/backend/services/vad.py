@@ -0,0 +1,206 @@
+"""Energy/zero-crossing voice activity detection and silence trimming offsets."""
+
+import bisect
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def frame_features(
+    samples: np.ndarray,
+    sample_rate: int,
+    frame_ms: int = 30,
+    block_seconds: float = 600.0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute per-frame energy and zero-crossing rate of 16-bit mono PCM.
+
+    Frames are processed in blocks so a memory-mapped file of any length is
+    never loaded as a whole.
+
+    Args:
+        samples: int16 samples (an array or ``np.memmap``)
+        sample_rate: Samples per second
+        frame_ms: Frame length in milliseconds
+        block_seconds: Audio processed per block
+
+    Returns:
+        Tuple of frame energies in dBFS and zero-crossing rates (0-1)
+    """
+    frame_length = max(1, sample_rate * frame_ms // 1000)
+    frame_count = len(samples) // frame_length
+    frames_per_block = max(1, int(block_seconds * 1000 // frame_ms))
+
+    energies = np.empty(frame_count, dtype=np.float32)
+    crossings = np.empty(frame_count, dtype=np.float32)
+
+    for first in range(0, frame_count, frames_per_block):
+        last = min(first + frames_per_block, frame_count)
+        block = np.asarray(samples[first * frame_length:last * frame_length], dtype=np.float32) / 32768.0
+        frames = block.reshape(last - first, frame_length)
+
+        energies[first:last] = 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+        signs = np.signbit(frames)
+        crossings[first:last] = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / frame_length
+
+    return energies, crossings
+
+
+class StreamingFrameFeatures:
+    """Per-frame energy and zero-crossing rate of 16-bit mono PCM fed in blocks.
+
+    Gives the same result as ``frame_features`` over the whole signal, but
+    only a block and a partial frame are held at a time, so audio can be
+    analysed while FFmpeg decodes it into a pipe.
+    """
+
+    def __init__(self, sample_rate: int, frame_ms: int = 30):
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_bytes = max(1, sample_rate * frame_ms // 1000) * 2
+        self.byte_count = 0
+        self._pending = b""
+        self._energies: List[np.ndarray] = []
+        self._crossings: List[np.ndarray] = []
+
+    def feed(self, data: bytes) -> None:
+        """Add the next block of little-endian int16 samples."""
+        self.byte_count += len(data)
+        data = self._pending + data
+        usable = len(data) // self.frame_bytes * self.frame_bytes
+        self._pending = data[usable:]
+        if usable:
+            samples = np.frombuffer(data, dtype="<i2", count=usable // 2)
+            energies, crossings = frame_features(samples, self.sample_rate, self.frame_ms)
+            self._energies.append(energies)
+            self._crossings.append(crossings)
+
+    @property
+    def duration(self) -> float:
+        """Seconds of audio fed so far."""
+        return self.byte_count // 2 / self.sample_rate
+
+    def result(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Frame energies in dBFS and zero-crossing rates of the complete frames fed."""
+        if not self._energies:
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32)
+        return np.concatenate(self._energies), np.concatenate(self._crossings)
+
+
+def speech_frames(
+    energies: np.ndarray,
+    crossings: np.ndarray,
+    margin_db: float = 12.0,
+    floor_db: float = -55.0
+) -> np.ndarray:
+    """Classify frames as speech.
+
+    The threshold adapts to the recording: ``margin_db`` above the noise floor
+    (10th percentile of frame energy), but never above 15 dB below the loud
+    frames (95th percentile), so recordings without pauses keep their speech.
+    Quiet frames with many zero crossings (fricatives such as "s" and "f")
+    count as speech when they are within 6 dB of the threshold.
+
+    Args:
+        energies: Frame energies in dBFS
+        crossings: Frame zero-crossing rates
+        margin_db: Distance of the threshold above the noise floor
+        floor_db: Lowest threshold, for recordings with digital silence
+
+    Returns:
+        Boolean array, True for speech frames
+    """
+    if len(energies) == 0:
+        return np.zeros(0, dtype=bool)
+
+    noise_floor, loud = np.percentile(energies, [10, 95])
+    threshold = max(floor_db, min(noise_floor + margin_db, loud - 15.0))
+    speech: np.ndarray = (energies > threshold) | ((energies > threshold - 6.0) & (crossings > 0.3))
+    return speech
+
+
+def speech_regions(
+    is_speech: np.ndarray,
+    frame_seconds: float,
+    duration: float,
+    min_silence_seconds: float = 1.0,
+    padding_seconds: float = 0.25
+) -> List[Tuple[float, float]]:
+    """Turn frame decisions into padded speech regions.
+
+    Silences shorter than ``min_silence_seconds`` are kept, so only real
+    pauses are removed and words are never clipped at a cut.
+
+    Args:
+        is_speech: Speech flag per frame
+        frame_seconds: Frame length in seconds
+        duration: Audio duration in seconds
+        min_silence_seconds: Shortest silence that is removed
+        padding_seconds: Audio kept before and after each speech region
+
+    Returns:
+        Sorted, non-overlapping (start, end) regions in seconds
+    """
+    if not is_speech.any():
+        return []
+
+    flags = np.concatenate(([False], is_speech, [False])).astype(np.int8)
+    changes = np.flatnonzero(np.diff(flags))
+    starts, ends = changes[0::2] * frame_seconds, changes[1::2] * frame_seconds
+
+    regions: List[Tuple[float, float]] = []
+    for start, end in zip(starts.tolist(), ends.tolist(), strict=True):
+        start = max(0.0, start - padding_seconds)
+        end = min(duration, end + padding_seconds)
+        if regions and start - regions[-1][1] < min_silence_seconds:
+            regions[-1] = (regions[-1][0], max(regions[-1][1], end))
+        else:
+            regions.append((start, end))
+    return regions
+
+
+class OffsetMap:
+    """Maps times in trimmed audio back to times in the original media.
+
+    Each entry is ``(trimmed_start, original_start, duration)`` for a kept
+    region. Kept regions are joined with ``gap_seconds`` of silence; times
+    inside a gap map to the end of the preceding region.
+    """
+
+    def __init__(self, entries: Sequence[Sequence[float]]):
+        self.entries = [tuple(entry) for entry in entries]
+        self._starts = [entry[0] for entry in self.entries]
+
+    @classmethod
+    def from_regions(cls, regions: Iterable[Tuple[float, float]], gap_seconds: float = 0.0) -> "OffsetMap":
+        """Build the map for kept (start, end) regions of the original audio."""
+        entries = []
+        position = 0.0
+        for start, end in regions:
+            entries.append((position, start, end - start))
+            position += end - start + gap_seconds
+        return cls(entries)
+
+    def to_original(self, seconds: Optional[float]) -> Optional[float]:
+        """Translate a time in the trimmed audio to original media time."""
+        if seconds is None or not self.entries:
+            return seconds
+        index = max(0, bisect.bisect_right(self._starts, seconds) - 1)
+        trimmed_start, original_start, duration = self.entries[index]
+        return original_start + min(max(seconds - trimmed_start, 0.0), duration)
+
+    @property
+    def kept_seconds(self) -> float:
+        return sum(entry[2] for entry in self.entries)
+
+    def to_list(self) -> List[List[float]]:
+        return [[round(value, 4) for value in entry] for entry in self.entries]
+
+
+def remap_segments(segments: List[Dict[str, Any]], offset_map: OffsetMap) -> None:
+    """Translate segment and word times in place from trimmed to original time."""
+    for segment in segments:
+        segment["start_seconds"] = offset_map.to_original(segment.get("start_seconds"))
+        segment["end_seconds"] = offset_map.to_original(segment.get("end_seconds"))
+        for word in segment.get("words") or []:
+            word["start_seconds"] = offset_map.to_original(word.get("start_seconds"))
+            word["end_seconds"] = offset_map.to_original(word.get("end_seconds"))
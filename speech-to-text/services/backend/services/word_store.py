@@ -0,0 +1,180 @@
+"""Compact columnar storage for word-level transcript data."""
+
+import math
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def _to_float(value: Optional[float]) -> float:
+    return float("nan") if value is None else float(value)
+
+
+def _from_float(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+class WordStore:
+    """Words of a transcript held in parallel typed arrays.
+
+    Word texts are concatenated into one string indexed by ``text_offsets``;
+    segment ``i`` owns words ``segment_offsets[i]`` up to
+    ``segment_offsets[i + 1]``. Missing times and confidences are stored as NaN.
+    A word costs 28 bytes plus its text, instead of a dict or pydantic model
+    per word, and word dicts are only built when a client asks for them.
+    """
+
+    MAGIC = b"WRD1"
+    HEADER = struct.Struct("<4sIII")
+
+    def __init__(self) -> None:
+        self.text = ""
+        self.text_offsets = array("I", [0])
+        self.starts = array("d")
+        self.ends = array("d")
+        self.confidences = array("d")
+        self.segment_offsets = array("I", [0])
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Dict[str, Any]]) -> Tuple["WordStore", List[Dict[str, Any]]]:
+        """Move the words of segment dicts into a word store.
+
+        Args:
+            segments: Segment dicts with optional ``words`` lists
+
+        Returns:
+            Tuple of the word store and copies of the segments without words
+        """
+        store = cls()
+        parts: List[str] = []
+        length = 0
+        stripped: List[Dict[str, Any]] = []
+
+        for segment in segments:
+            for word in segment.get("words") or []:
+                text = word.get("word") or ""
+                parts.append(text)
+                length += len(text)
+                store.text_offsets.append(length)
+                store.starts.append(_to_float(word.get("start_seconds")))
+                store.ends.append(_to_float(word.get("end_seconds")))
+                store.confidences.append(_to_float(word.get("confidence")))
+            store.segment_offsets.append(len(store.starts))
+            stripped.append({**segment, "words": None})
+
+        store.text = "".join(parts)
+        return store, stripped
+
+    @property
+    def segment_count(self) -> int:
+        return len(self.segment_offsets) - 1
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the arrays and the text buffer."""
+        arrays = (self.text_offsets, self.starts, self.ends, self.confidences, self.segment_offsets)
+        return sum(len(values) * values.itemsize for values in arrays) + sys.getsizeof(self.text)
+
+    def words(self, segment_index: int) -> List[Dict[str, Any]]:
+        """Build the word dicts of one segment.
+
+        Args:
+            segment_index: Position of the segment in the transcript
+
+        Returns:
+            Words with ``word``, ``start_seconds``, ``end_seconds`` and ``confidence``
+        """
+        if not 0 <= segment_index < self.segment_count:
+            return []
+
+        first = self.segment_offsets[segment_index]
+        last = self.segment_offsets[segment_index + 1]
+        return [
+            {
+                "word": self.text[self.text_offsets[index]:self.text_offsets[index + 1]],
+                "start_seconds": _from_float(self.starts[index]),
+                "end_seconds": _from_float(self.ends[index]),
+                "confidence": _from_float(self.confidences[index]),
+            }
+            for index in range(first, last)
+        ]
+
+    def to_bytes(self) -> bytes:
+        """Serialize the store (little-endian) for external storage."""
+        text = self.text.encode("utf-8")
+        header = self.HEADER.pack(self.MAGIC, len(self), self.segment_count, len(text))
+
+        columns = []
+        for values in (self.text_offsets, self.starts, self.ends, self.confidences, self.segment_offsets):
+            if sys.byteorder == "big":
+                values = array(values.typecode, values)
+                values.byteswap()
+            columns.append(values.tobytes())
+
+        return header + b"".join(columns) + text
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "WordStore":
+        """Load a store serialized with ``to_bytes``."""
+        magic, word_count, segment_count, text_length = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC:
+            raise ValueError("Not a serialized word store")
+
+        store = cls()
+        offset = cls.HEADER.size
+        layout = (
+            ("text_offsets", "I", word_count + 1),
+            ("starts", "d", word_count),
+            ("ends", "d", word_count),
+            ("confidences", "d", word_count),
+            ("segment_offsets", "I", segment_count + 1),
+        )
+        for name, typecode, count in layout:
+            values = array(typecode)
+            size = count * values.itemsize
+            values.frombytes(data[offset:offset + size])
+            if sys.byteorder == "big":
+                values.byteswap()
+            setattr(store, name, values)
+            offset += size
+
+        store.text = data[offset:offset + text_length].decode("utf-8")
+        return store
+
+
+def segment_views(
+    segments: List[Any],
+    words: Optional[WordStore],
+    start: int = 0,
+    end: Optional[int] = None,
+    include_words: bool = True
+) -> List[Dict[str, Any]]:
+    """Build JSON-ready segment dicts for a range of segments.
+
+    Args:
+        segments: Stored segments (pydantic models or dicts)
+        words: Word store of the transcript, if any
+        start: Index of the first segment
+        end: Index after the last segment (default: all)
+        include_words: Whether to attach word-level details
+
+    Returns:
+        Segment dicts, with words rebuilt from the store when requested
+    """
+    end = len(segments) if end is None else min(end, len(segments))
+    views: List[Dict[str, Any]] = []
+
+    for index in range(start, end):
+        segment = segments[index]
+        view = segment.model_dump() if hasattr(segment, "model_dump") else dict(segment)
+        if not include_words:
+            view["words"] = None
+        elif words is not None and not view.get("words"):
+            view["words"] = words.words(index) or None
+        views.append(view)
+
+    return views
@@ -0,0 +1,98 @@
+"""Shared fixtures: the FastAPI app with Google Cloud calls replaced by fakes."""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+# Settings are read at import time; keep the app self-contained
+os.environ.setdefault("JOB_STORE_BACKEND", "memory")
+os.environ.setdefault("SEARCH_ENABLED", "false")
+os.environ.setdefault("WARM_UP_ON_STARTUP", "false")
+os.environ.setdefault("PROGRESS_UPDATE_INTERVAL_SECONDS", "0")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeStorage:
+    """Records the storage calls a job makes instead of talking to GCS."""
+
+    def __init__(self):
+        self.transcripts = {}
+        self.results = {}
+
+    async def get_audio_duration(self, gcs_uri):
+        return 60.0
+
+    async def save_transcript(self, transcript, job_id):
+        self.transcripts[job_id] = transcript
+        return f"gs://transcripts/{job_id}.txt"
+
+    async def save_transcript_result(self, job_id, result, segments=None):
+        self.results[job_id] = result
+
+    async def load_transcript_result(self, job_id):
+        return None
+
+    async def delete_transcript_result(self, job_id):
+        self.results.pop(job_id, None)
+
+
+@pytest.fixture
+async def redis_client():
+    """In-process Redis with its own keyspace (fakeredis)."""
+    import fakeredis
+
+    client = fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer())
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+def fake_storage():
+    return FakeStorage()
+
+
+@pytest.fixture
+def app_module(monkeypatch, fake_storage):
+    """The ``main`` module with fake storage and a fresh job queue and store."""
+    import main
+    from services.job_store import InMemoryJobStore
+    from services.scheduler import InMemoryJobQueue
+
+    for name in ("get_audio_duration", "save_transcript", "save_transcript_result",
+                 "load_transcript_result", "delete_transcript_result"):
+        monkeypatch.setattr(main.storage_service, name, getattr(fake_storage, name))
+    monkeypatch.setattr(main, "job_store", InMemoryJobStore(ttl_seconds=3600))
+    monkeypatch.setattr(main.job_scheduler, "queue", InMemoryJobQueue())
+    return main
+
+
+@pytest.fixture
+def client(app_module):
+    """Test client running the app lifespan (job scheduler, progress hub)."""
+    from fastapi.testclient import TestClient
+
+    with TestClient(app_module.app) as test_client:
+        yield test_client
+
+
+def wait_for_status(client, job_id, statuses=("completed", "failed"), timeout=5.0):
+    """Poll the status endpoint until the job reaches one of ``statuses``."""
+    deadline = time.monotonic() + timeout
+    while True:
+        body = client.get(f"/api/v1/transcription/{job_id}").json()
+        if body.get("status") in statuses or time.monotonic() > deadline:
+            return body
+        time.sleep(0.02)
+
+
+async def wait_until(predicate, timeout=5.0):
+    """Wait until ``predicate()`` is true, for tests driving async services."""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
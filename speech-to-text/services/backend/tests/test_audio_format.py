@@ -0,0 +1,16 @@
+"""Tests of the intermediate audio format helpers."""
+
+import io
+import wave
+
+from services.audio_format import wav_header
+
+
+def test_wav_header_describes_the_samples():
+    samples = bytes(range(200)) * 10
+
+    with wave.open(io.BytesIO(wav_header(16000, len(samples)) + samples)) as wav_file:
+        assert wav_file.getnchannels() == 1
+        assert wav_file.getsampwidth() == 2
+        assert wav_file.getframerate() == 16000
+        assert wav_file.readframes(wav_file.getnframes()) == samples
@@ -0,0 +1,125 @@
+"""End-to-end test of ``/api/v1/transcribe/batch``."""
+
+from conftest import wait_for_status
+
+
+def test_batch_transcribes_every_file(client, app_module, fake_storage, monkeypatch):
+    calls = []
+
+    async def transcribe_batch(gcs_uris, recognizer_id=None, language_code="nl-NL", on_progress=None):
+        calls.append(list(gcs_uris))
+        for gcs_uri in gcs_uris:
+            await on_progress(gcs_uri, 50)
+        return {
+            gcs_uri: (f"transcript of {gcs_uri}", [{"text": f"transcript of {gcs_uri}", "start_time": 0.0, "end_time": 1.0}])
+            for gcs_uri in gcs_uris
+        }
+
+    async def apply_speaker_identification(transcript, segments, enabled):
+        return None, None, None
+
+    monkeypatch.setattr(app_module.transcription_service, "transcribe_batch", transcribe_batch)
+    monkeypatch.setattr(app_module.transcription_service, "apply_speaker_identification", apply_speaker_identification)
+
+    response = client.post("/api/v1/transcribe/batch", json={
+        "jobs": [{"gcs_uri": "gs://uploads/a.wav"}, {"gcs_uri": "gs://uploads/b.wav"}]
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["batches"]) == 1
+    job_ids = body["batches"][0]["job_ids"]
+
+    for job_id, gcs_uri in zip(job_ids, ["gs://uploads/a.wav", "gs://uploads/b.wav"], strict=True):
+        status = wait_for_status(client, job_id)
+        assert status["status"] == "completed", status.get("error")
+        assert status["transcript"] == f"transcript of {gcs_uri}"
+        assert fake_storage.transcripts[job_id] == f"transcript of {gcs_uri}"
+
+    # Both files went through one multi-file recognition
+    assert calls == [["gs://uploads/a.wav", "gs://uploads/b.wav"]]
+
+
+def test_batch_failure_marks_every_job_failed(client, app_module, monkeypatch):
+    async def transcribe_batch(gcs_uris, **kwargs):
+        raise RuntimeError("quota exceeded")
+
+    monkeypatch.setattr(app_module.transcription_service, "transcribe_batch", transcribe_batch)
+
+    response = client.post("/api/v1/transcribe/batch", json={"jobs": [{"gcs_uri": "gs://uploads/a.wav"}]})
+    job_id = response.json()["jobs"][0]["job_id"]
+
+    status = wait_for_status(client, job_id)
+    assert status["status"] == "failed"
+    assert "quota exceeded" in status["error"]
+
+
+def test_batch_shares_one_recognition_between_jobs_of_the_same_file(client, app_module, fake_storage, monkeypatch):
+    calls = []
+
+    async def transcribe_batch(gcs_uris, recognizer_id=None, language_code="nl-NL", on_progress=None):
+        calls.append(list(gcs_uris))
+        await on_progress("gs://uploads/a.wav", 50)
+        return {"gs://uploads/a.wav": ("shared", [{"text": "shared", "start_time": 0.0, "end_time": 1.0}])}
+
+    async def apply_speaker_identification(transcript, segments, enabled):
+        return None, None, None
+
+    monkeypatch.setattr(app_module.transcription_service, "transcribe_batch", transcribe_batch)
+    monkeypatch.setattr(app_module.transcription_service, "apply_speaker_identification", apply_speaker_identification)
+
+    response = client.post("/api/v1/transcribe/batch", json={
+        "jobs": [{"gcs_uri": "gs://uploads/a.wav"}, {"gcs_uri": "gs://uploads/a.wav"}]
+    })
+    job_ids = response.json()["batches"][0]["job_ids"]
+
+    statuses = [wait_for_status(client, job_id) for job_id in job_ids]
+    assert [status["status"] for status in statuses] == ["completed", "completed"]
+    assert [fake_storage.transcripts[job_id] for job_id in job_ids] == ["shared", "shared"]
+    assert calls == [["gs://uploads/a.wav"]]
+
+
+def test_batch_failure_fails_every_job_of_a_shared_file(client, app_module, monkeypatch):
+    async def transcribe_batch(gcs_uris, **kwargs):
+        raise RuntimeError("quota exceeded")
+
+    monkeypatch.setattr(app_module.transcription_service, "transcribe_batch", transcribe_batch)
+
+    response = client.post("/api/v1/transcribe/batch", json={
+        "jobs": [{"gcs_uri": "gs://uploads/a.wav"}, {"gcs_uri": "gs://uploads/a.wav"}]
+    })
+    job_ids = [job["job_id"] for job in response.json()["jobs"]]
+
+    assert [wait_for_status(client, job_id)["status"] for job_id in job_ids] == ["failed", "failed"]
+
+
+def test_diarized_files_are_not_batched(client, app_module, fake_storage, monkeypatch):
+    batched, single = [], []
+
+    async def transcribe_batch(gcs_uris, **kwargs):
+        batched.append(list(gcs_uris))
+        return {uri: ("batched", []) for uri in gcs_uris}
+
+    async def transcribe_audio(gcs_uri, **kwargs):
+        single.append((gcs_uri, kwargs["enable_diarization"], kwargs["max_speaker_count"]))
+        return "diarized", [], None, None, None
+
+    async def apply_speaker_identification(transcript, segments, enabled):
+        return None, None, None
+
+    monkeypatch.setattr(app_module.transcription_service, "transcribe_batch", transcribe_batch)
+    monkeypatch.setattr(app_module.transcription_service, "transcribe_audio", transcribe_audio)
+    monkeypatch.setattr(app_module.transcription_service, "apply_speaker_identification", apply_speaker_identification)
+
+    response = client.post("/api/v1/transcribe/batch", json={
+        "jobs": [
+            {"gcs_uri": "gs://uploads/a.wav"},
+            {"gcs_uri": "gs://uploads/b.wav", "enable_diarization": True, "max_speaker_count": 3},
+        ]
+    })
+    body = response.json()
+    assert [batch["job_ids"] for batch in body["batches"]] == [[body["jobs"][0]["job_id"]]]
+
+    for job in body["jobs"]:
+        assert wait_for_status(client, job["job_id"])["status"] == "completed"
+    assert batched == [["gs://uploads/a.wav"]]
+    assert single == [("gs://uploads/b.wav", True, 3)]
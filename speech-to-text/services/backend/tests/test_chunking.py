@@ -0,0 +1,35 @@
+"""Tests of the audio chunking helpers."""
+
+from services.chunking import PcmRangeSplitter
+
+
+def route(ranges, data, block_size):
+    splitter = PcmRangeSplitter(ranges)
+    received = dict.fromkeys(range(len(ranges)), b"")
+    completed = []
+    for position in range(0, len(data), block_size):
+        for index, piece in splitter.split(data[position:position + block_size]):
+            received[index] += piece
+        completed.append(splitter.completed)
+    return received, completed
+
+
+def test_splitter_routes_overlapping_ranges():
+    data = bytes(range(256)) * 4
+    ranges = [(0, 300), (250, 700), (650, 1024)]
+
+    for block_size in (1, 7, 100, 4096):
+        received, completed = route(ranges, data, block_size)
+        assert [received[index] for index in range(3)] == [data[start:end] for start, end in ranges]
+        assert completed == sorted(completed) and completed[-1] == 3
+
+
+def test_splitter_skips_gaps_and_reports_completion():
+    data = bytes(1000)
+    splitter = PcmRangeSplitter([(100, 200), (500, 600)])
+
+    assert splitter.split(data[:100]) == []
+    assert [(index, len(piece)) for index, piece in splitter.split(data[100:450])] == [(0, 100)]
+    assert splitter.completed == 1
+    assert [(index, len(piece)) for index, piece in splitter.split(data[450:])] == [(1, 100)]
+    assert splitter.completed == 2
@@ -0,0 +1,93 @@
+"""Tests of parallel composite uploads."""
+
+import pytest
+
+from services.composite_upload import missing_parts, part_name, plan_parts
+from services.upload_sessions import InMemoryUploadSessionStore
+
+
+@pytest.mark.parametrize("file_size, max_parts, min_part_bytes", [
+    (100, 4, 1),
+    (101, 4, 1),
+    (10, 32, 4),
+    (3 * 1024 ** 3 + 7, 32, 32 * 1024 ** 2),
+])
+def test_parts_cover_the_file_in_order(file_size, max_parts, min_part_bytes):
+    parts = plan_parts(file_size, max_parts, min_part_bytes)
+
+    assert len(parts) <= max_parts
+    assert parts[0][0] == 0
+    assert all(offset + size == next_offset for (offset, size), (next_offset, _) in zip(parts, parts[1:], strict=False))
+    assert sum(size for _, size in parts) == file_size
+    assert all(size >= min_part_bytes for _, size in parts[:-1])
+
+
+def test_small_files_get_fewer_parts():
+    assert plan_parts(10, 32, 4) == [(0, 5), (5, 5)]
+    assert plan_parts(3, 32, 4) == [(0, 3)]
+    assert plan_parts(0, 32, 4) == [(0, 0)]
+
+
+def test_missing_parts_include_parts_of_the_wrong_size():
+    parts = plan_parts(10, 3, 1)
+    uploaded = {part_name("up-1", 0): 4, part_name("up-1", 1): 2, part_name("other", 2): 2}
+
+    assert missing_parts(parts, uploaded, "up-1") == [1, 2]
+    assert missing_parts(parts, {part_name("up-1", index): size for index, (_, size) in enumerate(parts)}, "up-1") == []
+
+
+@pytest.fixture
+def composite(app_module, monkeypatch):
+    """Composite upload endpoints with the part objects held in a dict."""
+    uploaded = {}
+
+    async def generate_composite_part_urls(upload_id, parts, expiration_hours):
+        return [
+            {"index": index, "offset": offset, "size": size, "url": f"https://storage.test/{part_name(upload_id, index)}"}
+            for index, (offset, size) in enumerate(parts)
+        ]
+
+    async def list_composite_parts(upload_id):
+        return {name: size for name, size in uploaded.items() if name.startswith(part_name(upload_id, 0)[:-5])}
+
+    async def delete_composite_parts(upload_id):
+        for name in list(await list_composite_parts(upload_id)):
+            del uploaded[name]
+
+    for function in (generate_composite_part_urls, list_composite_parts, delete_composite_parts):
+        monkeypatch.setattr(app_module.storage_service, function.__name__, function)
+    monkeypatch.setattr(app_module, "composite_upload_store", InMemoryUploadSessionStore(3600))
+    return uploaded
+
+
+def start_upload(client):
+    response = client.post("/api/v1/upload/composite", json={"filename": "meeting.mp4", "file_size": 10, "parts": 3})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_complete_with_parts_missing_lists_them(client, composite):
+    upload = start_upload(client)
+    composite[part_name(upload["upload_id"], 0)] = 4
+    composite[part_name(upload["upload_id"], 2)] = 1
+
+    response = client.post(f"/api/v1/upload/{upload['upload_id']}/complete")
+
+    assert response.status_code == 409
+    assert response.json()["detail"]["missing_parts"] == [1, 2]
+    # The upload is kept, so the missing parts can still be sent
+    composite[part_name(upload["upload_id"], 2)] = 2
+    retry = client.post(f"/api/v1/upload/{upload['upload_id']}/complete")
+    assert retry.json()["detail"]["missing_parts"] == [1]
+
+
+def test_abort_with_parts_missing_deletes_the_uploaded_parts(client, composite):
+    upload = start_upload(client)
+    composite[part_name(upload["upload_id"], 1)] = 4
+    composite[part_name("other-upload", 0)] = 4
+
+    assert client.delete(f"/api/v1/upload/{upload['upload_id']}").status_code == 200
+
+    assert composite == {part_name("other-upload", 0): 4}
+    assert client.post(f"/api/v1/upload/{upload['upload_id']}/complete").status_code == 404
+    assert client.delete(f"/api/v1/upload/{upload['upload_id']}").status_code == 404
@@ -0,0 +1,98 @@
+"""Tests of the SRT and WebVTT subtitle export."""
+
+import re
+
+import pytest
+
+from services.export import export_transcript, format_timestamp, iter_cues
+
+WORDS = "de vergadering van vandaag begint met een korte terugblik op het vorige kwartaal".split()
+
+
+def timed_words(words, start=0.0, step=0.5):
+    return [
+        {"word": word, "start_seconds": start + index * step, "end_seconds": start + (index + 1) * step}
+        for index, word in enumerate(words)
+    ]
+
+
+def render(export_format, segments, words, **kwargs):
+    return b"".join(export_transcript(export_format, "job-1", segments, lambda index: words[index], **kwargs)).decode()
+
+
+@pytest.mark.parametrize("seconds, separator, expected", [
+    (0.0, ",", "00:00:00,000"),
+    (1.2345, ",", "00:00:01,234"),
+    (61.9996, ".", "00:01:02.000"),
+    (3 * 3600 + 25 * 60 + 7.05, ".", "03:25:07.050"),
+    (-0.5, ",", "00:00:00,000"),
+])
+def test_format_timestamp(seconds, separator, expected):
+    assert format_timestamp(seconds, separator) == expected
+
+
+@pytest.mark.parametrize("max_chars", [12, 20, 42])
+def test_cue_lines_fit_the_maximum_line_length(max_chars):
+    segments = [{"text": " ".join(WORDS), "start_seconds": 0.0, "end_seconds": 7.0}]
+
+    cues = list(iter_cues(segments, lambda index: timed_words(WORDS), max_chars_per_line=max_chars, max_cue_seconds=60))
+
+    assert all(len(line) <= max_chars for cue in cues for line in cue["lines"])
+    assert all(len(cue["lines"]) <= 2 for cue in cues)
+    assert " ".join(line for cue in cues for line in cue["lines"]) == " ".join(WORDS)
+
+
+def test_cues_do_not_exceed_the_maximum_duration():
+    segments = [{"text": " ".join(WORDS), "start_seconds": 0.0, "end_seconds": 7.0}]
+
+    cues = list(iter_cues(segments, lambda index: timed_words(WORDS), max_chars_per_line=80, max_cue_seconds=2.0))
+
+    assert len(cues) == 4
+    assert all(cue["end"] - cue["start"] <= 2.0 for cue in cues)
+    assert [cue["start"] for cue in cues] == sorted(cue["start"] for cue in cues)
+
+
+def test_segments_without_word_timings_are_split_over_the_segment_time():
+    segments = [{"text": " ".join(WORDS), "start_seconds": 10.0, "end_seconds": 16.0}]
+
+    cues = list(iter_cues(segments, lambda index: [], max_chars_per_line=20, max_lines=1))
+
+    assert all(len(cue["lines"]) == 1 and len(cue["lines"][0]) <= 20 for cue in cues)
+    assert cues[0]["start"] == 10.0
+    assert cues[-1]["end"] == pytest.approx(16.0)
+    assert all(previous["end"] == cue["start"] for previous, cue in zip(cues, cues[1:], strict=False))
+
+
+def test_srt_output():
+    segments = [
+        {"text": "goedemorgen", "start_seconds": 0.0, "end_seconds": 1.0},
+        {"text": "welkom", "start_seconds": 62.5, "end_seconds": 63.25},
+    ]
+    words = [timed_words(["goedemorgen"], step=1.0), timed_words(["welkom"], start=62.5, step=0.75)]
+
+    output = render("srt", segments, words, speakers=["Anna", None])
+
+    assert output == (
+        "1\n00:00:00,000 --> 00:00:01,000\nAnna: goedemorgen\n\n"
+        "2\n00:01:02,500 --> 00:01:03,250\nwelkom\n\n"
+    )
+
+
+def test_vtt_output_escapes_text_and_marks_speakers():
+    segments = [{"text": "a < b", "start_seconds": 0.0, "end_seconds": 1.5}]
+
+    output = render("vtt", segments, [[]], speakers=["R&D"])
+
+    assert output == "WEBVTT\n\n00:00:00.000 --> 00:00:01.500\n<v R&amp;D>a &lt; b\n\n"
+
+
+def test_srt_timestamps_are_well_formed_for_long_transcripts():
+    words = [timed_words(WORDS, start=index * 3600.0) for index in range(3)]
+    segments = [{"text": " ".join(WORDS), "start_seconds": index * 3600.0, "end_seconds": index * 3600.0 + 7} for index in range(3)]
+
+    output = render("srt", segments, words, max_cue_seconds=3.0)
+
+    timings = re.findall(r"^(\S+) --> (\S+)$", output, re.MULTILINE)
+    assert timings
+    assert all(re.fullmatch(r"\d{2}:\d{2}:\d{2},\d{3}", stamp) for timing in timings for stamp in timing)
+    assert timings[-1][0].startswith("02:00:0")
@@ -0,0 +1,200 @@
+"""Contract tests run against every job store backend."""
+
+from datetime import datetime
+
+import pytest
+
+from models import JobStatus, TranscriptSegment
+from services.job_store import InMemoryJobStore, RedisJobStore
+from services.word_store import WordStore
+
+
+@pytest.fixture(params=["memory", "redis"])
+def store(request, redis_client):
+    if request.param == "memory":
+        return InMemoryJobStore(ttl_seconds=3600)
+    return RedisJobStore(redis_client, ttl_seconds=3600)
+
+
+def new_job(job_id="job-1", **fields):
+    return JobStatus(job_id=job_id, status="pending", created_at=datetime(2026, 1, 1), gcs_uri="gs://uploads/a.wav", **fields)
+
+
+async def test_create_and_get(store):
+    await store.create(new_job(batch_id="batch-1"))
+
+    job = await store.get("job-1")
+    assert job.status == "pending"
+    assert job.batch_id == "batch-1"
+    assert job.version == 0
+    assert await store.exists("job-1")
+    assert await store.get("missing") is None
+
+
+async def test_update_sets_fields_and_increments_version(store):
+    await store.create(new_job())
+    await store.update("job-1", status="transcribing", recognition_progress=40)
+    await store.update("job-1", recognition_progress=60)
+
+    job = await store.get("job-1")
+    assert (job.status, job.recognition_progress, job.version) == ("transcribing", 60, 2)
+
+
+async def test_requested_large_fields_are_loaded(store):
+    await store.create(new_job())
+    segments = [TranscriptSegment(text="hallo", start_time=0.0, end_time=1.0)]
+    await store.update("job-1", status="completed", transcript="hallo", transcript_segments=segments)
+
+    assert (await store.get("job-1", include_results=["transcript"])).transcript == "hallo"
+    assert (await store.get("job-1")).transcript_segments[0].text == "hallo"
+
+
+async def test_word_store_is_stored_as_bytes(store):
+    words, _ = WordStore.from_segments([{"words": [{"word": "hallo", "start_seconds": 0.5}]}])
+    await store.create(new_job())
+    await store.update("job-1", transcript_words=words)
+
+    loaded = (await store.get("job-1", include_results=["transcript_words"])).transcript_words
+    assert loaded.words(0) == [{"word": "hallo", "start_seconds": 0.5, "end_seconds": None, "confidence": None}]
+
+
+@pytest.mark.parametrize("segments", [
+    [],
+    [{"words": None}, {"words": []}],
+    [
+        {"words": [
+            {"word": "één", "start_seconds": 0.0, "end_seconds": 0.4, "confidence": 0.9},
+            {"word": "twee"},
+        ]},
+        {"words": []},
+        {"words": [{"word": "", "start_seconds": 1.0, "end_seconds": None, "confidence": 0.5}]},
+    ],
+])
+def test_word_store_bytes_round_trip(segments):
+    store, _ = WordStore.from_segments(segments)
+
+    loaded = WordStore.from_bytes(store.to_bytes())
+
+    assert (loaded.segment_count, len(loaded), loaded.text) == (len(segments), len(store), store.text)
+    for index in range(len(segments)):
+        assert loaded.words(index) == store.words(index)
+
+
+def test_word_store_keeps_missing_timings_missing():
+    store, _ = WordStore.from_segments([{"words": [{"word": "twee"}]}])
+
+    loaded = WordStore.from_bytes(store.to_bytes())
+
+    assert loaded.words(0) == [{"word": "twee", "start_seconds": None, "end_seconds": None, "confidence": None}]
+
+
+def test_word_store_rejects_other_bytes():
+    with pytest.raises(ValueError):
+        WordStore.from_bytes(b"JSON" + bytes(12))
+
+
+async def test_redis_skips_large_fields_not_requested(redis_client):
+    store = RedisJobStore(redis_client, ttl_seconds=3600)
+    await store.create(new_job())
+    await store.update("job-1", status="completed", transcript="hallo", refined_transcript="Hallo.")
+
+    assert (await store.get("job-1", include_results=False)).transcript is None
+    partial = await store.get("job-1", include_results=["transcript"])
+    assert (partial.transcript, partial.refined_transcript) == ("hallo", None)
+
+
+async def test_update_of_missing_job_is_ignored(store):
+    await store.update("missing", status="failed", error="boom")
+
+    assert await store.get("missing") is None
+    assert not await store.exists("missing")
+
+
+async def test_update_after_delete_is_ignored(store):
+    await store.create(new_job())
+    assert await store.delete("job-1")
+
+    # e.g. a job deleted while processing, then failed or completed
+    await store.update("job-1", status="failed", error="boom", completed_at=datetime.now())
+    await store.update("job-1", status="completed", transcript="late result")
+
+    assert await store.get("job-1") is None
+    assert not await store.delete("job-1")
+
+
+async def test_result_payload_is_dropped_by_next_update(store):
+    await store.create(new_job())
+    await store.cache_result_payload("job-1", b"payload", version=0)
+    assert (await store.get("job-1", include_results=["result_payload"])).result_payload == b"payload"
+
+    await store.update("job-1", status="completed")
+    job = await store.get("job-1", include_results=["result_payload"])
+    assert job.result_payload is None
+    assert job.version == 1
+
+
+async def test_stale_result_payload_is_not_cached(store):
+    await store.create(new_job())
+    # Rendered at version 0, but the job changed before the payload was stored
+    await store.update("job-1", status="failed", error="boom")
+    await store.cache_result_payload("job-1", b"stale", version=0)
+
+    assert (await store.get("job-1", include_results=["result_payload"])).result_payload is None
+    await store.cache_result_payload("job-1", b"fresh", version=1)
+    assert (await store.get("job-1", include_results=["result_payload"])).result_payload == b"fresh"
+
+
+async def test_result_payload_of_missing_job_is_ignored(store):
+    await store.cache_result_payload("missing", b"payload", version=0)
+
+    assert await store.get("missing") is None
+
+
+async def test_clearing_a_field(store):
+    await store.create(new_job(error="transient"))
+    await store.update("job-1", error=None)
+
+    assert (await store.get("job-1")).error is None
+
+
+async def test_update_of_expired_job_is_ignored():
+    store = InMemoryJobStore(ttl_seconds=0)
+    await store.create(new_job())
+    await store.update("job-1", status="failed")
+
+    assert await store.get("job-1") is None
+
+
+async def test_redis_update_is_one_round_trip(redis_client, monkeypatch):
+    store = RedisJobStore(redis_client, ttl_seconds=3600)
+    await store.create(new_job())
+    await store.update("job-1", status="transcribing")
+    commands = []
+    execute_command = redis_client.execute_command
+
+    async def counting_execute_command(*args, **kwargs):
+        commands.append(args[0])
+        return await execute_command(*args, **kwargs)
+
+    monkeypatch.setattr(redis_client, "execute_command", counting_execute_command)
+    await store.update("job-1", status="completed", transcript="hallo", error=None)
+
+    assert commands == ["EVALSHA"]
+    job = await store.get("job-1")
+    assert (job.status, job.transcript, job.version) == ("completed", "hallo", 2)
+
+
+async def test_redis_update_refreshes_the_ttl_of_every_key(redis_client):
+    store = RedisJobStore(redis_client, ttl_seconds=100)
+    await store.create(new_job())
+    await store.update("job-1", transcript="hallo")
+    await redis_client.expire("job:job-1", 5)
+    await redis_client.expire("job:job-1:transcript", 5)
+
+    await store.update("job-1", status="completed")
+
+    assert await redis_client.ttl("job:job-1") > 90
+    assert await redis_client.ttl("job:job-1:transcript") > 90
+
+    await store.update("job-1", transcript=None)
+    assert not await redis_client.exists("job:job-1:transcript")
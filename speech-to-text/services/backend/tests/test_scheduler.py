@@ -0,0 +1,126 @@
+"""Tests of the job queues and the worker pool."""
+
+import asyncio
+
+import pytest
+from conftest import wait_until
+
+from services.scheduler import (
+    InMemoryJobQueue,
+    JobScheduler,
+    QueueFullError,
+    RedisJobQueue,
+)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def queue(request, redis_client):
+    if request.param == "memory":
+        return InMemoryJobQueue()
+    return RedisJobQueue(redis_client)
+
+
+async def test_jobs_are_served_by_priority_then_fifo(queue):
+    await queue.put("low-1", {"n": 1})
+    await queue.put("low-2", {"n": 2})
+    assert await queue.put("high", {"n": 3}, priority=5) == 1
+
+    assert await queue.position("low-2") == 3
+    served = [(await queue.get(timeout=0.1, lease_seconds=60))[0] for _ in range(3)]
+    assert served == ["high", "low-1", "low-2"]
+    assert await queue.get(timeout=0.1, lease_seconds=60) is None
+
+
+async def test_removed_jobs_are_not_served(queue):
+    await queue.put("job-1", {})
+    assert await queue.remove("job-1")
+    assert await queue.size() == 0
+    assert await queue.get(timeout=0.1, lease_seconds=60) is None
+
+
+async def test_released_job_is_served_again(queue):
+    await queue.put("job-1", {"n": 1})
+    job_id, payload = await queue.get(timeout=0.1, lease_seconds=60)
+    await queue.release(job_id)
+    assert await queue.get(timeout=0.1, lease_seconds=60) == ("job-1", {"n": 1})
+
+
+async def test_extend_only_renews_running_jobs(queue):
+    await queue.put("job-1", {})
+    await queue.get(timeout=0.1, lease_seconds=60)
+    assert await queue.extend("job-1", 60)
+    await queue.ack("job-1")
+    assert not await queue.extend("job-1", 60)
+
+
+async def test_redis_get_moves_job_to_leased_set(redis_client):
+    queue = RedisJobQueue(redis_client)
+    await queue.put("job-1", {})
+    await queue.get(timeout=0.1, lease_seconds=60)
+
+    assert await redis_client.zscore(queue.pending_key, "job-1") is None
+    assert await redis_client.zscore(queue.leased_key, "job-1") is not None
+
+
+async def test_redis_concurrent_workers_never_share_a_job(redis_client):
+    queue = RedisJobQueue(redis_client)
+    for index in range(20):
+        await queue.put(f"job-{index}", {})
+
+    async def drain():
+        taken = []
+        while (item := await queue.get(timeout=0.1, lease_seconds=60)) is not None:
+            taken.append(item[0])
+        return taken
+
+    results = await asyncio.gather(*(drain() for _ in range(5)))
+    served = [job_id for taken in results for job_id in taken]
+    assert sorted(served) == sorted(f"job-{index}" for index in range(20))
+
+
+async def test_redis_expired_lease_is_recovered(redis_client):
+    queue = RedisJobQueue(redis_client)
+    await queue.put("job-1", {"n": 1})
+    await queue.get(timeout=0.1, lease_seconds=0)
+
+    assert await queue.recover() == 1
+    assert await queue.get(timeout=0.1, lease_seconds=60) == ("job-1", {"n": 1})
+
+
+async def test_scheduler_renews_lease_of_long_running_job(redis_client):
+    queue = RedisJobQueue(redis_client)
+    started = asyncio.Event()
+    finish = asyncio.Event()
+    runs = []
+
+    async def handler(job_id, payload):
+        runs.append(job_id)
+        started.set()
+        await finish.wait()
+
+    scheduler = JobScheduler(queue, handler, max_workers=2, max_queue_size=10, lease_seconds=3)
+    await scheduler.start()
+    try:
+        await scheduler.submit("job-1", {})
+        await asyncio.wait_for(started.wait(), 5)
+        # Outlive the original lease; recovery must not hand the job out again
+        await asyncio.sleep(4)
+        assert await queue.recover() == 0
+        await asyncio.sleep(1.5)
+        finish.set()
+        await wait_until(lambda: scheduler.average_job_seconds != JobScheduler.DEFAULT_JOB_SECONDS)
+    finally:
+        await scheduler.stop()
+
+    assert runs == ["job-1"]
+    assert await redis_client.zcard(queue.leased_key) == 0
+
+
+async def test_submit_rejects_when_queue_is_full():
+    async def handler(job_id, payload):
+        pass
+
+    scheduler = JobScheduler(InMemoryJobQueue(), handler, max_workers=1, max_queue_size=1, lease_seconds=60)
+    await scheduler.submit("job-1", {})
+    with pytest.raises(QueueFullError):
+        await scheduler.submit("job-2", {})
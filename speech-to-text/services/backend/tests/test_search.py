@@ -0,0 +1,95 @@
+"""Tests of the SQLite transcript search index."""
+
+import pytest
+
+from services.search import MIN_TERM_LENGTH, SearchIndex, fold, parse_query
+
+
+@pytest.fixture
+def index():
+    search_index = SearchIndex(":memory:")
+    yield search_index
+    search_index.close()
+
+
+def segment(text, start=0.0, end=5.0, words=None):
+    return {"text": text, "start_seconds": start, "end_seconds": end, "words": words}
+
+
+def test_fold_strips_diacritics_and_keeps_positions():
+    folded, positions = fold("Één idee-ën")
+
+    assert folded == "een ideeen"
+    assert len(positions) == len(folded)
+    assert positions[folded.index("ideeen")] == 4
+
+
+def test_diacritics_match_both_ways(index):
+    index.index_job_sync("job-1", [segment("Wij hebben drie ideeën voor café De Zon")])
+
+    assert index.search_sync("ideeen")["hits"][0]["job_id"] == "job-1"
+    assert index.search_sync("CAFÉ")["hits"]
+    hit = index.search_sync("IDEEËN")["hits"][0]
+    assert hit["snippet"][slice(*hit["highlights"][0])] == "ideeën"
+
+
+def test_quoted_phrases_match_as_a_whole(index):
+    index.index_job_sync("job-1", [
+        segment("de vergadering begint later", start=0.0),
+        segment("later begint de vergadering", start=10.0),
+    ])
+
+    assert parse_query('"De Vergadering  begint" later') == ["de vergadering begint", "later"]
+    hits = index.search_sync('"vergadering begint"')["hits"]
+    assert [hit["start_seconds"] for hit in hits] == [0.0]
+    assert len(index.search_sync("vergadering begint")["hits"]) == 2
+
+
+def test_terms_shorter_than_the_minimum_are_ignored(index):
+    index.index_job_sync("job-1", [segment("op de weg naar huis")])
+
+    assert MIN_TERM_LENGTH == 3
+    assert parse_query("op de weg") == ["weg"]
+    assert len(index.search_sync("op de weg")["hits"]) == 1
+    with pytest.raises(ValueError):
+        index.search_sync('op de "a"')
+
+
+def test_reindexing_replaces_the_rows_of_a_job(index):
+    index.index_job_sync("job-1", [segment("eerste versie"), segment("nog een regel")])
+    index.index_job_sync("job-2", [segment("andere opname met een versie")])
+    index.index_job_sync("job-1", [segment("tweede versie")])
+
+    hits = index.search_sync("versie", job_id="job-1")["hits"]
+    assert [hit["snippet"] for hit in hits] == ["tweede versie"]
+    assert index.search_sync("eerste")["hits"] == []
+    assert index.stats_sync()["jobs"] == 2
+    assert index.stats_sync()["segments"] == 2
+
+    index.remove_job_sync("job-1")
+    assert [hit["job_id"] for hit in index.search_sync("versie")["hits"]] == ["job-2"]
+
+
+def test_hits_use_the_time_of_the_matched_word(index):
+    words = [
+        {"word": "goedemorgen", "start_seconds": 12.0},
+        {"word": "allemaal", "start_seconds": 12.8},
+        {"word": "welkom", "start_seconds": 13.5},
+    ]
+    index.index_job_sync("job-1", [segment("Goedemorgen allemaal, welkom!", start=12.0, end=14.0, words=words)])
+    index.index_job_sync("job-2", [segment("welkom zonder woordtijden", start=30.0, end=33.0)])
+
+    hits = {hit["job_id"]: hit for hit in index.search_sync("welkom")["hits"]}
+    assert hits["job-1"]["timestamp_seconds"] == 13.5
+    assert hits["job-1"]["highlights"] == [[22, 28]]
+    # Without word timings the hit falls back to the segment start
+    assert hits["job-2"]["timestamp_seconds"] == 30.0
+    # A match inside a word uses that word's time
+    assert index.search_sync("emaal")["hits"][0]["timestamp_seconds"] == 12.8
+
+
+def test_word_times_come_from_the_words_provider(index):
+    words = [[{"word": "hallo", "start_seconds": 1.0}, {"word": "wereld", "start_seconds": 1.6}]]
+    index.index_job_sync("job-1", [segment("hallo wereld", start=1.0)], words_for=lambda position: words[position])
+
+    assert index.search_sync("wereld")["hits"][0]["timestamp_seconds"] == 1.6
@@ -0,0 +1,77 @@
+"""Tests of the parallel speaker identification."""
+
+import asyncio
+import json
+import re
+
+import pytest
+
+from config import Settings
+from services.speaker_identification import SpeakerIdentificationService
+
+TRANSCRIPT = " ".join(f"Dit is zin nummer {index} van de lange vergadering van vandaag." for index in range(130))
+
+
+@pytest.fixture
+def service():
+    service = SpeakerIdentificationService(Settings(
+        speaker_identification_parallel=True,
+        speaker_identification_concurrency=4
+    ))
+    # 26 segments of about 290 characters, labelled as three chunks
+    service.MAX_SEGMENTS_PER_REQUEST = 10
+    return service
+
+
+def fake_llm(failing_chunk=None):
+    """Label even segments Spreker A and odd ones Spreker B, finishing later chunks first."""
+    calls = []
+
+    async def invoke(messages):
+        segment_lines = messages[-1].content.split("Segmenten:\n")[1].split("\n\n")[0]
+        segment_ids = [int(match) for match in re.findall(r"^(\d+)\. ", segment_lines, re.MULTILINE)]
+        calls.append(segment_ids)
+        if segment_ids == failing_chunk:
+            raise RuntimeError("quota exceeded")
+        # Earlier chunks answer last, so results arrive out of order
+        await asyncio.sleep(0.05 / (1 + min(segment_ids)))
+        return json.dumps({
+            "overall_confidence": "high",
+            "speakers": [{"label": "Spreker A"}, {"label": "Spreker B"}],
+            "segments": [
+                {"segment_id": segment_id, "speaker": f"Spreker {'AB'[segment_id % 2]}", "confidence": "high"}
+                for segment_id in segment_ids
+            ],
+        })
+
+    return invoke, calls
+
+
+async def test_parallel_results_are_merged_in_segment_order(service, monkeypatch):
+    invoke, calls = fake_llm()
+    monkeypatch.setattr(service, "_invoke_llm", invoke)
+
+    result = await service.identify_speakers(TRANSCRIPT)
+
+    segment_ids = [segment["segment_id"] for segment in result["segments"]]
+    assert len(calls) == 4  # roster sample and three chunks
+    assert segment_ids == sorted(segment_ids)
+    assert len(segment_ids) == sum(len(ids) for ids in calls[1:])
+    assert all(segment["speaker"] == f"Spreker {'AB'[segment['segment_id'] % 2]}" for segment in result["segments"])
+    assert result["speakers_identified"]
+
+
+async def test_a_failed_chunk_falls_back_without_failing_the_job(service, monkeypatch):
+    segments = service._segment_transcript(TRANSCRIPT)
+    failing_chunk = [segment.segment_id for segment in service._chunk_segments(segments)[1]]
+    invoke, _ = fake_llm(failing_chunk)
+    monkeypatch.setattr(service, "_invoke_llm", invoke)
+
+    result = await service.identify_speakers(TRANSCRIPT)
+
+    by_id = {segment["segment_id"]: segment for segment in result["segments"]}
+    assert len(by_id) == len(segments)
+    assert all((by_id[segment_id]["speaker"], by_id[segment_id]["confidence"]) == ("Spreker A", "low") for segment_id in failing_chunk)
+    labelled = [segment for segment in result["segments"] if segment["segment_id"] not in failing_chunk]
+    assert all(segment["confidence"] == "high" for segment in labelled)
+    assert {segment["speaker"] for segment in labelled} == {"Spreker A", "Spreker B"}
@@ -0,0 +1,93 @@
+"""Tests of the ``/api/v1/transcription/{job_id}`` status endpoint."""
+
+from datetime import datetime
+
+import pytest
+
+from models import JobStatus, TranscriptSegment
+
+
+def create_completed_job(client, app_module, segment_count=5):
+    segments = [
+        TranscriptSegment(text=f"zin {index}", start_time=float(index), end_time=index + 1.0)
+        for index in range(segment_count)
+    ]
+    job = JobStatus(
+        job_id="job-1",
+        status="completed",
+        created_at=datetime(2026, 1, 1),
+        gcs_uri="gs://uploads/a.wav",
+        transcript=" ".join(segment.text for segment in segments),
+        transcript_segments=segments
+    )
+    client.portal.call(app_module.job_store.create, job)
+    return job.job_id
+
+
+def test_matching_if_none_match_returns_304(client, app_module):
+    job_id = create_completed_job(client, app_module)
+
+    first = client.get(f"/api/v1/transcription/{job_id}")
+    etag = first.headers["ETag"]
+    unchanged = client.get(f"/api/v1/transcription/{job_id}", headers={"If-None-Match": f'"other", {etag}'})
+
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["ETag"] == etag
+
+    client.portal.call(lambda: app_module.job_store.update(job_id, transcript="nieuw"))
+    changed = client.get(f"/api/v1/transcription/{job_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["transcript"] == "nieuw"
+
+
+def test_etag_depends_on_the_projection(client, app_module):
+    job_id = create_completed_job(client, app_module)
+
+    etag = client.get(f"/api/v1/transcription/{job_id}").headers["ETag"]
+    projected = client.get(f"/api/v1/transcription/{job_id}?fields=status", headers={"If-None-Match": etag})
+
+    assert projected.status_code == 200
+
+
+def test_fields_projection(client, app_module):
+    job_id = create_completed_job(client, app_module)
+
+    body = client.get(f"/api/v1/transcription/{job_id}?fields=transcript,progress").json()
+
+    # The base fields are always returned
+    assert set(body) == {"job_id", "status", "version", "transcript", "progress"}
+    assert body["progress"] == 100
+
+
+def test_unknown_fields_are_rejected(client, app_module):
+    job_id = create_completed_job(client, app_module)
+
+    response = client.get(f"/api/v1/transcription/{job_id}?fields=status,secret")
+
+    assert response.status_code == 400
+    assert "secret" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("query, texts, next_offset", [
+    ("segments_offset=1&segments_limit=2", ["zin 1", "zin 2"], 3),
+    ("segments_offset=3&segments_limit=2", ["zin 3", "zin 4"], None),
+    ("segments_offset=4&segments_limit=10", ["zin 4"], None),
+    ("segments_offset=7", [], None),
+])
+def test_segment_paging(client, app_module, query, texts, next_offset):
+    job_id = create_completed_job(client, app_module)
+
+    body = client.get(f"/api/v1/transcription/{job_id}?{query}").json()
+
+    assert [segment["text"] for segment in body["transcript_segments"]] == texts
+    assert body["segments_total"] == 5
+    assert body.get("next_segments_offset") == next_offset
+
+
+@pytest.mark.parametrize("query", ["segments_offset=-1", "segments_limit=0"])
+def test_segment_paging_bounds_are_validated(client, app_module, query):
+    job_id = create_completed_job(client, app_module)
+
+    assert client.get(f"/api/v1/transcription/{job_id}?{query}").status_code == 422
@@ -0,0 +1,224 @@
+"""Tests of the storage helpers that run without GCS."""
+
+import base64
+import hashlib
+import io
+import shutil
+import subprocess
+import wave
+
+import google_crc32c
+import numpy as np
+import pytest
+
+from config import Settings
+from services.audio_format import get_formats
+from services.lazy import Lazy
+from services.storage import ChecksumReader, StorageService
+
+settings = Settings()
+
+
+def test_checksum_reader_hashes_each_byte_once():
+    data = bytes(range(256)) * 1000
+    reader = ChecksumReader(io.BytesIO(data))
+
+    reader.read(100_000)
+    # Upload retries seek back and re-send a chunk
+    reader.seek(50_000)
+    while reader.read(30_000):
+        pass
+
+    assert reader.size == len(data)
+    assert reader.sha256 == hashlib.sha256(data).hexdigest()
+    assert reader.md5_hash == base64.b64encode(hashlib.md5(data).digest()).decode()
+    assert reader.crc32c == base64.b64encode(google_crc32c.Checksum(data).digest()).decode()
+
+
+class FakeBlob:
+    """Just enough of ``storage.Blob`` for the streaming FFmpeg paths."""
+
+    def __init__(self, bucket, name, chunk_size=None):
+        self.bucket = bucket
+        self.name = name
+        self.metadata = None
+
+    def open(self, mode, **kwargs):
+        if mode == "rb":
+            return io.BytesIO(self.bucket.objects[self.name])
+        return FakeWriter(self)
+
+
+class FakeWriter(io.BytesIO):
+    def __init__(self, blob):
+        super().__init__()
+        self.blob = blob
+
+    def close(self):
+        if not self.closed:
+            self.blob.bucket.objects[self.blob.name] = self.getvalue()
+            self.blob.bucket.metadata[self.blob.name] = self.blob.metadata
+        super().close()
+
+
+class FakeBucket:
+    def __init__(self):
+        self.objects = {}
+        self.metadata = {}
+
+    def blob(self, name, chunk_size=None):
+        return FakeBlob(self, name, chunk_size)
+
+
+def tone(seconds: float, sample_rate: int = 16000) -> np.ndarray:
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (np.sin(2 * np.pi * 440 * t) * 8000).astype("<i2")
+
+
+def quiet(seconds: float, sample_rate: int = 16000) -> np.ndarray:
+    return np.random.default_rng(1).normal(0, 5, int(seconds * sample_rate)).astype("<i2")
+
+
+def wav_bytes(samples: np.ndarray, sample_rate: int = 16000) -> bytes:
+    output = io.BytesIO()
+    with wave.open(output, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(samples.tobytes())
+    return output.getvalue()
+
+
+def decode(data: bytes) -> bytes:
+    result = subprocess.run(
+        [settings.ffmpeg_path, "-v", "error", "-i", "pipe:0", "-f", "s16le", "-ac", "1", "-ar", "16000", "pipe:1"],
+        input=data,
+        capture_output=True,
+        check=True
+    )
+    return result.stdout
+
+
+requires_ffmpeg = pytest.mark.skipif(shutil.which(settings.ffmpeg_path) is None, reason="FFmpeg is not installed")
+
+
+@pytest.fixture
+def bucket():
+    return FakeBucket()
+
+
+@pytest.fixture
+def storage_service(bucket, monkeypatch):
+    service = StorageService(Settings(
+        gcs_bucket_name="uploads",
+        silence_trimming_min_saved_seconds=1.0,
+        ffmpeg_stream_chunk_size_kb=16
+    ))
+    monkeypatch.setattr(service, "_clients", Lazy("storage", lambda: {"bucket": bucket}))
+    return service
+
+
+@requires_ffmpeg
+async def test_trim_silence_streams_speech_into_the_intermediate_format(storage_service, bucket):
+    bucket.objects["meeting.wav"] = wav_bytes(np.concatenate([tone(2), quiet(6), tone(2), quiet(6)]))
+    audio_format = get_formats(storage_service.settings)["flac"]
+
+    trimmed = await storage_service.trim_silence("gs://uploads/meeting.wav", "job-1", audio_format=audio_format)
+
+    assert trimmed["gcs_uri"] == "gs://uploads/trimmed/job-1/meeting_speech.flac"
+    data = bucket.objects["trimmed/job-1/meeting_speech.flac"]
+    assert data.startswith(b"fLaC")
+    assert trimmed["original_seconds"] == 16.0
+    assert trimmed["removed_seconds"] > 10
+
+    # The upload holds the kept regions and gaps, as announced in the metadata
+    duration = float(bucket.metadata["trimmed/job-1/meeting_speech.flac"]["duration_seconds"])
+    assert len(decode(data)) / 2 / 16000 == pytest.approx(duration, abs=0.001)
+    assert duration == pytest.approx(16.0 - trimmed["removed_seconds"], abs=0.001)
+    assert trimmed["offset_map"].to_original(0.1) == pytest.approx(0.1)
+
+
+@requires_ffmpeg
+async def test_trim_silence_keeps_audio_without_pauses(storage_service, bucket):
+    bucket.objects["speech.wav"] = wav_bytes(tone(5))
+
+    assert await storage_service.trim_silence("gs://uploads/speech.wav", "job-1") is None
+    assert list(bucket.objects) == ["speech.wav"]
+
+
+@requires_ffmpeg
+async def test_trim_silence_abandons_the_upload_when_decoding_fails(storage_service, bucket):
+    bucket.objects["broken.wav"] = b"RIFF" + bytes(100)
+
+    with pytest.raises(RuntimeError, match="FFmpeg error"):
+        await storage_service.trim_silence("gs://uploads/broken.wav", "job-1")
+    assert list(bucket.objects) == ["broken.wav"]
+
+
+@requires_ffmpeg
+async def test_split_streams_job_scoped_wav_chunks(storage_service, bucket):
+    samples = np.concatenate([tone(20), quiet(2), tone(20), quiet(2), tone(20)])
+    bucket.objects["long.wav"] = wav_bytes(samples)
+    pcm = samples.tobytes()
+
+    chunks = await storage_service.split_audio_for_recognition(
+        "gs://uploads/long.wav", chunk_seconds=21, overlap_seconds=1, job_id="job-7"
+    )
+
+    assert len(chunks) == 3
+    assert [chunk["gcs_uri"] for chunk in chunks] == [
+        f"gs://uploads/chunks/job-7/long_{index:03d}.wav" for index in range(3)
+    ]
+    # Cuts are placed in the silences, and each chunk holds exactly its range
+    assert 20 < chunks[0]["core_end_seconds"] < 22
+    for chunk in chunks:
+        with wave.open(io.BytesIO(bucket.objects[chunk["gcs_uri"][len("gs://uploads/"):]])) as wav_file:
+            frames = wav_file.readframes(wav_file.getnframes())
+        start, end = int(chunk["start_seconds"] * 16000) * 2, int(chunk["end_seconds"] * 16000) * 2
+        assert frames == pcm[start:end]
+
+
+@requires_ffmpeg
+async def test_split_keeps_short_audio_whole(storage_service, bucket):
+    bucket.objects["short.wav"] = wav_bytes(tone(5))
+
+    chunks = await storage_service.split_audio_for_recognition(
+        "gs://uploads/short.wav", chunk_seconds=21, overlap_seconds=1, job_id="job-7"
+    )
+
+    assert [chunk["gcs_uri"] for chunk in chunks] == ["gs://uploads/short.wav"]
+    assert list(bucket.objects) == ["short.wav"]
+
+
+async def test_only_trimmed_audio_of_the_job_is_deleted(storage_service, monkeypatch):
+    deleted = []
+
+    async def delete_file(gcs_uri):
+        deleted.append(gcs_uri)
+
+    monkeypatch.setattr(storage_service, "delete_file", delete_file)
+
+    assert await storage_service.delete_trimmed_audio("gs://uploads/trimmed/job-1/talk_speech.flac", "job-1")
+    assert not await storage_service.delete_trimmed_audio("gs://uploads/talk.wav", "job-1")
+    assert not await storage_service.delete_trimmed_audio("gs://uploads/trimmed/job-2/talk_speech.flac", "job-1")
+    assert deleted == ["gs://uploads/trimmed/job-1/talk_speech.flac"]
+
+
+async def test_extracted_audio_is_named_per_job(storage_service, bucket, monkeypatch):
+    async def extract(source_blob, audio_blob, audio_format):
+        audio_blob.open("wb").close()
+        return None
+
+    async def needs_seekable_input(blob):
+        return False
+
+    monkeypatch.setattr(storage_service, "_extract_audio_streaming", extract)
+    monkeypatch.setattr(storage_service, "_needs_seekable_input", needs_seekable_input)
+    bucket.objects["talk.mp4"] = b"video"
+    audio_format = get_formats(storage_service.settings)["flac"]
+
+    first = await storage_service.extract_and_upload_audio("gs://uploads/talk.mp4", audio_format, job_id="job-1")
+    second = await storage_service.extract_and_upload_audio("gs://uploads/talk.mp4", audio_format, job_id="job-2")
+
+    assert first == "gs://uploads/extracted/job-1/talk_audio.flac"
+    assert second == "gs://uploads/extracted/job-2/talk_audio.flac"
@@ -0,0 +1,118 @@
+"""Tests of chunked recognition and the recognition cache in the transcription service."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from config import Settings
+from services.cache import MemoryCacheTier, ResultCache
+from services.transcription import TranscriptionService
+
+
+class ChunkingStorage:
+    """Splits every file into two chunks and records the calls."""
+
+    def __init__(self):
+        self.split_calls = []
+        self.deleted = []
+
+    async def split_audio_for_recognition(self, gcs_uri, chunk_seconds, overlap_seconds, job_id=None):
+        self.split_calls.append((gcs_uri, job_id))
+        return [
+            {"index": index, "start_seconds": start, "end_seconds": start + 12.0,
+             "core_start_seconds": start + (1.0 if index else 0.0), "core_end_seconds": start + 11.0,
+             "gcs_uri": f"gs://uploads/chunks/{job_id}/long_{index:03d}.wav"}
+            for index, start in enumerate((0.0, 10.0))
+        ]
+
+    async def delete_file(self, gcs_uri):
+        self.deleted.append(gcs_uri)
+
+
+async def test_chunks_are_named_after_the_job_and_deleted():
+    storage = ChunkingStorage()
+    service = TranscriptionService(Settings(), storage_service=storage)
+
+    async def recognize(gcs_uri, on_progress=None):
+        return gcs_uri, [{"text": gcs_uri, "start_seconds": 2.0, "end_seconds": 3.0, "words": []}]
+
+    transcript, segments = await service._transcribe_chunked("gs://uploads/long.wav", recognize, job_id="job-7")
+
+    assert storage.split_calls == [("gs://uploads/long.wav", "job-7")]
+    assert [segment["start_seconds"] for segment in segments] == [2.0, 12.0]
+    assert sorted(storage.deleted) == [
+        "gs://uploads/chunks/job-7/long_000.wav",
+        "gs://uploads/chunks/job-7/long_001.wav",
+    ]
+
+
+class ChecksumStorage:
+    """Reports the same checksums for every object."""
+
+    async def get_object_checksums(self, gcs_uri):
+        return {"crc32c": "AAAAAA==", "md5_hash": "md5", "size": 1000}
+
+
+@pytest.fixture
+def cached_service(monkeypatch):
+    """Service with a recognition cache whose v2 recognitions are scripted."""
+    service = TranscriptionService(
+        Settings(chunked_recognition=False, recognizer_location="europe-west4", default_recognizer_id="recognizer"),
+        storage_service=ChecksumStorage(),
+        recognition_cache=ResultCache("recognition", MemoryCacheTier(1024 * 1024))
+    )
+    service.recognitions = []
+    service.responses = []
+
+    async def transcribe_v2(gcs_uri, recognizer_id, language_code, on_progress=None):
+        service.recognitions.append(language_code)
+        response = service.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(service, "_transcribe_v2", transcribe_v2)
+    return service
+
+
+SEGMENTS = [{"text": "hallo", "start_seconds": 0.0, "end_seconds": 1.0, "words": []}]
+
+
+async def test_recognition_cache_hit(cached_service):
+    cached_service.responses = [("hallo", SEGMENTS)]
+
+    first = await cached_service.transcribe_audio("gs://uploads/a.flac", language_code="nl-NL")
+    second = await cached_service.transcribe_audio("gs://uploads/a.flac", language_code="nl-NL")
+
+    assert first[:2] == second[:2] == ("hallo", SEGMENTS)
+    assert cached_service.recognitions == ["nl-NL"]
+
+
+async def test_recognition_cache_misses_for_another_config(cached_service):
+    cached_service.responses = [("hallo", SEGMENTS), ("hello", SEGMENTS)]
+
+    await cached_service.transcribe_audio("gs://uploads/a.flac", language_code="nl-NL")
+    transcript, *_ = await cached_service.transcribe_audio("gs://uploads/a.flac", language_code="en-US")
+
+    assert transcript == "hello"
+    assert cached_service.recognitions == ["nl-NL", "en-US"]
+
+
+async def test_empty_or_failed_recognitions_are_not_cached(cached_service):
+    cached_service.responses = [("", []), RuntimeError("Recognition failed"), ("hallo", SEGMENTS)]
+
+    assert (await cached_service.transcribe_audio("gs://uploads/a.flac"))[:2] == ("", [])
+    with pytest.raises(RuntimeError):
+        await cached_service.transcribe_audio("gs://uploads/a.flac")
+    assert (await cached_service.transcribe_audio("gs://uploads/a.flac"))[:2] == ("hallo", SEGMENTS)
+    assert len(cached_service.recognitions) == 3
+
+
+def test_v2_file_errors_raise():
+    service = TranscriptionService(Settings())
+    response = SimpleNamespace(results={
+        "gs://uploads/a.flac": SimpleNamespace(error=SimpleNamespace(code=3, message="bad audio"), transcript=None),
+    })
+
+    with pytest.raises(RuntimeError, match="bad audio"):
+        service._parse_v2_transcript(response, "gs://uploads/a.flac")
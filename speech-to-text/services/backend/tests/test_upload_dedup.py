@@ -0,0 +1,130 @@
+"""Tests of the upload deduplication index."""
+
+import base64
+import hashlib
+
+import pytest
+
+from services.upload_dedup import UploadDedupIndex, normalize_content_hash
+from services.upload_sessions import InMemoryUploadSessionStore
+
+
+def md5_of(data: bytes) -> str:
+    return base64.b64encode(hashlib.md5(data).digest()).decode("ascii")
+
+
+class FakeUploadBucket:
+    """Objects by name, with the generation and MD5 GCS would report."""
+
+    bucket_name = "uploads"
+
+    def __init__(self):
+        self.objects = {}
+        self.generations = 0
+
+    def put(self, name: str, data: bytes, composite: bool = False) -> dict:
+        self.generations += 1
+        self.objects[name] = {
+            "generation": self.generations,
+            "size": len(data),
+            "md5_hash": None if composite else md5_of(data),
+            "crc32c": "AAAAAA==",
+        }
+        return dict(self.objects[name])
+
+    async def get_upload_info(self, filename):
+        info = self.objects.get(filename)
+        return dict(info) if info is not None else None
+
+
+@pytest.fixture
+def bucket():
+    return FakeUploadBucket()
+
+
+@pytest.fixture
+def index(bucket):
+    return UploadDedupIndex(bucket, InMemoryUploadSessionStore(3600), InMemoryUploadSessionStore(3600))
+
+
+POPULAR = b"popular recording" * 100
+FORGED = b"something else entirely".ljust(len(POPULAR), b"!")
+
+
+def test_normalize_accepts_hex_and_base64():
+    digest = hashlib.sha256(b"x").digest()
+    assert normalize_content_hash("sha256", digest.hex()) == digest.hex()
+    assert normalize_content_hash("SHA256", base64.b64encode(digest).decode()) == digest.hex()
+    assert normalize_content_hash("md5", hashlib.md5(b"x").hexdigest()) == md5_of(b"x")
+
+
+@pytest.mark.parametrize("algorithm, value", [("crc32c", "AAAAAA=="), ("md5", "abc"), ("sha1", "00" * 20)])
+def test_normalize_rejects_unsupported_or_malformed(algorithm, value):
+    with pytest.raises(ValueError):
+        normalize_content_hash(algorithm, value)
+
+
+async def test_direct_upload_is_indexed_under_gcs_md5(index, bucket):
+    digest = md5_of(POPULAR)
+    await index.claim("a.wav", "md5", digest, len(POPULAR))
+    bucket.put("a.wav", POPULAR)
+
+    assert await index.confirm("a.wav")
+    found = await index.lookup("md5", digest, len(POPULAR))
+    assert found["gcs_uri"] == "gs://uploads/a.wav"
+
+
+async def test_forged_sha256_claim_is_never_indexed(index, bucket):
+    popular_sha256 = hashlib.sha256(POPULAR).hexdigest()
+    await index.claim("forged.wav", "sha256", popular_sha256, len(POPULAR))
+    bucket.put("forged.wav", FORGED)
+    await index.confirm("forged.wav")
+
+    assert await index.lookup("sha256", popular_sha256, len(POPULAR)) is None
+    # Only the real content's MD5 points at the object
+    assert await index.lookup("md5", md5_of(POPULAR), len(POPULAR)) is None
+    assert (await index.lookup("md5", md5_of(FORGED), len(FORGED)))["filename"] == "forged.wav"
+
+
+async def test_forged_md5_claim_is_not_matched(index, bucket):
+    await index.claim("forged.wav", "md5", md5_of(POPULAR), len(POPULAR))
+    bucket.put("forged.wav", FORGED)
+    await index.confirm("forged.wav")
+
+    assert await index.lookup("md5", md5_of(POPULAR), len(POPULAR)) is None
+
+
+async def test_composite_upload_is_not_indexed(index, bucket):
+    await index.claim("big.wav", "md5", md5_of(POPULAR), len(POPULAR))
+    bucket.put("big.wav", POPULAR, composite=True)
+
+    assert not await index.confirm("big.wav")
+    assert await index.lookup("md5", md5_of(POPULAR), len(POPULAR)) is None
+
+
+async def test_confirm_waits_for_the_upload(index, bucket):
+    await index.claim("a.wav", "md5", md5_of(POPULAR), len(POPULAR))
+    assert not await index.confirm("a.wav")
+
+    bucket.put("a.wav", POPULAR)
+    assert await index.confirm("a.wav")
+
+
+async def test_inline_upload_is_indexed_under_computed_sha256(index, bucket):
+    result = bucket.put("inline.wav", POPULAR)
+    result["sha256"] = hashlib.sha256(POPULAR).hexdigest()
+    assert await index.record("inline.wav", result) == 2
+
+    found = await index.lookup("sha256", result["sha256"], len(POPULAR))
+    assert found["filename"] == "inline.wav"
+
+
+async def test_replaced_object_is_stale(index, bucket):
+    result = bucket.put("inline.wav", POPULAR)
+    result["sha256"] = hashlib.sha256(POPULAR).hexdigest()
+    await index.record("inline.wav", result)
+
+    # Overwritten with other bytes of the same size: new generation
+    bucket.put("inline.wav", FORGED)
+    assert await index.lookup("sha256", result["sha256"], len(POPULAR)) is None
+    assert index.get_stats()["stale_entries"] == 1
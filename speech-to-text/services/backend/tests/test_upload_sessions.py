@@ -0,0 +1,52 @@
+"""Tests of the resumable upload chunk sizing and session stores."""
+
+import pytest
+
+from config import Settings
+from services.upload_sessions import (
+    CHUNK_ALIGNMENT,
+    create_upload_session_store,
+    recommend_chunk_size,
+)
+
+MB = 1024 * 1024
+
+
+@pytest.mark.parametrize("file_size, throughput", [
+    (3 * 1024 * MB, None),
+    (3 * 1024 * MB, 3.3 * MB),
+    (None, 12_345_678.0),
+    (1234567891, 777_777.0),
+])
+def test_chunk_size_is_aligned(file_size, throughput):
+    size = recommend_chunk_size(file_size, throughput)
+
+    assert size % CHUNK_ALIGNMENT == 0
+    assert size >= CHUNK_ALIGNMENT
+
+
+def test_chunk_size_follows_the_throughput():
+    assert recommend_chunk_size(10 * 1024 * MB, 4 * MB, target_chunk_seconds=10) == 40 * MB
+
+
+def test_chunk_size_without_throughput_splits_the_file():
+    assert recommend_chunk_size(2000 * MB, target_chunk_count=200) == 10 * MB
+    assert recommend_chunk_size(None) == 8 * MB
+
+
+@pytest.mark.parametrize("throughput, expected", [(1024.0, 8 * MB), (100 * MB, 256 * MB)])
+def test_chunk_size_is_clamped(throughput, expected):
+    assert recommend_chunk_size(10 * 1024 * MB, throughput) == expected
+
+
+def test_chunk_size_does_not_exceed_the_file():
+    # A 1 MB file fits one chunk, rounded up to the alignment
+    assert recommend_chunk_size(MB + 1, 100 * MB) == MB + CHUNK_ALIGNMENT
+    assert recommend_chunk_size(10) == CHUNK_ALIGNMENT
+
+
+def test_store_ttl_can_be_set_per_kind_of_record():
+    settings = Settings(upload_session_ttl_hours=168)
+
+    assert create_upload_session_store(settings).ttl_seconds == 168 * 3600
+    assert create_upload_session_store(settings, ttl_hours=24).ttl_seconds == 24 * 3600
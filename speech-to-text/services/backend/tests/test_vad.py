@@ -0,0 +1,30 @@
+"""Tests of the voice activity detector."""
+
+import numpy as np
+
+from services.vad import StreamingFrameFeatures, frame_features
+
+
+def test_streaming_features_match_whole_signal():
+    rng = np.random.default_rng(0)
+    samples = (rng.normal(0, 3000, 16000 * 7 + 123)).astype("<i2")
+    data = samples.tobytes()
+
+    features = StreamingFrameFeatures(16000, frame_ms=30)
+    position = 0
+    # Blocks that split frames and even samples
+    for size in (1, 999, 4097, 65536, 12345, 1) * 20:
+        features.feed(data[position:position + size])
+        position += size
+    features.feed(data[position:])
+
+    energies, crossings = features.result()
+    expected_energies, expected_crossings = frame_features(samples, 16000, frame_ms=30)
+    np.testing.assert_array_equal(energies, expected_energies)
+    np.testing.assert_array_equal(crossings, expected_crossings)
+    assert features.duration == len(samples) / 16000
+
+
+def test_streaming_features_without_audio():
+    energies, crossings = StreamingFrameFeatures(16000).result()
+    assert len(energies) == len(crossings) == 0
@@ -0,0 +1,50 @@
+"""Tests of the ``/ws/{job_id}`` progress WebSocket."""
+
+from datetime import datetime
+
+import pytest
+
+from models import JobStatus
+
+
+def create_job(client, app_module, **fields):
+    job = JobStatus(job_id="job-1", created_at=datetime.now(), gcs_uri="gs://uploads/a.wav", **fields)
+    client.portal.call(app_module.job_store.create, job)
+    return job.job_id
+
+
+@pytest.mark.parametrize("fields, progress", [
+    ({"status": "pending"}, 0),
+    ({"status": "extracting_audio"}, 20),
+    ({"status": "transcribing"}, 25),
+    ({"status": "transcribing", "recognition_progress": 50}, 52),
+])
+def test_initial_message_reports_stored_progress(client, app_module, fields, progress):
+    job_id = create_job(client, app_module, **fields)
+
+    with client.websocket_connect(f"/ws/{job_id}") as websocket:
+        message = websocket.receive_json()
+
+    assert message["status"] == fields["status"]
+    assert message["progress"] == progress
+    assert message["seq"] == 0
+
+
+def test_completed_job_closes_after_initial_message(client, app_module):
+    job_id = create_job(client, app_module, status="completed")
+
+    with client.websocket_connect(f"/ws/{job_id}") as websocket:
+        assert websocket.receive_json()["progress"] == 100
+        assert websocket.receive()["type"] == "websocket.close"
+
+
+def test_events_follow_initial_message(client, app_module):
+    job_id = create_job(client, app_module, status="processing")
+
+    with client.websocket_connect(f"/ws/{job_id}") as websocket:
+        websocket.receive_json()
+        client.portal.call(app_module.notify_websocket, job_id, {"status": "completed", "message": "done"})
+        event = websocket.receive_json()
+
+    assert event["status"] == "completed"
+    assert event["seq"] == 1
@@ -415,6 +415,9 @@ export function useTranscription() {
       speakerIdentifiedTranscript: data.data?.speaker_identified_transcript || prev.speakerIdentifiedTranscript,
       speakerIdentificationSummary: data.data?.speaker_identification_summary || prev.speakerIdentificationSummary,
       refinedTranscript: data.data?.refined_transcript ?? prev.refinedTranscript,
+      estimatedCompletionMs: data.eta_seconds != null
+        ? Date.now() + data.eta_seconds * 1000
+        : prev.estimatedCompletionMs,
       fileName: prev.fileName ?? currentFileNameRef.current
     }))
 
@@ -831,6 +834,29 @@ export function useTranscription() {
       setTranscriptionProgressHint(null)
     }
 
+    // Count down to the backend ETA, derived from recognition throughput, when available
+    const backendDeadline = status === 'transcribing' ? transcriptionState.estimatedCompletionMs : undefined
+    if (backendDeadline != null) {
+      const countDown = () => {
+        setTranscriptionEta(Math.max((backendDeadline - Date.now()) / 1000, 0))
+      }
+
+      countDown()
+
+      if (transcriptionEtaTimer.current) {
+        clearInterval(transcriptionEtaTimer.current)
+      }
+      transcriptionEtaTimer.current = setInterval(countDown, 1000)
+      transcriptionLastStatus.current = status
+
+      return () => {
+        if (transcriptionEtaTimer.current) {
+          clearInterval(transcriptionEtaTimer.current)
+          transcriptionEtaTimer.current = null
+        }
+      }
+    }
+
     const heuristicExpected = getEstimatedStageDuration(status)
     const storedExpected = transcriptionStageExpected.current
     const storedStage = transcriptionLastStatus.current
@@ -898,7 +924,7 @@ export function useTranscription() {
         transcriptionEtaTimer.current = null
       }
     }
-  }, [transcriptionState.status, transcriptionState.progress, getEstimatedStageDuration])
+  }, [transcriptionState.status, transcriptionState.progress, transcriptionState.estimatedCompletionMs, getEstimatedStageDuration])
 
   // Delete transcription
   const deleteTranscription = useCallback(async (jobId: string) => {
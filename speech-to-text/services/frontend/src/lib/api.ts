@@ -8,7 +8,8 @@ import type {
   RecognizerResponse,
   SignedUrlResponse,
   EnhancedSignedUrlResponse,
-  UploadProgress
+  UploadProgress,
+  UploadSession
 } from '@/types/transcription'
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
@@ -299,6 +300,141 @@ export class ApiClient {
     return sessionUrl
   }
 
+  /**
+   * Start a server-side resumable upload session
+   */
+  static async createUploadSession(
+    file: File,
+    throughputBytesPerSecond?: number
+  ): Promise<UploadSession> {
+    const response: AxiosResponse<UploadSession> = await api.post('/api/v1/upload-session', {
+      filename: file.name,
+      file_size: file.size,
+      content_type: file.type || undefined,
+      throughput_bytes_per_second: throughputBytesPerSecond
+    })
+    return response.data
+  }
+
+  /**
+   * Get the committed offset and next chunk size of an upload session
+   */
+  static async getUploadSession(
+    sessionId: string,
+    throughputBytesPerSecond?: number
+  ): Promise<UploadSession> {
+    const params = throughputBytesPerSecond
+      ? `?throughput_bytes_per_second=${Math.round(throughputBytesPerSecond)}`
+      : ''
+    const response: AxiosResponse<UploadSession> = await api.get(
+      `/api/v1/upload-session/${sessionId}${params}`
+    )
+    return response.data
+  }
+
+  /**
+   * Upload a large file through a server-side resumable session.
+   *
+   * The session ID is remembered per file, so an upload interrupted by a
+   * network error or a page reload continues from the committed offset.
+   * The chunk size is re-requested every few chunks with the measured
+   * throughput, so fast connections send fewer, larger chunks.
+   */
+  static async uploadWithSession(
+    file: File,
+    onProgress?: (progress: UploadProgress) => void,
+    maxRetries = 5
+  ): Promise<UploadSession> {
+    const storageKey = `upload-session:${file.name}:${file.size}:${file.lastModified}`
+    const totalSize = file.size
+    onProgress?.({ percent: 0, loaded: 0, total: totalSize, stage: 'preparing' })
+
+    let session: UploadSession | null = null
+    const savedSessionId = typeof window !== 'undefined' ? window.localStorage.getItem(storageKey) : null
+    if (savedSessionId) {
+      try {
+        session = await this.getUploadSession(savedSessionId)
+      } catch {
+        session = null // Expired or unknown: start over
+      }
+    }
+    if (!session) {
+      session = await this.createUploadSession(file)
+      if (typeof window !== 'undefined') {
+        window.localStorage.setItem(storageKey, session.session_id)
+      }
+    }
+
+    let uploaded = session.committed_bytes ?? 0
+    let chunkSize = session.chunk_size
+    let throughput: number | undefined
+    let chunksSinceUpdate = 0
+    let retries = 0
+
+    while (!session.complete && uploaded < totalSize) {
+      const chunk = file.slice(uploaded, Math.min(uploaded + chunkSize, totalSize))
+      const chunkEnd = uploaded + chunk.size - 1
+      const started = performance.now()
+
+      try {
+        const response = await axios.put(session.session_uri, chunk, {
+          headers: {
+            'Content-Range': `bytes ${uploaded}-${chunkEnd}/${totalSize}`,
+          },
+          // GCS returns 308 for intermediate chunks; treat that as success
+          validateStatus: (status) => (status >= 200 && status < 300) || status === 308,
+          onUploadProgress: (progressEvent) => {
+            const loaded = uploaded + progressEvent.loaded
+            onProgress?.({
+              percent: Math.round((loaded * 100) / totalSize),
+              loaded,
+              total: totalSize,
+              stage: 'uploading'
+            })
+          },
+        })
+
+        const seconds = (performance.now() - started) / 1000
+        if (seconds > 0) {
+          throughput = chunk.size / seconds
+        }
+
+        if (response.status === 308) {
+          const match = /bytes=0-(\d+)/.exec(response.headers['range'] || '')
+          uploaded = match ? parseInt(match[1], 10) + 1 : 0
+        } else {
+          uploaded = totalSize
+        }
+        retries = 0
+
+        // Ask for a chunk size matching the measured throughput
+        chunksSinceUpdate += 1
+        if (uploaded < totalSize && (chunksSinceUpdate === 1 || chunksSinceUpdate >= 8)) {
+          session = await this.getUploadSession(session.session_id, throughput)
+          uploaded = session.committed_bytes
+          chunkSize = session.chunk_size
+          chunksSinceUpdate = 1
+        }
+      } catch (error) {
+        if (retries >= maxRetries) {
+          throw error
+        }
+        retries += 1
+        await new Promise((resolve) => setTimeout(resolve, Math.min(1000 * 2 ** retries, 30000)))
+        // Resume exactly at the offset GCS has committed
+        session = await this.getUploadSession(session.session_id, throughput)
+        uploaded = session.complete ? totalSize : session.committed_bytes
+        chunkSize = session.chunk_size
+      }
+    }
+
+    if (typeof window !== 'undefined') {
+      window.localStorage.removeItem(storageKey)
+    }
+    onProgress?.({ percent: 100, loaded: totalSize, total: totalSize, stage: 'completing' })
+    return session
+  }
+
   /**
    * Smart file upload that automatically chooses the best upload method
    */
@@ -309,6 +445,15 @@ export class ApiClient {
     try {
       onProgress?.({ percent: 0, loaded: 0, total: file.size, stage: 'preparing' })
 
+      if (file.size >= 100 * 1024 * 1024) { // 100MB threshold
+        // Large files go through a server-side session that can be resumed
+        const session = await this.uploadWithSession(file, onProgress)
+        return {
+          gcs_uri: session.gcs_uri,
+          filename: session.filename
+        }
+      }
+
       // Get upload options from backend
       const uploadOptions = await this.getUploadOptions(
         file.name,
@@ -316,20 +461,7 @@ export class ApiClient {
         file.type
       )
 
-      const useResumable = uploadOptions.recommended_method === 'resumable_upload' ||
-                          file.size >= 100 * 1024 * 1024 // 100MB threshold
-
-      if (useResumable && uploadOptions.upload_options.resumable_upload) {
-        // Use resumable upload for large files
-        const resumableInfo = uploadOptions.upload_options.resumable_upload
-        await this.uploadResumable(
-          resumableInfo.resumable_url,
-          file,
-          resumableInfo.headers,
-          resumableInfo.chunk_size,
-          onProgress
-        )
-      } else if (uploadOptions.upload_options.signed_url) {
+      if (uploadOptions.upload_options.signed_url) {
         // Use regular signed URL for smaller files
         const signedUrlInfo = uploadOptions.upload_options.signed_url
         await axios.put(signedUrlInfo.url, file, {
@@ -386,6 +518,7 @@ export class WebSocketClient {
   private maxReconnectAttempts = 5
   private reconnectDelay = 1000
   private shouldReconnect = true
+  private lastSeq: number | null = null
 
   constructor(
     jobId: string,
@@ -404,7 +537,9 @@ export class WebSocketClient {
     const wsUrl = (process.env.NEXT_PUBLIC_WS_URL || 'ws://localhost:8000')
       .replace('http', 'ws')
 
-    this.ws = new WebSocket(`${wsUrl}/ws/${this.jobId}`)
+    // Resume after the last received event so missed updates are replayed
+    const resume = this.lastSeq !== null ? `?last_seq=${this.lastSeq}` : ''
+    this.ws = new WebSocket(`${wsUrl}/ws/${this.jobId}${resume}`)
 
     this.ws.onopen = () => {
       console.log(`WebSocket connected for job ${this.jobId}`)
@@ -414,6 +549,9 @@ export class WebSocketClient {
     this.ws.onmessage = (event) => {
       try {
         const data = JSON.parse(event.data)
+        if (typeof data.seq === 'number') {
+          this.lastSeq = data.seq
+        }
         this.onMessage(data)
       } catch (error) {
         console.error('Failed to parse WebSocket message:', error)
@@ -33,6 +33,7 @@ export interface TranscriptionState {
   gcsUri?: string
   fileSizeBytes?: number
   fileName?: string
+  estimatedCompletionMs?: number
 }
 
 export interface SpeakerIdentificationSummary {
@@ -98,6 +99,8 @@ export interface TranscriptionStatusResponse {
   speaker_identification_summary?: SpeakerIdentificationSummary
   refined_transcript?: string
   error?: string
+  recognition_progress?: number
+  estimated_completion_at?: string
 }
 
 export interface WebSocketMessage {
@@ -108,6 +111,10 @@ export interface WebSocketMessage {
   message?: string
   transcript?: string
   data?: Record<string, any>
+  seq?: number
+  recognition_progress?: number
+  eta_seconds?: number | null
+  estimated_completion_at?: string | null
 }
 
 export interface RecognizerRequest {
@@ -150,6 +157,22 @@ export interface ResumableUploadMethod {
   supports_resume: boolean
 }
 
+export interface UploadSession {
+  session_id: string
+  session_uri: string
+  filename: string
+  gcs_uri: string
+  file_size: number
+  content_type?: string
+  throughput_bytes_per_second?: number
+  created_at: string
+  expires_at: string
+  committed_bytes: number
+  complete?: boolean
+  chunk_size: number
+  chunk_alignment: number
+}
+
 export interface EnhancedSignedUrlResponse {
   filename: string
   gcs_uri: string